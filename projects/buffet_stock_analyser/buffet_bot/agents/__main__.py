@@ -1,5 +1,5 @@
 from buffet_bot.common.a2a_server import create_app
-from .task_manager import run
+from .task_manager import run, screen
 
 # -----------------------------------------------------------------------------
 # this line is the star of our show!! Let's unpack it from the inside out:
@@ -28,7 +28,7 @@ from .task_manager import run
 # a quick anonymous class is created on the fly using type()
 # -----------------------------------------------------------------------------
 
-app = create_app(agent=type("Agent", (), {"execute": run}))
+app = create_app(agent=type("Agent", (), {"execute": run, "screen": screen}))
 
 if __name__ == "__main__":
     import uvicorn
@@ -3,7 +3,6 @@ from dotenv import load_dotenv
 import logging
 import uuid
 import textwrap
-from rich.console import Console
 
 from google.adk.agents import SequentialAgent
 from google.adk.sessions import InMemorySessionService
@@ -36,30 +35,34 @@ root_agent = SequentialAgent(
 )
 
 
-async def execute(request):
-    logger.info(f"In SequentialAgent -> execute() function")
+APP_NAME = "buffet_bot"
+USER_ID = "buffet_bot_007"
+
+# one session service + Runner for the life of the process; every request
+# gets its own session (see execute), so requests can run concurrently
+session_service = InMemorySessionService()
+runner = Runner(
+    agent=root_agent,
+    app_name=APP_NAME,
+    session_service=session_service,
+)
 
+
+async def run_pipeline(request):
+    """Runs the analyst -> reporter pipeline for one symbol in a fresh session.
+
+    Returns (final_response, session state); the session is deleted afterwards.
+    """
     load_dotenv(override=True)
     assert os.getenv(
         "ANTHROPIC_API_KEY"
     ), "FATAL ERROR: ANTHROPIC_API_KEY not found in .env file!"
 
-    APP_NAME = "buffet_bot"
-    USER_ID = "buffet_bot_007"
     # generate a  new session id on every call!
     SESSION_ID = str(uuid.uuid4())
 
-    console = Console()
     logger.info(f"   Incoming request: \n {request}")
 
-    session_service = InMemorySessionService()
-
-    runner = Runner(
-        agent=root_agent,
-        app_name=APP_NAME,
-        session_service=session_service,
-    )
-
     # Ensure session exists
     await session_service.create_session(
         app_name=APP_NAME, 
@@ -75,11 +78,26 @@ async def execute(request):
     prompt = textwrap.dedent(prompt).strip()
     message = types.Content(role="user", parts=[types.Part(text=prompt)])
 
-    async for event in runner.run_async(
-        user_id=USER_ID, session_id=SESSION_ID, new_message=message
-    ):
-        if event.is_final_response():
-            if event.content and event.content.parts:
-                final_response = event.content.parts[0].text
-                logger.info(f"\n   final_response -> {final_response}\n")
-                return {"analysis_report": final_response}
\ No newline at end of file
+    final_response = None
+    try:
+        async for event in runner.run_async(
+            user_id=USER_ID, session_id=SESSION_ID, new_message=message
+        ):
+            if event.is_final_response():
+                if event.content and event.content.parts:
+                    final_response = event.content.parts[0].text
+                    logger.info(f"\n   final_response -> {final_response}\n")
+        session = await session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
+        )
+        return final_response, dict(session.state) if session else {}
+    finally:
+        await session_service.delete_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
+        )
+
+
+async def execute(request):
+    logger.info(f"In SequentialAgent -> execute() function")
+    final_response, _ = await run_pipeline(request)
+    return {"analysis_report": final_response}
@@ -3,6 +3,7 @@ import logging
 from google.adk.agents import LlmAgent
 from google.adk.models.lite_llm import LiteLlm
 
+from .prescreen import prescreen_callback
 from .prompt import ANALYST_PROMPT
 
 # 1. Silence Pydantic's internal validation warnings
@@ -26,6 +27,8 @@ analyst_agent = LlmAgent(
     # ADK pattern: Specify which state keys this agent needs
     # input_keys=["symbol", "company_info", "raw_financials"],
     output_key="investment_reasoning",
+    # clear-cut symbols are decided by rules in Python - no LLM call
+    before_agent_callback=prescreen_callback,
 )
 
 # class BuffettAnalystAgent(LlmAgent):
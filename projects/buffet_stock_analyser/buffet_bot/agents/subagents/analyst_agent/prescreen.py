@@ -0,0 +1,142 @@
+"""
+prescreen.py - deterministic Buffett rules, run before the analyst LLM
+
+Most of the analyst's work on clear-cut symbols is arithmetic against fixed
+thresholds. `prescreen()` scores each rule from `raw_financials` in Python;
+`prescreen_callback` (the analyst's before_agent_callback) stores the result
+in session state under "prescreen" and, when the verdict is not borderline,
+writes a precomputed analysis to "investment_reasoning" and skips the
+analyst's LLM call. The reporter then works from that analysis as usual.
+
+Set PRESCREEN_ENABLED=false to always call the analyst.
+"""
+
+import os
+
+from google.genai import types
+
+from logger import get_logger
+
+logger = get_logger("buffet_bot.agents.analyst_agent.prescreen")
+
+PRESCREEN_ENABLED = os.getenv("PRESCREEN_ENABLED", "true").lower() not in ("0", "false", "no")
+
+DISCOUNT_RATE = 0.10  # Buffett's discount rate for the DCF
+MARGIN_OF_SAFETY = 0.70  # buy below 70% of intrinsic value
+
+
+def _rule(name, value, passed, threshold):
+    return {"rule": name, "value": value, "threshold": threshold, "passed": passed}
+
+
+def _check(value, test):
+    """None when the metric is missing, otherwise whether it passes"""
+    return None if value is None else bool(test(value))
+
+
+def prescreen(raw_financials):
+    """Scores the Buffett rules for one symbol.
+
+    Returns {"rules": [...], "passed", "scored", "intrinsic_value",
+    "verdict"}, where verdict is "Buy" or "Avoid" when the numbers settle it
+    and "borderline" when the analyst should judge.
+    """
+    roe = raw_financials.get("return_on_equity")
+    de = raw_financials.get("debt_to_equity_ratio")
+    fcf = raw_financials.get("free_cash_flow")
+    pe = raw_financials.get("price_to_earnings_ratio")
+    beta = raw_financials.get("beta")
+    market_cap = raw_financials.get("market_cap")
+
+    intrinsic_value = fcf / DISCOUNT_RATE if fcf and fcf > 0 else None
+    if intrinsic_value is not None and market_cap:
+        margin_ok = market_cap < MARGIN_OF_SAFETY * intrinsic_value
+    elif fcf is not None and fcf <= 0:
+        margin_ok = False  # no positive cash flow, no intrinsic value
+    else:
+        margin_ok = None
+
+    rules = [
+        _rule("Return on Equity", roe, _check(roe, lambda v: v > 0.15), "> 15%"),
+        _rule("Debt / Equity", de, _check(de, lambda v: v < 0.5), "< 0.5"),
+        _rule("Free Cash Flow", fcf, _check(fcf, lambda v: v > 0), "> 0"),
+        _rule("P/E Ratio", pe, _check(pe, lambda v: 0 < v < 25), "0 - 25"),
+        _rule("Beta", beta, _check(beta, lambda v: v < 1.5), "< 1.5"),
+        _rule("Margin of Safety", market_cap, margin_ok, "< 70% of intrinsic value"),
+    ]
+    scored = [r for r in rules if r["passed"] is not None]
+    passed = sum(1 for r in scored if r["passed"])
+
+    if fcf is not None and fcf < 0 and ((de is not None and de > 3) or (roe is not None and roe <= 0)):
+        # burning cash while heavily indebted or loss-making (a missing FCF
+        # figure is left to the analyst)
+        verdict = "Avoid"
+    elif len(scored) == len(rules) and passed == len(rules):
+        verdict = "Buy"
+    elif len(scored) == len(rules) and passed <= 1:
+        verdict = "Avoid"
+    else:
+        verdict = "borderline"
+
+    return {
+        "rules": rules,
+        "passed": passed,
+        "scored": len(scored),
+        "intrinsic_value": intrinsic_value,
+        "verdict": verdict,
+    }
+
+
+def _format_value(rule):
+    value = rule["value"]
+    if value is None:
+        return "n/a"
+    if rule["rule"] == "Return on Equity":
+        return f"{value:.1%}"
+    if abs(value) >= 1e6:
+        return f"{value:,.0f}"
+    return f"{value:.2f}"
+
+
+def reasoning_markdown(symbol, result):
+    """Analysis text handed to the reporter in place of the analyst's answer."""
+    lines = [
+        f"Rule-based pre-screen of {symbol} (the numbers were decisive, so no "
+        "qualitative LLM analysis was run).",
+        "",
+        "| Rule | Value | Threshold | Result |",
+        "|------|-------|-----------|--------|",
+    ]
+    for rule in result["rules"]:
+        outcome = {True: "Pass", False: "Fail", None: "No data"}[rule["passed"]]
+        lines.append(f"| {rule['rule']} | {_format_value(rule)} | {rule['threshold']} | {outcome} |")
+    iv = result["intrinsic_value"]
+    lines += [
+        "",
+        f"Intrinsic value (FCF / {DISCOUNT_RATE:.0%}): "
+        + (f"{iv:,.0f}" if iv is not None else "not meaningful - free cash flow is not positive"),
+        f"Rules passed: {result['passed']} of {result['scored']} with data.",
+        "",
+        f"Decision: **{result['verdict']}**",
+        "",
+        f"DECISION: {result['verdict'].upper()}",
+    ]
+    return "\n".join(lines)
+
+
+def prescreen_callback(callback_context):
+    """before_agent_callback for the analyst: skip the LLM for clear-cut verdicts."""
+    if not PRESCREEN_ENABLED:
+        return None
+    state = callback_context.state
+    result = prescreen(state.get("raw_financials") or {})
+    state["prescreen"] = result
+    symbol = state.get("symbol", "?")
+    if result["verdict"] == "borderline":
+        logger.info(f"prescreen: {symbol} is borderline - running the analyst")
+        return None
+
+    logger.info(f"prescreen: {symbol} -> {result['verdict']}, analyst LLM call skipped")
+    reasoning = reasoning_markdown(symbol, result)
+    state["investment_reasoning"] = reasoning
+    return types.Content(role="model", parts=[types.Part(text=reasoning)])
@@ -15,4 +15,9 @@ Your task:
 4. DCF Valuation: Calculate Intrinsic Value using a 10% discount rate.
 5. Decision: Provide a 'Buy', 'Hold', or 'Avoid' recommendation based strictly on Buffett's 
    Margin of Safety (Price < 70% of Intrinsic Value).
+
+End your answer with one final line containing exactly one of the following (nothing else on that line):
+DECISION: BUY
+DECISION: HOLD
+DECISION: AVOID
 """
@@ -2,14 +2,40 @@
 task_manager.py (for the main workflow agent)
 
 Executes the sequence worflow by calling execute
+
+screen() runs the same workflow over a watchlist: stock data for every
+symbol is fetched concurrently, at most SCREEN_CONCURRENCY pipelines run at
+once, and each report is streamed back as soon as it finishes, followed by
+a summary table ranking the symbols. The summary also reports how many
+analyst LLM calls the rule-based pre-screen skipped.
 """
 
+import asyncio
+import os
+import re
+
 from logger import get_logger
+from utils import load_stock
 
-from .agent import execute
+from .agent import execute, run_pipeline
 
 logger = get_logger("buffet_stock_analyser.agents.task_manager")
 
+# how many symbols go through the LLM pipeline at the same time
+SCREEN_CONCURRENCY = int(os.getenv("SCREEN_CONCURRENCY", "4"))
+# largest watchlist accepted by /screen
+SCREEN_MAX_SYMBOLS = int(os.getenv("SCREEN_MAX_SYMBOLS", "50"))
+# Buffett's discount rate, used for the summary's price / intrinsic value
+DISCOUNT_RATE = 0.10
+
+# summary order: best recommendation first, then cheapest vs intrinsic value
+RANK = {"Buy": 0, "Hold": 1, "Avoid": 2, "Unknown": 3}
+
+# the analyst's prompt (and the pre-screen's reasoning) end with this line;
+# only the whole line counts, so prose like "I would not buy" can't match
+DECISION = re.compile(r"^[\s*]*DECISION:\s*(BUY|HOLD|AVOID)[\s*]*$", re.IGNORECASE | re.MULTILINE)
+
+
 async def run(payload):
     # display input we got
     logger.info(f"Workflow agent task_manager -> incoming payload: \n {payload}")
@@ -18,3 +44,132 @@ async def run(payload):
     return {
         "formatted_report": formatted_report,
     }
+
+
+def _recommendation(reasoning):
+    """'Buy' / 'Hold' / 'Avoid' from the analyst's DECISION line, 'Unknown' if there is none"""
+    matches = DECISION.findall(reasoning or "")
+    return matches[-1].capitalize() if matches else "Unknown"
+
+
+def _price_to_value(raw_financials):
+    """market cap / (free cash flow / discount rate); < 0.7 is Buffett's margin of safety"""
+    fcf = raw_financials.get("free_cash_flow")
+    market_cap = raw_financials.get("market_cap")
+    if not fcf or fcf <= 0 or not market_cap:
+        return None
+    return market_cap / (fcf / DISCOUNT_RATE)
+
+
+def _summary_row(symbol, recommendation, raw_financials):
+    return {
+        "symbol": symbol,
+        "recommendation": recommendation,
+        "return_on_equity": raw_financials.get("return_on_equity"),
+        "debt_to_equity_ratio": raw_financials.get("debt_to_equity_ratio"),
+        "price_to_value": _price_to_value(raw_financials),
+    }
+
+
+def _rank(rows):
+    return sorted(
+        rows,
+        key=lambda row: (
+            RANK.get(row["recommendation"], len(RANK)),
+            row["price_to_value"] if row["price_to_value"] is not None else float("inf"),
+        ),
+    )
+
+
+def _markdown_table(rows):
+    def fmt(value, pattern):
+        return pattern.format(value) if value is not None else "n/a"
+
+    lines = [
+        "| # | Symbol | Recommendation | ROE | D/E | Price / Intrinsic Value |",
+        "|---|--------|----------------|-----|-----|-------------------------|",
+    ]
+    for i, row in enumerate(rows, start=1):
+        lines.append(
+            f"| {i} | {row['symbol']} | {row['recommendation']} "
+            f"| {fmt(row['return_on_equity'], '{:.1%}')} "
+            f"| {fmt(row['debt_to_equity_ratio'], '{:.2f}')} "
+            f"| {fmt(row['price_to_value'], '{:.2f}')} |"
+        )
+    return "\n".join(lines)
+
+
+async def _analyse(symbol, stock, semaphore):
+    """Runs the pipeline for one symbol; returns the message streamed for it."""
+    if stock is None:
+        return {"type": "error", "symbol": symbol, "error": "Invalid stock symbol"}
+    company_info, raw_financials = stock
+    request = {
+        "symbol": symbol,
+        "company_info": company_info,
+        "raw_financials": raw_financials,
+    }
+    try:
+        async with semaphore:
+            report, state = await run_pipeline(request)
+    except Exception as ex:
+        logger.exception(f"screen: pipeline failed for {symbol}")
+        return {"type": "error", "symbol": symbol, "error": str(ex)}
+    verdict = (state.get("prescreen") or {}).get("verdict", "borderline")
+    prescreened = verdict != "borderline"
+    recommendation = verdict if prescreened else _recommendation(state.get("investment_reasoning"))
+    return {
+        "type": "report",
+        "symbol": symbol,
+        "recommendation": recommendation,
+        "prescreened": prescreened,
+        "formatted_report": {"analysis_report": report},
+        "summary": _summary_row(symbol, recommendation, raw_financials),
+    }
+
+
+async def screen(payload):
+    """Analyse a watchlist: {"symbols": ["AAPL", "KO", ...]}.
+
+    Yields {"type": "report", ...} or {"type": "error", "symbol", "error"} per
+    symbol in the order they finish, then {"type": "summary", "ranking",
+    "table", "llm_calls_skipped"} with the symbols ranked Buy > Hold > Avoid,
+    cheapest first.
+    """
+    symbols = list(dict.fromkeys(s.strip().upper() for s in payload.get("symbols", []) if s.strip()))
+    if not symbols:
+        raise ValueError("payload must contain a non-empty 'symbols' list")
+    if len(symbols) > SCREEN_MAX_SYMBOLS:
+        raise ValueError(f"at most {SCREEN_MAX_SYMBOLS} symbols can be screened at once")
+    logger.info(f"Workflow agent task_manager -> screening {len(symbols)} symbols: {symbols}")
+
+    # yfinance is blocking - fetch every symbol at once on worker threads
+    stocks = await asyncio.gather(*(asyncio.to_thread(load_stock, s) for s in symbols))
+
+    semaphore = asyncio.Semaphore(SCREEN_CONCURRENCY)
+    tasks = [
+        asyncio.create_task(_analyse(symbol, stock, semaphore))
+        for symbol, stock in zip(symbols, stocks)
+    ]
+    rows = []
+    skipped = 0
+    try:
+        for finished in asyncio.as_completed(tasks):
+            message = await finished
+            if message["type"] == "report":
+                rows.append(message["summary"])
+                skipped += message["prescreened"]
+            yield message
+    finally:
+        # client went away - don't keep paying for the remaining symbols
+        for task in tasks:
+            task.cancel()
+
+    ranking = _rank(rows)
+    logger.info(f"screen: {skipped} of {len(rows)} analyst LLM calls skipped by the pre-screen")
+    yield {
+        "type": "summary",
+        "ranking": ranking,
+        "table": _markdown_table(ranking),
+        "llm_calls_skipped": skipped,
+    }
@@ -4,9 +4,16 @@ generalize it using the create_app(agent) function, which handles:
     * Serving the agent on /run
     * Receiving a travel request
     * Returning a structured response
+
+Agents that also have a `screen(payload)` async generator get /screen, which
+sends each message it yields as one line of NDJSON as soon as it is
+produced; a failure ends the stream with {"type": "error", "error": ...}.
 """
 
+import json
+
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 import uvicorn
 
 
@@ -17,4 +24,17 @@ def create_app(agent):
     async def run(payload: dict):
         return await agent.execute(payload)
 
+    if hasattr(agent, "screen"):
+
+        @app.post("/screen")
+        async def screen(payload: dict):
+            async def lines():
+                try:
+                    async for message in agent.screen(payload):
+                        yield json.dumps(message, default=str) + "\n"
+                except Exception as ex:
+                    yield json.dumps({"type": "error", "error": str(ex)}) + "\n"
+
+            return StreamingResponse(lines(), media_type="application/x-ndjson")
+
     return app
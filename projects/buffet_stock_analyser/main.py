@@ -1,4 +1,5 @@
 import asyncio
+import json
 import os
 import uuid
 from dotenv import load_dotenv
@@ -7,7 +8,7 @@ from rich.console import Console
 from rich.markdown import Markdown
 
 from logger import get_logger
-from utils import is_valid_stock_symbol, get_stock_info
+from utils import load_stock
 
 load_dotenv(override=True)
 assert os.getenv(
@@ -17,6 +18,32 @@ assert os.getenv(
 logger = get_logger("buffet_stock_analyser.main")
 
 HOST_AGENT_URL = os.getenv("HOST_AGENT_URL", "http://localhost:8000/run")
+HOST_SCREEN_URL = os.getenv("HOST_SCREEN_URL", HOST_AGENT_URL.rsplit("/", 1)[0] + "/screen")
+
+
+def screen(console, symbols):
+    """analyse several symbols with the /screen endpoint, printing each
+    report as it arrives and the ranked summary at the end"""
+    with requests.post(HOST_SCREEN_URL, json={"symbols": symbols}, stream=True) as response:
+        if not response.ok:
+            console.print(f"[red]Failed to screen {', '.join(symbols)}. Please try again.[/red]")
+            return
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                continue
+            message = json.loads(line)
+            if message["type"] == "report":
+                console.rule(f"{message['symbol']} - {message['recommendation']}")
+                console.print(Markdown(message["formatted_report"]["analysis_report"] or ""))
+            elif message["type"] == "summary":
+                console.rule("Ranking")
+                console.print(Markdown(message["table"]))
+                console.print(
+                    f"[dim]{message['llm_calls_skipped']} analyst LLM call(s) skipped by the pre-screen[/dim]"
+                )
+            elif message["type"] == "error":
+                console.print(f"[red]{message.get('symbol', 'screen')}: {message['error']}[/red]")
+
 
 async def main():
     console = Console()
@@ -25,19 +52,26 @@ async def main():
 
     while True:
         console.print(
-            "[yellow]Enter Stock Symbol (e.g., TSLA, GOOGL) or exit to quit: [/yellow]",
+            "[yellow]Enter Stock Symbol (e.g., TSLA, GOOGL), a comma-separated "
+            "watchlist to screen, or exit to quit: [/yellow]",
             end="",
         )
         symbol = input().strip().upper()
 
         if symbol.lower() == "exit":
             break
+
+        if "," in symbol:
+            screen(console, [s.strip() for s in symbol.split(",") if s.strip()])
+            continue
         
-        if not is_valid_stock_symbol(symbol):
+        # validates and loads the symbol with a single (cached) Yahoo call
+        stock = load_stock(symbol)
+        if stock is None:
             console.print(f"[red]Invalid stock symbol: {symbol}. Please try again.[/red]")
             continue
 
-        company_info, raw_financials = get_stock_info(symbol)
+        company_info, raw_financials = stock
         payload = {
             "symbol": symbol,
             "company_info": company_info,
@@ -3,7 +3,7 @@ import os
 import requests
 from dotenv import load_dotenv
 
-from utils import is_valid_stock_symbol, get_stock_info
+from utils import StockCache
 
 load_dotenv(override=True)
 
@@ -15,22 +15,27 @@ st.markdown("Powered by **Google ADK**, **Claude 4.6 Sonnet** and a **FastAPI**
 # ── Server URL (mirrors main.py HOST_AGENT_URL) ───────────────────────────────
 HOST_AGENT_URL = os.getenv("HOST_AGENT_URL", "http://localhost:8000/run")
 
+# ── Stock data cache ─────────────────────────────────────────────────────────
+# one StockCache per server process, shared by every session and rerun, so
+# re-analysing a symbol within STOCK_CACHE_TTL_SECONDS doesn't call Yahoo again
+@st.cache_resource
+def get_stock_cache() -> StockCache:
+    return StockCache()
+
+
 # ── Input ─────────────────────────────────────────────────────────────────────
 symbol = st.text_input("Enter Ticker Symbol", value="AAPL").strip().upper()
 
 if st.button("Analyze Stock"):
-    if not is_valid_stock_symbol(symbol):
-        st.error(f"🚨 Invalid stock symbol: {symbol}. Please try again.")
-        st.stop()
-
     with st.status(f"📡 Fetching live data for **{symbol}**…", expanded=True) as status:
 
-        # Step 1 — pull financial data (same as main.py)
-        try:
-            company_info, raw_financials = get_stock_info(symbol)
-        except Exception as ex:
-            st.error(f"Failed to fetch data for **{symbol}**: {ex}")
+        # Step 1 — validate the symbol and pull financial data in one call
+        stock = get_stock_cache().load(symbol)
+        if stock is None:
+            status.update(label="❌ Invalid symbol.", state="error", expanded=False)
+            st.error(f"🚨 Invalid stock symbol: {symbol}. Please try again.")
             st.stop()
+        company_info, raw_financials = stock
 
         payload = {
             "symbol": symbol,
@@ -1,7 +1,11 @@
-from typing import Any
+import os
+import threading
+import time
+from typing import Any, Optional
 import yfinance as yf
 import logging
 
+from google.adk.agents import Agent
 from google.adk.sessions import InMemorySessionService, Session
 from google.adk.runners import Runner
 from google.genai import types
@@ -14,24 +18,15 @@ logger.setLevel(logging.CRITICAL)
 
 logger = get_logger("buffet_stock_analyser.utils")
 
-def is_valid_stock_symbol(symbol: str) -> bool:
-    """given a stock symbol (such as AAPL, RELIANCE.NS), checks if it is valid"""
-    logger.info(f"----- is_valid_symbol() called for {symbol} -----")
-    ticker = yf.Ticker(symbol)
-    data = ticker.history(period="1d")
-    return not data.empty
+# how long a loaded symbol (valid or not) is served from memory
+STOCK_CACHE_TTL_SECONDS = float(os.getenv("STOCK_CACHE_TTL_SECONDS", "900"))
+STOCK_CACHE_MAX_ENTRIES = int(os.getenv("STOCK_CACHE_MAX_ENTRIES", "256"))
 
+StockInfo = tuple[dict[str, Any], dict[str, Any]]
 
-def get_stock_info(symbol: str) -> (dict[str, Any], dict[str, Any]):
-    """given a stock symbol (such as AAPL, RELIANCE.NS), extracts
-    company information (company_name, sector, industry and description)
-    and raw financial metrics (stock_price, roe, debt_to_equity, free_cash_flow,
-    price_to_earnings_ratio, market_cap, beta)
-    """
-    logger.info(f"----- _get_stock_info() called for {symbol} -----")
-    ticker = yf.Ticker(symbol)
-    info = ticker.info
 
+def _extract_stock_info(symbol: str, info: dict[str, Any]) -> StockInfo:
+    """splits a yfinance `.info` dict into (company_info, raw_financials)"""
     # company information
     company_info = {
         "company_name": info.get("longName"),
@@ -42,12 +37,14 @@ def get_stock_info(symbol: str) -> (dict[str, Any], dict[str, Any]):
     logger.info(f"\n   company_info -> {company_info}\n")
 
     # raw financial metrics
+    # debtToEquity is a percentage (45.2 == 0.452) and can be missing or None
+    debt_to_equity = info.get("debtToEquity")
     raw_financials = {
         "symbol": symbol,
-        "stock_price": info.get("currentPrice"),
+        "stock_price": info.get("currentPrice") or info.get("regularMarketPrice"),
         "return_on_equity": info.get("returnOnEquity"),
-        "debt_to_equity_ratio": info.get("debtToEquity", 0) / 100,  # Normalized
-        "free_cash_flow": info.get("freeCashflow", 0),
+        "debt_to_equity_ratio": debt_to_equity / 100 if debt_to_equity is not None else None,
+        "free_cash_flow": info.get("freeCashflow"),  # None when Yahoo has no figure
         "price_to_earnings_ratio": info.get("trailingPE"),
         "market_cap": info.get("marketCap"),
         "beta": info.get("beta"),
@@ -57,6 +54,95 @@ def get_stock_info(symbol: str) -> (dict[str, Any], dict[str, Any]):
     return company_info, raw_financials
 
 
+def _fetch_stock(symbol: str) -> Optional[StockInfo]:
+    """one Yahoo round-trip: `.info` answers both "is it valid?" and "what is it?"
+
+    Unknown symbols come back as a (nearly) empty dict, without a name or a
+    price. Errors (including the 404 some yfinance versions raise) propagate.
+    """
+    logger.info(f"----- _fetch_stock() called for {symbol} -----")
+    info = yf.Ticker(symbol).info or {}
+    price = info.get("currentPrice") or info.get("regularMarketPrice")
+    name = info.get("longName") or info.get("shortName")
+    if price is None or name is None:
+        return None
+    return _extract_stock_info(symbol, info)
+
+
+class StockCache:
+    """TTL cache of `_fetch_stock` results (including "invalid"), keyed by symbol.
+
+    Thread-safe, so one instance can serve every Streamlit session.
+    """
+
+    def __init__(
+        self,
+        ttl: float = STOCK_CACHE_TTL_SECONDS,
+        max_entries: int = STOCK_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[str, tuple[float, Optional[StockInfo]]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, symbol: str) -> Optional[StockInfo]:
+        """returns (company_info, raw_financials), or None if `symbol` is not valid"""
+        symbol = symbol.strip().upper()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None and entry[0] > now:
+                logger.info(f"----- load_stock() cache hit for {symbol} -----")
+                return entry[1]
+        try:
+            stock = _fetch_stock(symbol)
+        except Exception as ex:
+            # could be a 404 or Yahoo being unreachable - report it as invalid
+            # but don't cache it, so the next attempt fetches again
+            logger.warning(f"could not load {symbol}: {ex}")
+            return None
+        with self._lock:
+            self._entries[symbol] = (now + self.ttl, stock)
+            if len(self._entries) > self.max_entries:
+                # drop the entry closest to expiring (i.e. the oldest)
+                oldest = min(self._entries, key=lambda key: self._entries[key][0])
+                del self._entries[oldest]
+        return stock
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# process-wide default cache (the Streamlit app keeps its own in st.cache_resource)
+stock_cache = StockCache()
+
+
+def load_stock(symbol: str) -> Optional[StockInfo]:
+    """given a stock symbol (such as AAPL, RELIANCE.NS), validates it and loads
+    (company_info, raw_financials) from a single `.info` fetch; returns None
+    if the symbol is not valid. Results are cached for STOCK_CACHE_TTL_SECONDS.
+    """
+    return stock_cache.load(symbol)
+
+
+def is_valid_stock_symbol(symbol: str) -> bool:
+    """given a stock symbol (such as AAPL, RELIANCE.NS), checks if it is valid"""
+    return load_stock(symbol) is not None
+
+
+def get_stock_info(symbol: str) -> StockInfo:
+    """given a stock symbol (such as AAPL, RELIANCE.NS), extracts
+    company information (company_name, sector, industry and description)
+    and raw financial metrics (stock_price, roe, debt_to_equity, free_cash_flow,
+    price_to_earnings_ratio, market_cap, beta)
+    """
+    stock = load_stock(symbol)
+    if stock is None:
+        raise ValueError(f"Invalid stock symbol: {symbol}")
+    return stock
+
+
 async def run_agent_query(
     agent: Agent,
     session_service: InMemorySessionService,
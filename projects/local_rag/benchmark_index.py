@@ -0,0 +1,127 @@
+"""
+benchmark_index.py
+    Compares the FAISS index types of local_rag_agent/index_store.py
+    (flat / HNSW / IVF-PQ) on build time, size on disk, memory-mapped load
+    time, query latency and recall@k against exact (flat) search.
+
+    Vectors come from the built index (docstore texts, vectors from the
+    embedding cache) or, with --synthetic N, from N clustered random vectors.
+    Queries are corpus vectors with a little noise added, so their true
+    neighbours are known to be close but not identical.
+
+        uv run benchmark_index.py                      # the indexed corpus
+        uv run benchmark_index.py --synthetic 200000   # a corpus of 200k vectors
+        IVF_NPROBE=64 HNSW_EF_SEARCH=256 uv run benchmark_index.py --synthetic 200000
+"""
+
+import argparse
+import pathlib
+import tempfile
+import time
+
+import faiss
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from local_rag_agent.index_store import IVF_MIN_VECTORS, IVF_TRAIN_SAMPLE, MMAP_FLAGS, configure_search, make_index
+
+console = Console()
+
+
+def corpus_vectors():
+    """Every indexed chunk's vector, from the embedding cache."""
+    from rag_pipeline import EMBEDDING_CACHE_PATH, FAISS_INDEX_PATH
+    from local_rag_agent.embedding_cache import EmbeddingCache
+    from local_rag_agent.embeddings import embedding_config, get_embeddings
+    from local_rag_agent.index_store import IndexStore
+
+    store = IndexStore(FAISS_INDEX_PATH)
+    if not store.exists():
+        raise SystemExit("No index found - run rag_pipeline.py first (or use --synthetic N)")
+    config = embedding_config()
+    cache = EmbeddingCache(EMBEDDING_CACHE_PATH, config["embedding_model"], get_embeddings(config))
+    texts = [row[0] for row in store.db.execute("SELECT text FROM chunks ORDER BY id")]
+    store.close()
+    return np.asarray(cache.embed(texts), dtype=np.float32)
+
+
+def synthetic_vectors(n, dim, seed=0):
+    """n vectors around 1000 cluster centres - closer to embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((1000, dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, len(centres), n)] + 0.3 * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall_at_k(found, truth):
+    """Fraction of the exact top-k that each approximate top-k contains, averaged."""
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+
+def benchmark(kind, vectors, queries, k, workdir):
+    start = time.perf_counter()
+    index = make_index(kind, vectors.shape[1], len(vectors))
+    if not index.is_trained:
+        sample = vectors[np.random.default_rng(1).permutation(len(vectors))[:IVF_TRAIN_SAMPLE]]
+        index.train(sample)
+    index.add_with_ids(vectors, np.arange(len(vectors), dtype=np.int64))
+    build_seconds = time.perf_counter() - start
+
+    path = workdir / f"{kind}.faiss"
+    faiss.write_index(index, str(path))
+    start = time.perf_counter()
+    index = faiss.read_index(str(path), MMAP_FLAGS[kind])
+    load_seconds = time.perf_counter() - start
+    configure_search(index, kind)
+
+    start = time.perf_counter()
+    # one query at a time, as the agent's tool searches
+    ids = np.vstack([index.search(q.reshape(1, -1), k)[1] for q in queries])
+    query_ms = 1000 * (time.perf_counter() - start) / len(queries)
+    return ids, {
+        "build_s": build_seconds,
+        "size_mb": path.stat().st_size / 2**20,
+        "load_ms": 1000 * load_seconds,
+        "query_ms": query_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1].strip())
+    parser.add_argument("--synthetic", type=int, metavar="N", help="benchmark N random vectors instead of the index")
+    parser.add_argument("--dim", type=int, default=384, help="dimension of the synthetic vectors (default 384)")
+    parser.add_argument("--queries", type=int, default=200, help="number of queries (default 200)")
+    parser.add_argument("-k", type=int, default=10, help="neighbours per query (default 10)")
+    args = parser.parse_args()
+
+    vectors = synthetic_vectors(args.synthetic, args.dim) if args.synthetic else corpus_vectors()
+    rng = np.random.default_rng(2)
+    queries = vectors[rng.integers(0, len(vectors), args.queries)]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape).astype(np.float32)
+    console.print(f"[yellow]{len(vectors)} vectors of dimension {vectors.shape[1]}, {len(queries)} queries, k={args.k}[/yellow]")
+
+    table = Table(title=f"FAISS index types - recall@{args.k} against flat")
+    for column in ("index", f"recall@{args.k}", "query ms", "build s", "size MB", "mmap load ms"):
+        table.add_column(column, justify="right")
+    with tempfile.TemporaryDirectory() as tmp:
+        truth = None
+        for kind in ("flat", "hnsw", "ivfpq"):
+            if kind == "ivfpq" and len(vectors) < IVF_MIN_VECTORS:
+                console.print(f"[dark_yellow]Skipping ivfpq: needs at least {IVF_MIN_VECTORS} vectors[/dark_yellow]")
+                continue
+            ids, result = benchmark(kind, vectors, queries, args.k, pathlib.Path(tmp))
+            truth = ids if truth is None else truth
+            table.add_row(
+                kind,
+                f"{recall_at_k(ids, truth):.3f}",
+                f"{result['query_ms']:.2f}",
+                f"{result['build_s']:.1f}",
+                f"{result['size_mb']:.1f}",
+                f"{result['load_ms']:.1f}",
+            )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,4 @@
-from . import agent
+# The agent is not imported here: rag_pipeline.py and benchmark_index.py use
+# this package's index / embedding modules without the agent's OPENAI_API_KEY
+# check or its search warm-up. Import local_rag_agent.agent to get the agent
+# (ADK's loader does so itself).
@@ -5,7 +5,7 @@ from dotenv import load_dotenv
 from google.adk.agents import LlmAgent
 from google.adk.models.lite_llm import LiteLlm
 
-from .tools import search_faiss
+from .tools import search_faiss, start_warm_up
 
 load_dotenv(override=True)
 assert os.getenv(
@@ -22,6 +22,9 @@ local_rag_agent = LlmAgent(
 
     RULES (follow strictly):
     1. For EVERY user question, you MUST call the 'search_faiss' tool first to retrieve context.
+       When the question is about a specific company's filing or a specific fiscal year,
+       pass the `source` (e.g. the company name) and / or `year` arguments to search only
+       those documents.
     2. BASE YOUR ANSWER EXCLUSIVELY on the text returned by 'search_faiss'.
        Do NOT use your pre-trained knowledge, even if you know the answer.
     3. If 'search_faiss' returns no relevant information, respond EXACTLY with:
@@ -33,3 +36,8 @@ local_rag_agent = LlmAgent(
     """,
     tools=[search_faiss],
 )
+
+# load the index and embedding model in the background, so the first
+# question doesn't wait for them
+if os.getenv("RAG_WARM_UP", "true").lower() not in ("0", "false", "no"):
+    start_warm_up()
@@ -0,0 +1,188 @@
+"""
+embedding_cache.py
+    Persistent chunk-embedding cache for rag_pipeline.py.
+
+    Every vector ever computed is kept, keyed by sha256(model + normalized
+    chunk text), so re-indexing a changed PDF - or a 10-K full of the same
+    legal boilerplate - only pays for text that has never been embedded.
+    Per model, the cache is three files in embedding_cache/:
+
+        <model>.f32     float32 matrix, one row per cached text (memory-mapped)
+        <model>.keys    one hex key per line; line n is row n of the matrix
+        <model>.json    {"model", "dim"}
+
+    Both data files are append-only: rows are written before their keys, so
+    an interrupted run can leave rows without keys (or, in a torn write,
+    keys without rows). Loading trims both files back to their complete
+    pairs, so row n is always the vector of key line n.
+
+    Misses are embedded in batches of EMBED_BATCH_SIZE texts, EMBED_CONCURRENCY
+    batches at a time. A rate-limit (429) or transient API error pauses every
+    worker - for the server's Retry-After if it sends one, otherwise with
+    exponential backoff - before the batch is retried.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import openai
+from rich.console import Console
+
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "256"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "6"))
+EMBED_BACKOFF_SECONDS = float(os.getenv("EMBED_BACKOFF_SECONDS", "1.0"))
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+console = Console()
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so re-extracted but identical text hits the cache."""
+    return " ".join(text.split())
+
+
+def cache_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+def _retry_after(ex) -> float | None:
+    response = getattr(ex, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class EmbeddingCache:
+    """Memory-mapped (model, text) -> vector cache in front of an embeddings client."""
+
+    def __init__(self, path, model, embeddings, concurrency=EMBED_CONCURRENCY):
+        self.path = pathlib.Path(path)
+        self.model = model
+        self.embeddings = embeddings
+        self.concurrency = concurrency
+        slug = model.replace("/", "_").replace(":", "_")
+        self.matrix_path = self.path / f"{slug}.f32"
+        self.keys_path = self.path / f"{slug}.keys"
+        self.meta_path = self.path / f"{slug}.json"
+        self.dim = None
+        self.rows = {}
+        self.num_rows = 0  # rows in the matrix file, one per key line
+        self.matrix = None
+        self.hits = 0
+        self.misses = 0
+        self._pause_until = 0.0
+        self._lock = threading.Lock()
+        self._load()
+
+    # ---------- storage ----------
+
+    def _load(self):
+        if not self.meta_path.exists():
+            return
+        with open(self.meta_path, encoding="utf-8") as f:
+            self.dim = json.load(f)["dim"]
+        keys = self.keys_path.read_text(encoding="utf-8").split() if self.keys_path.exists() else []
+        stored_rows = self.matrix_path.stat().st_size // (4 * self.dim) if self.matrix_path.exists() else 0
+        # a run interrupted between the two appends: keep only complete pairs,
+        # and cut the files back to them so the next append stays aligned
+        num_rows = min(len(keys), stored_rows)
+        if self.matrix_path.exists() and self.matrix_path.stat().st_size != num_rows * 4 * self.dim:
+            os.truncate(self.matrix_path, num_rows * 4 * self.dim)
+        if len(keys) > num_rows:
+            keys = keys[:num_rows]
+            self.keys_path.write_text("".join(f"{key}\n" for key in keys), encoding="utf-8")
+        self.rows = {key: row for row, key in enumerate(keys)}
+        self.num_rows = num_rows
+        self._map(num_rows)
+
+    def _map(self, num_rows):
+        self.matrix = (
+            np.memmap(self.matrix_path, dtype=np.float32, mode="r", shape=(num_rows, self.dim))
+            if num_rows
+            else None
+        )
+
+    def _append(self, keys, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self.path.mkdir(parents=True, exist_ok=True)
+            with open(self.meta_path, "w", encoding="utf-8") as f:
+                json.dump({"model": self.model, "dim": self.dim}, f)
+        # counted from the keys, not the file size: _load trimmed any orphan rows
+        start = self.num_rows
+        with open(self.matrix_path, "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self.keys_path, "a", encoding="utf-8") as f:
+            f.write("".join(f"{key}\n" for key in keys))
+        for offset, key in enumerate(keys):
+            self.rows[key] = start + offset
+        self.num_rows = start + len(keys)
+        self._map(self.num_rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    # ---------- embedding ----------
+
+    def _wait_for_rate_limit(self):
+        delay = self._pause_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _embed_batch(self, texts):
+        for attempt in range(EMBED_MAX_RETRIES + 1):
+            self._wait_for_rate_limit()
+            try:
+                return self.embeddings.embed_documents(texts)
+            except RETRYABLE_ERRORS as ex:
+                if attempt == EMBED_MAX_RETRIES:
+                    raise
+                delay = _retry_after(ex) or EMBED_BACKOFF_SECONDS * (2**attempt)
+                delay *= random.uniform(1.0, 1.25)
+                # one 429 means every worker is over the limit - pause them all
+                with self._lock:
+                    self._pause_until = max(self._pause_until, time.monotonic() + delay)
+                console.print(
+                    f"[dark_yellow]embedding batch of {len(texts)} failed ({type(ex).__name__}); "
+                    f"retrying in {delay:.1f}s[/dark_yellow]"
+                )
+
+    def embed(self, texts):
+        """Vectors for `texts` (list of float32 rows); only uncached texts hit the API."""
+        keys = [cache_key(self.model, text) for text in texts]
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self.rows and key not in missing:
+                missing[key] = text
+        self.misses += len(missing)
+        self.hits += len(texts) - len(missing)
+
+        if missing:
+            miss_keys = list(missing)
+            batches = [
+                miss_keys[i : i + EMBED_BATCH_SIZE] for i in range(0, len(miss_keys), EMBED_BATCH_SIZE)
+            ]
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                results = pool.map(lambda batch: self._embed_batch([missing[k] for k in batch]), batches)
+                # append in batch order as results come in - a crash keeps finished batches
+                for batch, vectors in zip(batches, results):
+                    self._append(batch, vectors)
+
+        return [self.matrix[self.rows[key]] for key in keys]
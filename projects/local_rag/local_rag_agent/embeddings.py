@@ -0,0 +1,137 @@
+"""
+embeddings.py
+    Selects the embedding model used to build and to query the index.
+
+        EMBEDDING_BACKEND=openai   OpenAI API (default), needs OPENAI_API_KEY
+        EMBEDDING_BACKEND=local    sentence-transformers model on the CPU;
+                                   no API key, no network once downloaded
+
+    Settings (environment):
+        EMBEDDING_MODEL            model name (default text-embedding-3-small
+                                   for openai, BAAI/bge-small-en-v1.5 for local)
+        EMBEDDING_MODELS_DIR       where local models are downloaded / cached
+                                   (default: models/ next to this project)
+        EMBEDDING_THREADS          CPU threads for local inference (default: all cores)
+        EMBEDDING_LOCAL_BATCH_SIZE texts per local inference batch (default 32)
+
+    The index records the backend and model that built it (manifest.json);
+    tools.py refuses to query it with a different one, and rag_pipeline.py
+    rebuilds it.
+
+    The local backend needs `sentence-transformers`:  uv add sentence-transformers
+"""
+
+import asyncio
+import os
+import pathlib
+import threading
+
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai").lower()
+DEFAULT_MODELS = {
+    "openai": "text-embedding-3-small",
+    "local": "BAAI/bge-small-en-v1.5",
+}
+EMBEDDING_MODELS_DIR = pathlib.Path(
+    os.getenv("EMBEDDING_MODELS_DIR", pathlib.Path(__file__).parent.parent / "models")
+)
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", str(os.cpu_count() or 1)))
+EMBEDDING_LOCAL_BATCH_SIZE = int(os.getenv("EMBEDDING_LOCAL_BATCH_SIZE", "32"))
+
+# retrieval models trained with an instruction in front of the query
+QUERY_PREFIXES = {
+    "BAAI/bge-small-en-v1.5": "Represent this sentence for searching relevant passages: ",
+    "BAAI/bge-base-en-v1.5": "Represent this sentence for searching relevant passages: ",
+}
+
+
+def embedding_config() -> dict:
+    """The backend and model selected by the environment."""
+    if EMBEDDING_BACKEND not in DEFAULT_MODELS:
+        raise ValueError(
+            f"EMBEDDING_BACKEND must be one of {', '.join(DEFAULT_MODELS)}, not {EMBEDDING_BACKEND!r}"
+        )
+    return {
+        "embedding_backend": EMBEDDING_BACKEND,
+        "embedding_model": os.getenv("EMBEDDING_MODEL", DEFAULT_MODELS[EMBEDDING_BACKEND]),
+    }
+
+
+class LocalEmbeddings:
+    """sentence-transformers model with the embed_documents / embed_query
+    interface of LangChain's embeddings (vectors are L2-normalized)."""
+
+    def __init__(self, model: str, threads: int = EMBEDDING_THREADS, batch_size: int = EMBEDDING_LOCAL_BATCH_SIZE):
+        try:
+            import torch
+            from sentence_transformers import SentenceTransformer
+        except ImportError as ex:
+            raise ImportError(
+                "EMBEDDING_BACKEND=local needs sentence-transformers: uv add sentence-transformers"
+            ) from ex
+        torch.set_num_threads(threads)
+        self.model_name = model
+        self.batch_size = batch_size
+        self.query_prefix = QUERY_PREFIXES.get(model, "")
+        self.model = SentenceTransformer(model, device="cpu", cache_folder=str(EMBEDDING_MODELS_DIR))
+
+    def _encode(self, texts):
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return vectors.astype("float32").tolist()
+
+    def embed_documents(self, texts):
+        return self._encode(list(texts))
+
+    def embed_query(self, text):
+        return self._encode([self.query_prefix + text])[0]
+
+    async def aembed_query(self, text):
+        # inference is CPU-bound - keep it off the event loop
+        return await asyncio.to_thread(self.embed_query, text)
+
+
+_local_models = {}
+_local_models_lock = threading.Lock()
+
+
+def get_embeddings(config: dict | None = None, **openai_kwargs):
+    """Embeddings client for `config` (default: embedding_config()).
+
+    Local models are loaded once per process and shared (pipeline and tool).
+    """
+    config = config or embedding_config()
+    if config["embedding_backend"] == "local":
+        with _local_models_lock:
+            name = config["embedding_model"]
+            if name not in _local_models:
+                _local_models[name] = LocalEmbeddings(name)
+            return _local_models[name]
+
+    from langchain_openai import OpenAIEmbeddings
+
+    if not os.getenv("OPENAI_API_KEY"):
+        raise RuntimeError(
+            "FATAL ERROR: OPENAI_API_KEY not defined! (or set EMBEDDING_BACKEND=local)"
+        )
+    return OpenAIEmbeddings(model=config["embedding_model"], **openai_kwargs)
+
+
+def check_index_config(manifest: dict, config: dict | None = None) -> str | None:
+    """None if the index was built with `config`'s model, otherwise why not."""
+    config = config or embedding_config()
+    built_with = {
+        # indexes from before the backend was recorded were all built with OpenAI
+        "embedding_backend": manifest.get("embedding_backend", "openai"),
+        "embedding_model": manifest.get("embedding_model"),
+    }
+    if built_with == config:
+        return None
+    return (
+        f"the index was built with {built_with['embedding_backend']}:{built_with['embedding_model']} "
+        f"but queries would use {config['embedding_backend']}:{config['embedding_model']}"
+    )
@@ -0,0 +1,455 @@
+"""
+index_store.py
+    On-disk vector store used by rag_pipeline.py (to build / update it) and
+    tools.py (to search it). Everything lives in the faiss_index/ folder:
+
+        index.faiss         FAISS index - vectors keyed by chunk id
+        docstore.sqlite3    chunk id -> source file, page and text, plus an
+                            FTS5 full-text index of the text (BM25 postings)
+        manifest.json       per source file: content hash, fiscal year and
+                            chunk ids; the index type and embedding model
+
+    Chunk ids are stable, so a changed or deleted PDF's vectors can be
+    removed with `remove_ids` and new ones added with `add_with_ids`, without
+    touching (or re-embedding) the rest of the corpus.
+
+    The index type follows the corpus size (INDEX_TYPE=auto), or is fixed
+    with INDEX_TYPE=flat|hnsw|ivfpq:
+
+        flat    exact search, every vector scanned   (< FLAT_MAX_VECTORS)
+        hnsw    graph search, full vectors           (< HNSW_MAX_VECTORS)
+        ivfpq   inverted lists of PQ-compressed vectors, centroids trained
+                on a sample of IVF_TRAIN_SAMPLE vectors
+
+    HNSW can't remove vectors, so removing a file from an HNSW index marks it
+    stale; rag_pipeline.py then rebuilds it from the docstore (the vectors
+    come back from the embedding cache). tools.py loads the index
+    memory-mapped and read-only, so only the pages a search touches are read.
+
+    The full-text index is kept in step with the chunks table by triggers, so
+    every add / remove updates the sparse (keyword) and dense (vector) indexes
+    together. It stores postings only - the text stays in `chunks`.
+
+    A file's chunks get consecutive ids, so the manifest doubles as a metadata
+    index: source file / fiscal year -> id ranges. Searches restricted to
+    some files pass those ranges to FAISS as an IDSelector (and to the
+    keyword search as rowid bounds), so vectors of other files are skipped.
+"""
+
+import json
+import math
+import os
+import pathlib
+import re
+import sqlite3
+
+import faiss
+import numpy as np
+
+MANIFEST_VERSION = 1
+
+INDEX_TYPES = ("flat", "hnsw", "ivfpq")
+INDEX_TYPE = os.getenv("INDEX_TYPE", "auto").lower()
+FLAT_MAX_VECTORS = int(os.getenv("FLAT_MAX_VECTORS", "100000"))
+HNSW_MAX_VECTORS = int(os.getenv("HNSW_MAX_VECTORS", "2000000"))
+HNSW_M = int(os.getenv("HNSW_M", "32"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "200"))
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "128"))
+IVF_NPROBE = int(os.getenv("IVF_NPROBE", "32"))
+IVF_TRAIN_SAMPLE = int(os.getenv("IVF_TRAIN_SAMPLE", "100000"))
+# 256 PQ centroids per sub-quantizer x 39 training points each
+IVF_MIN_VECTORS = 256 * 39
+# retrain the IVF centroids once the corpus has grown this much since training
+IVF_RETRAIN_GROWTH = float(os.getenv("IVF_RETRAIN_GROWTH", "2.0"))
+# vectors read from the docstore / embedding cache per batch while building
+BUILD_BATCH_SIZE = 10000
+
+# memory-mapped, read-only loading: IO_FLAG_MMAP_IFC maps flat (and HNSW)
+# vector storage, IO_FLAG_MMAP the inverted lists of an IVF index
+MMAP_FLAGS = {
+    "flat": faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY,
+    "hnsw": faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY,
+    "ivfpq": faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY,
+}
+
+
+# words too common to narrow a keyword search down
+STOPWORDS = frozenset(
+    "a about an and are as at be by did do does for from had has have how i in is it its of on or "
+    "that the their there this to was were what when where which who why will with".split()
+)
+
+
+YEAR_IN_NAME = re.compile(r"(?<!\d)((?:19|20)\d{2})(?!\d)")
+YEAR_IN_TEXT = re.compile(r"fiscal\s+year\s+ended\s+\w+\s+\d{1,2},\s+((?:19|20)\d{2})", re.IGNORECASE)
+
+
+def fiscal_year(source: str, text: str = "") -> int | None:
+    """A filing's fiscal year: from its file name (nike-10k-2023.pdf) or
+    else from "fiscal year ended May 31, 2023" in `text`."""
+    match = YEAR_IN_NAME.search(source) or YEAR_IN_TEXT.search(text)
+    return int(match.group(1)) if match else None
+
+
+def id_ranges(ids) -> list[tuple[int, int]]:
+    """Sorted ids as half-open [start, stop) runs of consecutive ids."""
+    ranges = []
+    for i in sorted(ids):
+        if ranges and ranges[-1][1] == i:
+            ranges[-1] = (ranges[-1][0], i + 1)
+        else:
+            ranges.append((i, i + 1))
+    return ranges
+
+
+def id_ranges_union(range_lists) -> list[tuple[int, int]]:
+    """Merges lists of [start, stop) ranges into sorted, non-overlapping ones."""
+    merged = []
+    for start, stop in sorted(r for ranges in range_lists for r in ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(stop, merged[-1][1]))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def keyword_query(text: str) -> str | None:
+    """FTS5 query matching any of the text's terms (each quoted, so
+    punctuation in the user's text can't be read as query syntax)."""
+    terms = [t for t in re.findall(r"\w+", text.casefold()) if t not in STOPWORDS]
+    return " OR ".join(f'"{t}"' for t in dict.fromkeys(terms)) or None
+
+
+def choose_index_type(num_vectors: int) -> str:
+    """INDEX_TYPE, or (for "auto") the index type suited to the corpus size.
+
+    Below IVF_MIN_VECTORS there is too little to train PQ codebooks on, so
+    ivfpq falls back to flat.
+    """
+    if INDEX_TYPE == "auto":
+        if num_vectors < FLAT_MAX_VECTORS:
+            return "flat"
+        kind = "hnsw" if num_vectors < HNSW_MAX_VECTORS else "ivfpq"
+    elif INDEX_TYPE in INDEX_TYPES:
+        kind = INDEX_TYPE
+    else:
+        raise ValueError(f"INDEX_TYPE must be auto or one of {', '.join(INDEX_TYPES)}, not {INDEX_TYPE!r}")
+    return "flat" if kind == "ivfpq" and num_vectors < IVF_MIN_VECTORS else kind
+
+
+def _pq_subquantizers(dim: int) -> int:
+    """PQ codes of ~8 dimensions per byte (m must divide dim)."""
+    m = max(1, dim // 8)
+    while dim % m:
+        m -= 1
+    return m
+
+
+def make_index(kind: str, dim: int, num_vectors: int):
+    """An empty index of `kind` for about `num_vectors` vectors (ivfpq still needs training)."""
+    if kind == "flat":
+        return faiss.IndexIDMap2(faiss.IndexFlatL2(dim))
+    if kind == "hnsw":
+        index = faiss.index_factory(dim, f"IDMap2,HNSW{HNSW_M},Flat")
+        faiss.downcast_index(index.index).hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        return index
+    if kind == "ivfpq":
+        # ~4 sqrt(n) lists, but at least 39 training vectors per centroid
+        nlist = max(1, min(int(4 * math.sqrt(num_vectors)), min(num_vectors, IVF_TRAIN_SAMPLE) // 39))
+        return faiss.index_factory(dim, f"IVF{nlist},PQ{_pq_subquantizers(dim)}x8")
+    raise ValueError(f"unknown index type {kind!r}")
+
+
+def configure_search(index, kind: str):
+    """Search-time accuracy / speed knobs for HNSW and IVF indexes."""
+    if kind == "hnsw":
+        faiss.ParameterSpace().set_index_parameter(index, "efSearch", HNSW_EF_SEARCH)
+    elif kind == "ivfpq":
+        faiss.ParameterSpace().set_index_parameter(index, "nprobe", IVF_NPROBE)
+
+
+class IndexStore:
+    """FAISS index + SQLite docstore + manifest, stored in one folder."""
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.index_path = self.path / "index.faiss"
+        self.docstore_path = self.path / "docstore.sqlite3"
+        self.manifest_path = self.path / "manifest.json"
+        self.index = None
+        self.manifest = {"version": MANIFEST_VERSION, "next_id": 0, "files": {}}
+        self.stale = False  # vectors were removed that the index still holds
+        self._ranges = None  # source -> id ranges, built on first filtered search
+        self._db = None
+
+    # ---------- loading / saving ----------
+
+    def exists(self):
+        """True if a store in this format is on disk (an older LangChain index is not)."""
+        return self.manifest_path.exists() and self.index_path.exists()
+
+    def load(self, mmap=False):
+        """Read the store; with `mmap` the index is memory-mapped read-only (for searching)."""
+        with open(self.manifest_path, encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"unsupported manifest version in {self.manifest_path}")
+        self.index = faiss.read_index(str(self.index_path), MMAP_FLAGS[self.index_type] if mmap else 0)
+        configure_search(self.index, self.index_type)
+        return self
+
+    def reset(self):
+        """Start an empty docstore with no index (the old files are replaced on save).
+
+        Files already registered with start_file are kept in the manifest;
+        build_index creates the index once their chunks are in.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.index = None
+        self.stale = False
+        self.manifest["next_id"] = 0
+        self.db.execute("DELETE FROM chunks")
+        # left over from the LangChain FAISS store this format replaced
+        (self.path / "index.pkl").unlink(missing_ok=True)
+        return self
+
+    def save(self):
+        """Write the index, then the manifest - each atomically via a temp file."""
+        self.db.commit()
+        tmp = self.index_path.with_suffix(".faiss.tmp")
+        faiss.write_index(self.index, str(tmp))
+        os.replace(tmp, self.index_path)
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    @property
+    def db(self):
+        if self._db is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            # check_same_thread=False: the agent's tool may run on any thread
+            self._db = sqlite3.connect(self.docstore_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS chunks ("
+                "id INTEGER PRIMARY KEY, source TEXT NOT NULL, page INTEGER, text TEXT NOT NULL)"
+            )
+            self._create_fts()
+        return self._db
+
+    def _create_fts(self):
+        """Full-text index over chunks.text; built from the chunks if it is new."""
+        exists = self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chunks_fts'"
+        ).fetchone()
+        if exists:
+            return
+        self._db.executescript(
+            """
+            CREATE VIRTUAL TABLE chunks_fts USING fts5(
+                text, content='chunks', content_rowid='id', tokenize='porter unicode61'
+            );
+            CREATE TRIGGER chunks_fts_insert AFTER INSERT ON chunks BEGIN
+                INSERT INTO chunks_fts (rowid, text) VALUES (new.id, new.text);
+            END;
+            CREATE TRIGGER chunks_fts_delete AFTER DELETE ON chunks BEGIN
+                INSERT INTO chunks_fts (chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            END;
+            -- a docstore from before the full-text index
+            INSERT INTO chunks_fts (chunks_fts) VALUES ('rebuild');
+            """
+        )
+        self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    # ---------- updates ----------
+
+    @property
+    def files(self):
+        return self.manifest["files"]
+
+    def start_file(self, source, sha256, year=None):
+        """Record a (new or re-indexed) file; its chunks follow via add_chunks."""
+        self.files[source] = {"sha256": sha256, "year": year, "ids": []}
+
+    @property
+    def index_type(self):
+        # stores from before the index type was recorded were all flat
+        return self.manifest.get("index_type", "flat")
+
+    def add_chunks(self, records, vectors):
+        """Add (source, {"page", "text"}) records and their vectors, in one batch.
+
+        Without an index (after reset) only the docstore is written.
+        """
+        if not records:
+            return
+        start = self.manifest["next_id"]
+        ids = np.arange(start, start + len(records), dtype=np.int64)
+        if self.index is not None:
+            self.index.add_with_ids(np.asarray(vectors, dtype=np.float32), ids)
+        self.db.executemany(
+            "INSERT INTO chunks (id, source, page, text) VALUES (?, ?, ?, ?)",
+            [(int(i), source, c["page"], c["text"]) for i, (source, c) in zip(ids, records)],
+        )
+        for i, (source, _) in zip(ids.tolist(), records):
+            self.files[source]["ids"].append(i)
+        self.manifest["next_id"] = start + len(records)
+        self._ranges = None
+
+    def remove_file(self, source):
+        """Drop a file's vectors and chunks; returns how many were removed."""
+        entry = self.files.pop(source, None)
+        self._ranges = None
+        if not entry or not entry["ids"]:
+            return 0
+        ids = np.asarray(entry["ids"], dtype=np.int64)
+        if self.index is not None:
+            if self.index_type == "hnsw":
+                self.stale = True  # HNSW graphs don't support removal
+            else:
+                self.index.remove_ids(ids)
+        self.db.executemany("DELETE FROM chunks WHERE id = ?", [(int(i),) for i in ids])
+        return len(ids)
+
+    # ---------- (re)building the index ----------
+
+    def needs_build(self, kind):
+        """True if the index is missing, stale, of another type or trained on too few vectors."""
+        if self.index is None or self.stale or self.index_type != kind:
+            return True
+        trained_on = self.manifest.get("trained_on")
+        return kind == "ivfpq" and self.index.ntotal > IVF_RETRAIN_GROWTH * max(trained_on or 0, 1)
+
+    def build_index(self, kind, embed, dim=None):
+        """Build a `kind` index over every chunk in the docstore.
+
+        `embed(texts)` returns the chunks' vectors (rag_pipeline.py passes the
+        embedding cache, so they are not re-embedded). `dim` is only needed
+        when the docstore is empty.
+        """
+        count = self.db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        sample = []
+        if count:
+            # IVF centroids are trained on a random sample of the corpus
+            rows = self.db.execute(
+                "SELECT text FROM chunks ORDER BY RANDOM() LIMIT ?",
+                (IVF_TRAIN_SAMPLE if kind == "ivfpq" else 1,),
+            ).fetchall()
+            sample = np.asarray(embed([row[0] for row in rows]), dtype=np.float32)
+            dim = sample.shape[1]
+        index = make_index(kind, dim, count)
+        if not index.is_trained:
+            index.train(sample)
+
+        cursor = self.db.execute("SELECT id, text FROM chunks ORDER BY id")
+        while rows := cursor.fetchmany(BUILD_BATCH_SIZE):
+            ids = np.asarray([row[0] for row in rows], dtype=np.int64)
+            index.add_with_ids(np.asarray(embed([row[1] for row in rows]), dtype=np.float32), ids)
+
+        configure_search(index, kind)
+        self.index = index
+        self.stale = False
+        self.manifest.update(index_type=kind, dim=dim, trained_on=len(sample) if kind == "ivfpq" else None)
+        return self
+
+    # ---------- metadata filters ----------
+
+    def find_files(self, source=None, year=None):
+        """Files whose name contains `source` (ignoring case) and whose fiscal year is `year`."""
+        return [
+            name
+            for name, entry in self.files.items()
+            if (not source or source.casefold() in name.casefold())
+            and (year is None or (entry.get("year") or fiscal_year(name)) == int(year))
+        ]
+
+    def file_ranges(self, names):
+        """Merged chunk-id ranges of the files `names`."""
+        if self._ranges is None:
+            self._ranges = {name: id_ranges(entry["ids"]) for name, entry in self.files.items()}
+        return id_ranges_union(self._ranges[name] for name in names)
+
+    def _search_params(self, ranges):
+        """FAISS search parameters restricting the search to `ranges` of ids."""
+        if len(ranges) == 1:
+            selector = faiss.IDSelectorRange(*ranges[0])
+        else:
+            selector = faiss.IDSelectorBatch(np.concatenate([np.arange(a, b, dtype=np.int64) for a, b in ranges]))
+        # search-time knobs must be repeated: params replace the index's own
+        if self.index_type == "hnsw":
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=HNSW_EF_SEARCH), selector
+        if self.index_type == "ivfpq":
+            return faiss.SearchParametersIVF(sel=selector, nprobe=IVF_NPROBE), selector
+        return faiss.SearchParameters(sel=selector), selector
+
+    # ---------- queries ----------
+
+    def get_chunks(self, ids):
+        """Chunk dicts for `ids`, in the same order (missing ids are skipped)."""
+        ids = [int(i) for i in ids if i >= 0]
+        if not ids:
+            return []
+        placeholders = ",".join("?" * len(ids))
+        rows = self.db.execute(
+            f"SELECT id, source, page, text FROM chunks WHERE id IN ({placeholders})", ids
+        ).fetchall()
+        by_id = {row[0]: {"id": row[0], "source": row[1], "page": row[2], "text": row[3]} for row in rows}
+        return [by_id[i] for i in ids if i in by_id]
+
+    def keyword_ids(self, text, k=3, ranges=None):
+        """(chunk id, BM25 score) of the k best keyword matches for `text`, best first.
+
+        With `ranges`, only chunks whose id falls in one of them.
+        """
+        query = keyword_query(text)
+        if query is None or ranges == []:
+            return []
+        sql = "SELECT rowid, rank FROM chunks_fts WHERE chunks_fts MATCH ?"
+        args = [query]
+        if ranges is not None and len(ranges) == 1:
+            # one file (the usual filter): FTS5 limits its postings scan to the range
+            sql += " AND rowid >= ? AND rowid < ?"
+            args.extend(ranges[0])
+        elif ranges is not None:
+            # one parameter however many ranges: a JSON list of [start, stop] pairs
+            sql += (
+                " AND EXISTS (SELECT 1 FROM json_each(?) r"
+                " WHERE chunks_fts.rowid >= json_extract(r.value, '$[0]')"
+                " AND chunks_fts.rowid < json_extract(r.value, '$[1]'))"
+            )
+            args.append(json.dumps(ranges))
+        # rank is bm25() - more negative is a better match
+        rows = self.db.execute(sql + " ORDER BY rank LIMIT ?", (*args, k)).fetchall()
+        return [(i, -score) for i, score in rows]
+
+    def keyword_search(self, text, k=3):
+        """The k chunks ranking highest by BM25 for `text`, each with its `bm25` score."""
+        ranked = self.keyword_ids(text, k)
+        chunks = {c["id"]: c for c in self.get_chunks([i for i, _ in ranked])}
+        return [{**chunks[i], "bm25": score} for i, score in ranked if i in chunks]
+
+    def nearest_ids(self, vector, k=3, ranges=None):
+        """(chunk id, L2 distance) of the k vectors nearest to `vector`, nearest first.
+
+        With `ranges`, only vectors whose id falls in one of them are compared.
+        """
+        if self.index is None or self.index.ntotal == 0 or ranges == []:
+            return []
+        query = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        if ranges is None:
+            distances, ids = self.index.search(query, k)
+        else:
+            params, _selector = self._search_params(ranges)  # _selector must outlive the search
+            distances, ids = self.index.search(query, k, params=params)
+        return [(int(i), float(d)) for d, i in zip(distances[0], ids[0]) if i >= 0]
+
+    def search(self, vector, k=3):
+        """The k chunks nearest to `vector`, each with its L2 `distance`."""
+        ranked = self.nearest_ids(vector, k)
+        chunks = {c["id"]: c for c in self.get_chunks([i for i, _ in ranked])}
+        return [{**chunks[i], "distance": d} for i, d in ranked if i in chunks]
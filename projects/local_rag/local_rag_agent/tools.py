@@ -1,43 +1,228 @@
+"""
+tools.py
+    `search_faiss`, the agent's retrieval tool.
+
+    Retrieval is hybrid: the query is run against the FAISS index (dense,
+    meaning) and the docstore's BM25 full-text index (sparse, exact terms -
+    line items, tickers, fiscal years), RRF_CANDIDATES results each, and the
+    two rankings are merged with reciprocal-rank fusion:
+
+        score(chunk) = sum over rankings of 1 / (RRF_K + rank)
+
+    Set HYBRID_SEARCH=false for dense-only retrieval.
+
+    Optional `source` / `year` filters restrict both retrievers to the chunks
+    of the matching files (see IndexStore.find_files), so a question about
+    one company's filing only scans that filing.
+
+    The index and the embedding model are loaded once, under a lock (the
+    agent module starts a background warm-up at import, so the first query
+    usually finds them ready), and reloaded when rag_pipeline.py rewrites
+    the index. Two caches sit in front of the search:
+
+        query cache    normalized query text -> embedding (LRU, QUERY_CACHE_SIZE)
+        result cache   (normalized query, k, filters, index version) -> results
+                       (LRU, RESULT_CACHE_SIZE; cleared when the index changes)
+
+    so an agent re-asking the same - or a trivially reworded - question
+    skips both the embedding call and the search.
+"""
+
+import multiprocessing
 import os
 import pathlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
 from dotenv import load_dotenv
+from rich.console import Console
 
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
+from .embeddings import check_index_config, embedding_config, get_embeddings
+from .index_store import IndexStore
 
 load_dotenv(override=True)
-assert os.getenv(
-    "OPENAI_API_KEY"
-), f"FATAL ERROR: {pathlib.Path(__file__).name} ->  OPENAI_API_KEY not defined!"
 
 FAISS_INDEX_PATH = pathlib.Path(__file__).parent.parent / "faiss_index"
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "256"))
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "256"))
+HYBRID_SEARCH = os.getenv("HYBRID_SEARCH", "true").lower() not in ("0", "false", "no")
+RRF_K = int(os.getenv("RRF_K", "60"))
+RRF_CANDIDATES = int(os.getenv("RRF_CANDIDATES", "20"))
+
+console = Console()
+
+# Global variables to cache the FAISS index and the embedding model
+_store = None
+_embeddings = None
+_index_version = None  # manifest.json mtime of the loaded index
+_load_lock = threading.Lock()
+
+_query_cache = OrderedDict()
+_result_cache = OrderedDict()
+cache_stats = {"query_hits": 0, "query_misses": 0, "result_hits": 0, "result_misses": 0}
+
+
+def normalize_query(query: str) -> str:
+    """Case, spacing and trailing punctuation don't change what is being asked."""
+    return " ".join(query.casefold().split()).strip(" ?.!")
+
+
+def _lru_get(cache, key):
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
 
-# Global variable to cache the FAISS index
-_vector_store = None
+def _lru_put(cache, key, value, max_size):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > max_size:
+        cache.popitem(last=False)
 
 
-async def search_faiss(query: str) -> str:
-    """Tool function: Searches the FAISS index using OpenAI embeddings."""
-    global _vector_store
+def load_index() -> tuple[IndexStore, int] | str:
+    """Loads the index and embedding model, or reloads the index if the
+    pipeline has rewritten it since.
 
-    if not os.path.exists(FAISS_INDEX_PATH):
-        return "Error: Local index not found."
+    Returns the (store, version) pair it checked - callers search that store,
+    not the globals, which a concurrent reload may replace - or an error
+    message."""
+    global _store, _embeddings, _index_version
 
-    if _vector_store is None:
-        # Use a local, high-quality embedding model (runs on CPU)
-        embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+    manifest_path = FAISS_INDEX_PATH / "manifest.json"
+    with _load_lock:
+        try:
+            version = manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return "Error: Local index not found."
+        if _store is not None and version == _index_version:
+            return _store, _index_version
 
-        _vector_store = FAISS.load_local(
-            FAISS_INDEX_PATH, embeddings, allow_dangerous_deserialization=True
+        store = IndexStore(FAISS_INDEX_PATH)
+        if not store.exists():
+            return "Error: Local index not found."
+        store.load(mmap=True)  # read-only: pages are read as searches touch them
+        # vectors from another model live in a different space - searching
+        # them would return confident nonsense
+        mismatch = check_index_config(store.manifest)
+        if mismatch:
+            return f"Error: {mismatch}. Re-run rag_pipeline.py to rebuild the index."
+        if _embeddings is None:
+            _embeddings = get_embeddings(embedding_config())
+        # the previous store is left to the garbage collector: a search that
+        # started before the reload may still be reading it
+        _store, _index_version = store, version
+        _result_cache.clear()
+        return store, version
+
+
+def warm_up():
+    """Loads the index and the embedding model ahead of the first query."""
+    try:
+        loaded = load_index()
+        if not isinstance(loaded, str) and embedding_config()["embedding_backend"] == "local":
+            _embeddings.embed_query("warm up")  # first inference is the slow one
+    except Exception as ex:
+        # not fatal: the first query retries (and reports) the load
+        console.print(f"[dark_yellow]search_faiss warm-up failed: {ex}[/dark_yellow]")
+
+
+def start_warm_up():
+    """Runs warm_up() on a daemon thread - but not in rag_pipeline's PDF workers."""
+    if multiprocessing.parent_process() is None:
+        threading.Thread(target=warm_up, name="search_faiss-warm-up", daemon=True).start()
+
+
+async def _embed_query(query: str):
+    key = normalize_query(query)
+    vector = _lru_get(_query_cache, key)
+    if vector is not None:
+        cache_stats["query_hits"] += 1
+        return vector
+    cache_stats["query_misses"] += 1
+    vector = np.asarray(await _embeddings.aembed_query(query), dtype=np.float32)
+    _lru_put(_query_cache, key, vector, QUERY_CACHE_SIZE)
+    return vector
+
+
+def reciprocal_rank_fusion(rankings, k: int, rrf_k: int = RRF_K):
+    """Merges ranked lists of chunk ids: each id scores sum(1 / (rrf_k + rank)).
+
+    Returns the k best (id, score) pairs, best first.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking, start=1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+
+def _search(store: IndexStore, version: int, query: str, query_vector, k: int = 3, filters: dict | None = None):
+    # the query vector is a function of the normalized query (see _embed_query)
+    key = (normalize_query(query), k, tuple(sorted((filters or {}).items())), version)
+    results = _lru_get(_result_cache, key)
+    if results is not None:
+        cache_stats["result_hits"] += 1
+        return results
+    cache_stats["result_misses"] += 1
+    ranges = store.file_ranges(store.find_files(**filters)) if filters else None
+    if HYBRID_SEARCH:
+        candidates = max(k, RRF_CANDIDATES)
+        fused = reciprocal_rank_fusion(
+            [
+                [i for i, _ in store.nearest_ids(query_vector, k=candidates, ranges=ranges)],
+                [i for i, _ in store.keyword_ids(query, k=candidates, ranges=ranges)],
+            ],
+            k=k,
         )
+        # only the fused top k are read from the docstore
+        chunks = {c["id"]: c for c in store.get_chunks([i for i, _ in fused])}
+        results = [{**chunks[i], "rrf_score": score} for i, score in fused if i in chunks]
+    else:
+        ranked = store.nearest_ids(query_vector, k=k, ranges=ranges)
+        chunks = {c["id"]: c for c in store.get_chunks([i for i, _ in ranked])}
+        results = [{**chunks[i], "distance": d} for i, d in ranked if i in chunks]
+    _lru_put(_result_cache, key, results, RESULT_CACHE_SIZE)
+    return results
+
+
+def _describe_files(store: IndexStore):
+    files = [
+        f"{name} ({entry['year']})" if entry.get("year") else name
+        for name, entry in sorted(store.files.items())
+    ]
+    return ", ".join(files) or "none"
+
+
+async def search_faiss(query: str, source: str | None = None, year: int | None = None) -> str:
+    """Tool function: Searches the documents by meaning (FAISS) and by keyword (BM25).
+
+    Args:
+        query: what to look for.
+        source: optional - only search documents whose file name contains
+            this (case-insensitive), e.g. a company name such as "nike".
+        year: optional - only search documents for this fiscal year, e.g. 2023.
+    """
+    # cheap when nothing changed: one stat() of manifest.json
+    loaded = load_index()
+    if isinstance(loaded, str):
+        return loaded
+    store, version = loaded
+
+    filters = {name: value for name, value in (("source", source), ("year", year)) if value}
+    if filters and not store.find_files(**filters):
+        return f"No documents match {filters}. Available documents: {_describe_files(store)}."
 
-    results = _vector_store.similarity_search(query, k=3)
+    query_vector = await _embed_query(query)
+    results = _search(store, version, query, query_vector, k=3, filters=filters)
 
     sections = []
     for res in results:
-        source = res.metadata.get("source", "Unknown")
-        page = res.metadata.get("page", "?")
-        sections.append(f"[Source: {source}, Page: {page}]\n{res.page_content}")
+        source = res.get("source", "Unknown")
+        page = res.get("page", "?")
+        sections.append(f"[Source: {source}, Page: {page}]\n{res['text']}")
     return (
         "\n---\n".join(sections)
         if sections
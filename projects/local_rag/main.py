@@ -10,7 +10,7 @@ from google.adk.agents import Agent
 from google.adk.sessions import InMemorySessionService, Session
 from google.genai.types import Content, Part
 
-from rag_pipeline import build_local_index
+from rag_pipeline import DOCS_PATH, build_local_index, parse_args
 from local_rag_agent.agent import local_rag_agent
 
 load_dotenv(override=True)
@@ -18,8 +18,6 @@ assert os.getenv(
     "OPENAI_API_KEY"
 ), f"FATAL ERROR: {pathlib.Path(__file__).name} -> OPENAI_API_KEY not defined!"
 
-FAISS_INDEX_PATH = pathlib.Path(__file__).parent / "faiss_index"
-
 APP_NAME = "local_rag_app"
 USER_ID = "adk_user_007"
 
@@ -63,12 +61,10 @@ async def run_agent_query(
     return final_response
 
 
-async def main():
+async def main(rebuild: bool = False):
 
-    # 1. build faiss index, if it does not exist
-    if not FAISS_INDEX_PATH.exists():
-        pdf_path = pathlib.Path(__file__).parent / "docs"
-        build_local_index(str(pdf_path))
+    # 1. bring the faiss index up to date - only new / changed PDFs are embedded
+    build_local_index(str(DOCS_PATH), rebuild=rebuild)
 
     session_service = InMemorySessionService()
     session: Session = await session_service.create_session(
@@ -99,4 +95,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args("Local RAG agent - chat with the PDFs in docs/")
+    asyncio.run(main(rebuild=args.rebuild))
@@ -1,72 +1,227 @@
 """
 rag_pipeline.py
     Runs the RAG pipeline that creates the vector store, which agent quries
+
+    The index is updated incrementally: manifest.json records each PDF's
+    content hash and the ids of its chunks, so a run only embeds PDFs that
+    were added or changed and removes the vectors of changed or deleted ones.
+    Nothing is embedded when `docs/` hasn't changed, and chunks whose text
+    was embedded before (in any PDF, on any earlier run) come from the
+    embedding cache in embedding_cache/ instead of the API.
+
+    Ingestion is streamed: PDFs are parsed (page by page) in a pool of
+    PARSE_WORKERS processes, their chunks flow through a generator, and
+    batches of INDEX_BATCH_SIZE chunks are embedded and added to the index
+    as they fill up. At most a few PDFs' worth of chunks is held in memory,
+    however large the corpus.
+
+    The FAISS index type (flat / HNSW / IVF-PQ) follows the corpus size - see
+    local_rag_agent/index_store.py. When it changes, or HNSW vectors had to
+    be removed, the index is rebuilt from the docstore, with the vectors
+    taken from the embedding cache.
+
+        uv run rag_pipeline.py             # update the index
+        uv run rag_pipeline.py --rebuild   # rebuild the index from scratch
 """
 
+import argparse
+import hashlib
+import itertools
 import os
 import pathlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from dotenv import load_dotenv
 from rich.console import Console
 
 
 from langchain_community.document_loaders import PyPDFLoader
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from local_rag_agent.embedding_cache import EMBED_BATCH_SIZE, EMBED_CONCURRENCY, EmbeddingCache
+from local_rag_agent.embeddings import check_index_config, embedding_config, get_embeddings
+from local_rag_agent.index_store import IndexStore, choose_index_type, fiscal_year
+
 load_dotenv(override=True)
-assert os.getenv(
-    "OPENAI_API_KEY"
-), f"FATAL ERROR: {pathlib.Path(__file__).name} -> OPENAI_API_KEY not defined!"
 
 FAISS_INDEX_PATH = pathlib.Path(__file__).parent / "faiss_index"
+DOCS_PATH = pathlib.Path(__file__).parent / "docs"
+EMBEDDING_CACHE_PATH = pathlib.Path(__file__).parent / "embedding_cache"
+# processes parsing PDFs in parallel, and chunks embedded / indexed per batch
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+INDEX_BATCH_SIZE = int(os.getenv("INDEX_BATCH_SIZE", "512"))
 console = Console()
 
 
-def build_local_index(pdf_folder: str):
-    """Loads PDFs and builds a FAISS index using OpenAI Embeddings."""
-    pdf_path = pathlib.Path(pdf_folder).expanduser()
-    documents = []
-    console.print(f"[yellow]Loading PDFs from {str(pdf_path)}...[/yellow]")
+def file_sha256(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
 
-    num_files = 0
+def parse_pdf(path: str) -> list[dict]:
+    """Loads one PDF page by page and splits it into {"page", "text"} chunks.
 
-    for file in pdf_path.glob("*.pdf"):
-        tail_parts = file.parts[-2:]
+    Runs in a worker process, so it only takes and returns plain data.
+    """
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1024, chunk_overlap=100)
+    chunks = []
+    for doc in PyPDFLoader(path).lazy_load():
+        page = doc.metadata.get("page", 0) + 1  # 1-indexed
+        chunks.extend({"page": page, "text": text} for text in text_splitter.split_text(doc.page_content))
+    return chunks
+
+
+def iter_chunks(files: dict[str, pathlib.Path]):
+    """Yields (source, chunk) records, parsing the PDFs in a process pool.
+
+    Only 2 x PARSE_WORKERS PDFs are submitted at a time, so parsed-but-not-
+    yet-indexed chunks can't pile up when embedding is the bottleneck.
+    """
+
+    def loaded(name):
+        tail_parts = files[name].parts[-2:]
         display_path = "...\\" + "\\".join(tail_parts)
-        console.print(f"  - [dark_yellow]Loading {display_path}...[/dark_yellow]")
-        loader = PyPDFLoader(str(file))
-        loaded_docs = loader.load()
-        for doc in loaded_docs:
-            doc.metadata["source"] = file.name  # store filename only
-            doc.metadata["page"] = doc.metadata.get("page", 0) + 1  # 1-indexed
-        documents.extend(loaded_docs)
-        num_files += 1
+        console.print(f"  - [dark_yellow]Loaded {display_path}[/dark_yellow]")
 
-    print(f"Loaded {num_files} PDFs from {str(pdf_path)}")
+    if PARSE_WORKERS <= 1 or len(files) <= 1:
+        for name, file in files.items():
+            chunks = parse_pdf(str(file))
+            loaded(name)
+            yield from ((name, chunk) for chunk in chunks)
+        return
+
+    todo = iter(files.items())
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS) as pool:
+        pending = {
+            pool.submit(parse_pdf, str(file)): name
+            for name, file in itertools.islice(todo, 2 * PARSE_WORKERS)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                for next_name, next_file in itertools.islice(todo, 1):
+                    pending[pool.submit(parse_pdf, str(next_file))] = next_name
+                loaded(name)
+                yield from ((name, chunk) for chunk in future.result())
 
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1024, chunk_overlap=100)
-    docs = text_splitter.split_documents(documents)
 
-    # Use a local, high-quality embedding model (runs on CPU)
-    embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+def batched(records, size: int):
+    iterator = iter(records)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
 
-    # This will call the OpenAI API to generate embeddings for your text chunks
-    console.print("[yellow]Building FAISS index...[/yellow]", end="")
-    vectorstore = FAISS.from_documents(docs, embeddings)
-    vectorstore.save_local(FAISS_INDEX_PATH)
+
+def build_local_index(pdf_folder: str, rebuild: bool = False) -> dict:
+    """Brings the FAISS index in line with the PDFs in `pdf_folder`.
+
+    Only added / changed files are embedded (with the model selected in
+    local_rag_agent/embeddings.py); deleted files' vectors are removed. With
+    `rebuild` (or when there is no index in the current format yet, or it
+    was built with another embedding model) every file is re-indexed;
+    vectors still come from the embedding cache where possible.
+    Returns counts of added / changed / removed / unchanged files, of chunks
+    indexed and of chunks that had to be sent to the embeddings API.
+    """
+    pdf_path = pathlib.Path(pdf_folder).expanduser()
+    console.print(f"[yellow]Checking PDFs in {str(pdf_path)}...[/yellow]")
+    current = {file.name: file for file in sorted(pdf_path.glob("*.pdf"))}
+    hashes = {name: file_sha256(file) for name, file in current.items()}
+
+    config = embedding_config()
+    store = IndexStore(FAISS_INDEX_PATH)
+    rebuild = rebuild or not store.exists()
+    if not rebuild:
+        store.load()
+        mismatch = check_index_config(store.manifest, config)
+        if mismatch:
+            # vectors from two models can't share an index
+            console.print(f"[yellow]{mismatch} - rebuilding it[/yellow]")
+            store = IndexStore(FAISS_INDEX_PATH)
+            rebuild = True
+    if rebuild:
+        # chunks go to the docstore only; the index is built once they are all in
+        store.reset()
+
+    known = {} if rebuild else {name: entry["sha256"] for name, entry in store.files.items()}
+    added = [name for name in current if name not in known]
+    changed = [name for name in current if name in known and known[name] != hashes[name]]
+    removed = [name for name in known if name not in current]
+    stats = {
+        "added": len(added),
+        "changed": len(changed),
+        "removed": len(removed),
+        "unchanged": len(current) - len(added) - len(changed),
+        "chunks_indexed": 0,
+        "chunks_embedded": 0,
+    }
+    # INDEX_TYPE (or its thresholds) may have changed since the last run
+    if not (rebuild or added or changed or removed or store.needs_build(choose_index_type(store.index.ntotal))):
+        console.print(f"[green]✅ FAISS index is up to date ({len(current)} PDFs)[/green]")
+        store.close()
+        return stats
+
+    # the cache batches and retries API requests itself, so the OpenAI client
+    # neither re-splits nor re-tries them; a local model runs one batch at a
+    # time (it already uses every core)
+    local = config["embedding_backend"] == "local"
+    embeddings = get_embeddings(config, chunk_size=EMBED_BATCH_SIZE, max_retries=0)
+    cache = EmbeddingCache(
+        EMBEDDING_CACHE_PATH,
+        config["embedding_model"],
+        embeddings,
+        concurrency=1 if local else EMBED_CONCURRENCY,
+    )
+
+    for name in removed + changed:
+        count = store.remove_file(name)
+        console.print(f"  - [red]Removed {count} chunks of {name}[/red]")
+
+    to_index = {name: current[name] for name in changed + added}
+    for name in to_index:
+        # the fiscal year (for search_faiss's year filter) comes from the file
+        # name or else the cover page's "fiscal year ended ..."
+        store.start_file(name, hashes[name], year=fiscal_year(name))
+    for batch in batched(iter_chunks(to_index), INDEX_BATCH_SIZE):
+        for name, chunk in batch:
+            if store.files[name]["year"] is None and chunk["page"] <= 3:
+                store.files[name]["year"] = fiscal_year("", chunk["text"])
+        # only chunks the cache hasn't seen go to the OpenAI API
+        misses_before = cache.misses
+        vectors = cache.embed([chunk["text"] for _, chunk in batch])
+        store.add_chunks(batch, vectors)
+        stats["chunks_indexed"] += len(batch)
+        stats["chunks_embedded"] += cache.misses - misses_before
+
+    num_chunks = sum(len(entry["ids"]) for entry in store.files.values())
+    kind = choose_index_type(num_chunks)
+    if store.needs_build(kind):
+        console.print(f"[yellow]Building {kind} index over {num_chunks} chunks...[/yellow]")
+        # an empty corpus still needs the dimension for an (empty) index
+        dim = None if num_chunks else len(embeddings.embed_query("dimension"))
+        store.build_index(kind, cache.embed, dim=dim)
+    store.manifest.update(config)
+    store.save()
+    store.close()
     console.print(
-        f"\r[green]✅ FAISS index (OpenAI) saved to {str(FAISS_INDEX_PATH)}[/green]"
+        f"[green]✅ FAISS {store.index_type} index ({config['embedding_model']}) saved to {str(FAISS_INDEX_PATH)}: "
+        f"{stats['added']} added, {stats['changed']} changed, {stats['removed']} removed, "
+        f"{stats['chunks_indexed']} chunks indexed, {stats['chunks_embedded']} embedded "
+        f"(the rest from the embedding cache)[/green]"
+    )
+    return stats
+
+
+def parse_args(description: str = __doc__.splitlines()[1].strip()):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--rebuild", action="store_true", help="re-index every PDF instead of updating the index"
     )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    if not FAISS_INDEX_PATH.exists():
-        pdf_folder = pathlib.Path(__file__).parent / "docs"
-        console.print(
-            f"Building FAISS index from files in folder {str(pdf_folder)}...", end=""
-        )
-        build_local_index(pdf_folder)
-        console.print("Done!")
-    else:
-        print(f"Faiss index exists at {str(FAISS_INDEX_PATH)}")
+    args = parse_args()
+    build_local_index(DOCS_PATH, rebuild=args.rebuild)
@@ -0,0 +1,101 @@
+"""
+Shared /invoke_batch implementation for the agent services.
+
+Each item is handed to the service's normal (synchronous) invoke handler on
+a worker thread, so a batch behaves exactly like N /invoke calls. A
+service-level semaphore caps how many pipelines run at once across *all*
+batch requests, and identical items within a batch are only run once.
+Shared yfinance / RSS fetches for repeated tickers come from the tool-level
+caches (see agents/common/cache.py).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from typing import Callable, Dict
+
+from logger import get_logger
+
+from .models import (
+    AgentBatchItem,
+    AgentBatchRequest,
+    AgentBatchResponse,
+    AgentRequest,
+    AgentResponse,
+)
+
+logger = get_logger("retail_investment_copilot:batch")
+
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
+
+def new_batch_limiter() -> asyncio.Semaphore:
+    """Create the per-service limiter shared by all /invoke_batch requests."""
+    return asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+
+def _item_key(item: AgentRequest) -> str:
+    return json.dumps(
+        {"payload": item.payload, "prompt": item.prompt, "force_refresh": item.force_refresh},
+        sort_keys=True,
+        default=str,
+    )
+
+
+async def run_batch(
+    req: AgentBatchRequest,
+    handler: Callable[[AgentRequest], AgentResponse],
+    limiter: asyncio.Semaphore,
+    service: str,
+) -> AgentBatchResponse:
+    """Run `handler` over every item concurrently, returning results in order."""
+    logger.info(f"In run_batch() -> service={service!r}, items={len(req.items)}")
+    started = time.perf_counter()
+
+    async def run_one(item: AgentRequest) -> AgentResponse:
+        async with limiter:
+            return await asyncio.to_thread(handler, item)
+
+    tasks: Dict[str, asyncio.Task] = {}
+    for item in req.items:
+        key = _item_key(item)
+        if key not in tasks:
+            tasks[key] = asyncio.create_task(run_one(item))
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    results = []
+    for index, item in enumerate(req.items):
+        task = tasks[_item_key(item)]
+        if task.exception() is not None:
+            logger.warning(f"run_batch(): item {index} failed -> {task.exception()!r}")
+            results.append(
+                AgentBatchItem(index=index, status="error", error=str(task.exception()))
+            )
+        else:
+            response = task.result()
+            results.append(
+                AgentBatchItem(
+                    index=index,
+                    status=response.status,
+                    result=response.result,
+                    meta=response.meta,
+                )
+            )
+
+    failed = sum(1 for r in results if r.status != "ok")
+    elapsed_ms = round((time.perf_counter() - started) * 1000)
+    logger.info(f"Exiting run_batch() -> service={service!r}, failed={failed}, elapsed_ms={elapsed_ms}")
+    return AgentBatchResponse(
+        status="ok" if failed == 0 else ("error" if failed == len(results) else "partial"),
+        results=results,
+        meta={
+            "service": service,
+            "items": len(results),
+            "unique_items": len(tasks),
+            "failed": failed,
+            "elapsed_ms": elapsed_ms,
+        },
+    )
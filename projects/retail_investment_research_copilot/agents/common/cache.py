@@ -0,0 +1,141 @@
+"""
+Small in-process TTL cache with stale-while-revalidate semantics.
+
+Used by the agent tools to avoid re-downloading the same market data / news
+for every request. Behaviour per key:
+
+* fresh entry   -> returned immediately (hit)
+* stale entry   -> returned immediately, refresh scheduled in the background
+* expired / new -> fetched in the caller's thread (miss); concurrent misses
+                   for the same key wait on the one in-flight fetch instead
+                   of each triggering their own download
+
+Tools are plain sync functions called by ADK, so this is thread-based
+rather than asyncio-based.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from logger import get_logger
+
+logger = get_logger("retail_investment_copilot:cache")
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fetched_at: float
+
+
+class SWRCache:
+    """Thread-safe TTL cache keyed by string, with request coalescing."""
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[str], Any],
+        ttl_seconds: float,
+        max_stale_seconds: float,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+        refresh_workers: int = 2,
+    ) -> None:
+        self.name = name
+        self._fetch = fetch
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self._should_cache = should_cache or (lambda value: True)
+        self._entries: Dict[str, _Entry] = {}
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(
+            max_workers=refresh_workers, thread_name_prefix=f"{name}-refresh"
+        )
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "fetch_errors": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # public API
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            age = now - entry.fetched_at if entry else None
+
+            if entry is not None and age <= self.ttl_seconds:
+                self._stats["hits"] += 1
+                return entry.value
+
+            if entry is not None and age <= self.ttl_seconds + self.max_stale_seconds:
+                self._stats["stale_hits"] += 1
+                if key not in self._in_flight:
+                    future: Future = Future()
+                    self._in_flight[key] = future
+                    self._refresher.submit(self._load, key, future)
+                return entry.value
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                owner = False
+            else:
+                self._stats["misses"] += 1
+                future = Future()
+                self._in_flight[key] = future
+                owner = True
+
+        if owner:
+            self._load(key, future)
+        return future.result()
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        stats["ttl_seconds"] = self.ttl_seconds
+        stats["max_stale_seconds"] = self.max_stale_seconds
+        return stats
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+    def _load(self, key: str, future: Future) -> None:
+        """Fetch `key`, publish the result to waiters and store it."""
+        with self._lock:
+            refreshing = key in self._entries
+        try:
+            value = self._fetch(key)
+        except Exception as ex:
+            logger.warning(f"{self.name}: fetch failed for {key!r} -> {ex}")
+            with self._lock:
+                self._stats["fetch_errors"] += 1
+                self._in_flight.pop(key, None)
+            future.set_exception(ex)
+            return
+
+        with self._lock:
+            if self._should_cache(value):
+                self._entries[key] = _Entry(value=value, fetched_at=time.monotonic())
+            if refreshing:
+                self._stats["refreshes"] += 1
+            self._in_flight.pop(key, None)
+        future.set_result(value)
@@ -0,0 +1,77 @@
+"""
+Recorded tool data for offline runs (load tests, demos without network).
+
+When COPILOT_FIXTURES_DIR is set, the market data and news tools answer from
+JSON files in that directory instead of calling yfinance / Google News:
+
+    <dir>/market_snapshot.json   {"MSFT": {...snapshot...}, "_default": {...}}
+    <dir>/rss_news.json          {"MSFT": [...items...],    "_default": [...]}
+
+Tickers without their own entry get `_default`, with "{ticker}" in string
+values replaced by the requested ticker. COPILOT_FIXTURE_LATENCY_SECONDS adds
+a sleep per lookup to mimic the network round-trip.
+
+Fixtures are recorded from the live sources with
+`python scripts/load_test.py --record-fixtures MSFT,AAPL`.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+_lock = threading.Lock()
+_loaded: Dict[str, Dict[str, Any]] = {}
+
+
+def fixtures_dir() -> Optional[Path]:
+    value = os.getenv("COPILOT_FIXTURES_DIR")
+    return Path(value) if value else None
+
+
+def _substitute(value: Any, ticker: str) -> Any:
+    if isinstance(value, str):
+        return value.replace("{ticker}", ticker)
+    if isinstance(value, dict):
+        return {k: _substitute(v, ticker) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_substitute(v, ticker) for v in value]
+    return value
+
+
+def load_fixture(name: str, ticker: str) -> Optional[Any]:
+    """Return the recorded `name` data for `ticker`, or None when fixtures are off."""
+    directory = fixtures_dir()
+    if directory is None:
+        return None
+    path = directory / f"{name}.json"
+    with _lock:
+        if str(path) not in _loaded:
+            _loaded[str(path)] = json.loads(path.read_text(encoding="utf-8"))
+        data = _loaded[str(path)]
+
+    delay = float(os.getenv("COPILOT_FIXTURE_LATENCY_SECONDS", "0"))
+    if delay > 0:
+        time.sleep(delay)
+
+    if ticker in data:
+        return copy.deepcopy(data[ticker])
+    return _substitute(copy.deepcopy(data.get("_default")), ticker)
+
+
+def record_fixture(
+    name: str, tickers: Iterable[str], fetch: Callable[[str], Any], directory: Path
+) -> Path:
+    """Fetch live data for `tickers` and merge it into <directory>/<name>.json."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}.json"
+    data = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+    for ticker in tickers:
+        data[ticker] = fetch(ticker)
+    path.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+    return path
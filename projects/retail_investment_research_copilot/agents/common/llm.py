@@ -0,0 +1,30 @@
+"""
+Model factory shared by the three agent services.
+
+By default every agent talks to Claude through LiteLlm. Setting
+COPILOT_LLM_BACKEND=stub swaps in the offline StubLlm instead, so the whole
+stack can be run and benchmarked without API keys or credit:
+
+    COPILOT_LLM_BACKEND=stub COPILOT_STUB_LATENCY_SECONDS=0.5 python scripts/start_services.py
+
+COPILOT_STUB_OUTPUT_TOKENS sets the size of each stub answer (0 = a short
+canned line).
+"""
+
+import os
+from typing import Union
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.lite_llm import LiteLlm
+
+from .stub_llm import StubLlm
+
+
+def build_model(model: str) -> Union[LiteLlm, BaseLlm]:
+    """Return the LiteLlm for `model`, or a StubLlm when the stub backend is on."""
+    if os.getenv("COPILOT_LLM_BACKEND", "litellm").lower() == "stub":
+        return StubLlm(
+            latency_seconds=float(os.getenv("COPILOT_STUB_LATENCY_SECONDS", "0.5")),
+            output_tokens=int(os.getenv("COPILOT_STUB_OUTPUT_TOKENS", "0")),
+        )
+    return LiteLlm(model=model)
@@ -0,0 +1,347 @@
+"""
+Prometheus metrics for the agent services.
+
+A deliberately small, dependency-free registry: counters, gauges and
+histograms with labels, rendered in the Prometheus text exposition format
+by GET /metrics. Every update is a dict lookup plus a few additions under a
+lock, so collection stays on permanently.
+
+What is collected:
+
+    copilot_http_requests_total              service, route, method, status
+    copilot_http_request_duration_seconds    service, route   (histogram)
+    copilot_http_requests_in_flight          service          (gauge)
+    copilot_llm_calls_total                  service, agent, status
+    copilot_llm_call_duration_seconds        service, agent   (histogram)
+    copilot_llm_tokens_total                 service, agent, kind (prompt/completion)
+    copilot_tool_fetches_total               source, outcome
+    copilot_tool_fetch_duration_seconds      source           (histogram)
+
+LLM metrics come from an ADK plugin (LlmMetricsPlugin) attached to every
+Runner; HTTP metrics from an ASGI middleware installed by instrument_app().
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.responses import Response
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 128)
+FETCH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+            for key, v in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args: Any, buckets: Iterable[float] = HTTP_BUCKETS, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(c), t[0]) for k, (c, t) in self._values.items()]
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(
+    Counter(
+        "copilot_http_requests_total",
+        "HTTP requests handled.",
+        ("service", "route", "method", "status"),
+    )
+)
+HTTP_LATENCY = REGISTRY.register(
+    Histogram(
+        "copilot_http_request_duration_seconds",
+        "HTTP request latency, until the last byte of the response is sent.",
+        ("service", "route"),
+        buckets=HTTP_BUCKETS,
+    )
+)
+HTTP_IN_FLIGHT = REGISTRY.register(
+    Gauge("copilot_http_requests_in_flight", "HTTP requests currently being served.", ("service",))
+)
+LLM_CALLS = REGISTRY.register(
+    Counter("copilot_llm_calls_total", "LLM calls made by ADK agents.", ("service", "agent", "status"))
+)
+LLM_LATENCY = REGISTRY.register(
+    Histogram(
+        "copilot_llm_call_duration_seconds",
+        "LLM call latency per agent.",
+        ("service", "agent"),
+        buckets=LLM_BUCKETS,
+    )
+)
+LLM_TOKENS = REGISTRY.register(
+    Counter(
+        "copilot_llm_tokens_total",
+        "LLM tokens reported by the provider.",
+        ("service", "agent", "kind"),
+    )
+)
+FETCHES = REGISTRY.register(
+    Counter("copilot_tool_fetches_total", "External data fetches by tools.", ("source", "outcome"))
+)
+FETCH_LATENCY = REGISTRY.register(
+    Histogram(
+        "copilot_tool_fetch_duration_seconds",
+        "External data fetch latency (yfinance, RSS).",
+        ("source",),
+        buckets=FETCH_BUCKETS,
+    )
+)
+
+
+# ----------------------------------------------------------------------
+# tools
+# ----------------------------------------------------------------------
+def track_fetch(
+    source: str, is_error: Optional[Callable[[Any], bool]] = None
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator timing an external fetch; `is_error` flags soft failures."""
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = fn(*args, **kwargs)
+                outcome = "error" if is_error and is_error(result) else "ok"
+                return result
+            finally:
+                FETCH_LATENCY.observe(time.perf_counter() - started, source=source)
+                FETCHES.inc(source=source, outcome=outcome)
+
+        return wrapper
+
+    return decorator
+
+
+# ----------------------------------------------------------------------
+# LLM calls (ADK plugin)
+# ----------------------------------------------------------------------
+class LlmMetricsPlugin(BasePlugin):
+    """Counts, times and token-counts every model call made through a Runner."""
+
+    def __init__(self, service: str) -> None:
+        super().__init__(name="llm_metrics")
+        self.service = service
+        self._started: Dict[Tuple[str, str], float] = {}
+
+    def _key(self, callback_context: CallbackContext) -> Tuple[str, str]:
+        # calls within one agent are sequential; parallel agents have distinct names
+        return (callback_context.invocation_id, callback_context.agent_name)
+
+    def _finish(self, callback_context: CallbackContext, status: str) -> None:
+        started = self._started.pop(self._key(callback_context), None)
+        agent = callback_context.agent_name
+        LLM_CALLS.inc(service=self.service, agent=agent, status=status)
+        if started is not None:
+            LLM_LATENCY.observe(time.perf_counter() - started, service=self.service, agent=agent)
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        self._started[self._key(callback_context)] = time.perf_counter()
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        if llm_response.partial:
+            return None
+        self._finish(callback_context, "error" if llm_response.error_code else "ok")
+        usage = llm_response.usage_metadata
+        if usage is not None:
+            agent = callback_context.agent_name
+            LLM_TOKENS.inc(
+                usage.prompt_token_count or 0, service=self.service, agent=agent, kind="prompt"
+            )
+            LLM_TOKENS.inc(
+                usage.candidates_token_count or 0,
+                service=self.service,
+                agent=agent,
+                kind="completion",
+            )
+        return None
+
+    async def on_model_error_callback(
+        self,
+        *,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+        error: Exception,
+    ) -> Optional[LlmResponse]:
+        self._finish(callback_context, "error")
+        return None
+
+
+# ----------------------------------------------------------------------
+# HTTP (ASGI middleware + /metrics route)
+# ----------------------------------------------------------------------
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streamed responses are timed to the last byte."""
+
+    def __init__(self, app: Any, service: str) -> None:
+        self.app = app
+        self.service = service
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(service=self.service)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec(service=self.service)
+            # the router stores the matched route in the scope; use its
+            # template so label cardinality stays bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_LATENCY.observe(time.perf_counter() - started, service=self.service, route=route)
+            HTTP_REQUESTS.inc(
+                service=self.service,
+                route=route,
+                method=scope.get("method", ""),
+                status=str(status["code"]),
+            )
+
+
+def instrument_app(app: Any, service: str) -> None:
+    """Add the metrics middleware and a GET /metrics route to a FastAPI app."""
+    app.add_middleware(MetricsMiddleware, service=service)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics() -> Response:
+        return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
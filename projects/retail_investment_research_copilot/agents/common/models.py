@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -8,6 +8,8 @@ class AgentRequest(BaseModel):
 
     payload: Dict[str, Any] = Field(default_factory=dict)
     prompt: Optional[str] = None
+    # bypass result caches (memo service) and regenerate
+    force_refresh: bool = False
 
 
 class AgentResponse(BaseModel):
@@ -16,3 +18,27 @@ class AgentResponse(BaseModel):
     status: str = "ok"
     result: str
     meta: Dict[str, Any] = Field(default_factory=dict)
+
+
+class AgentBatchRequest(BaseModel):
+    """A list of independent requests for one service's /invoke_batch."""
+
+    items: List[AgentRequest] = Field(default_factory=list)
+
+
+class AgentBatchItem(BaseModel):
+    """Outcome of one item in a batch; `index` matches the request order."""
+
+    index: int
+    status: str = "ok"
+    result: Optional[str] = None
+    error: Optional[str] = None
+    meta: Dict[str, Any] = Field(default_factory=dict)
+
+
+class AgentBatchResponse(BaseModel):
+    """Response model for /invoke_batch."""
+
+    status: str = "ok"
+    results: List[AgentBatchItem] = Field(default_factory=list)
+    meta: Dict[str, Any] = Field(default_factory=dict)
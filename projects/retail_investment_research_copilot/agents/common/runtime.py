@@ -15,6 +15,8 @@ from google.adk.sessions import InMemorySessionService
 from google.genai import types
 from logger import get_logger
 
+from agents.common.metrics import LlmMetricsPlugin
+
 logger = get_logger("retail_investment_copilot:runtime")
 
 
@@ -36,15 +38,26 @@ async def run_agent_async(
     agent: Any,
     prompt: str,
     initial_state: Optional[Dict[str, Any]] = None,
+    *,
+    service: str,
 ) -> str:
-    """Run an ADK agent in-process and return the final text response."""
+    """Run an ADK agent in-process and return the final text response.
+
+    ``service`` labels the LLM metrics (e.g. "memo_service"), matching the
+    per-service runtimes rather than the agent's own name.
+    """
     app_name = os.getenv("APP_NAME", "local_adk_app")
     user_id = os.getenv("ADK_USER_ID", "demo_user")
 
     logger.info(f"run_agent_async: app_name={app_name!r}, agent={agent.name!r}")
 
     session_service = InMemorySessionService()
-    runner = Runner(agent=agent, app_name=app_name, session_service=session_service)
+    runner = Runner(
+        agent=agent,
+        app_name=app_name,
+        session_service=session_service,
+        plugins=[LlmMetricsPlugin(service=service)],
+    )
 
     session = await runner.session_service.create_session(
         app_name=app_name,
@@ -79,8 +92,12 @@ def run_agent(
     agent: Any,
     prompt: str,
     initial_state: Optional[Dict[str, Any]] = None,
+    *,
+    service: str,
 ) -> str:
     """Synchronous wrapper around run_agent_async."""
     return asyncio.run(
-        run_agent_async(agent=agent, prompt=prompt, initial_state=initial_state)
+        run_agent_async(
+            agent=agent, prompt=prompt, initial_state=initial_state, service=service
+        )
     )
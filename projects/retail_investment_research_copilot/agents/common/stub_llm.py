@@ -0,0 +1,80 @@
+"""
+Deterministic stand-in for LiteLlm, used by the benchmark and load-test scripts.
+
+StubLlm never calls a provider: it sleeps for a fixed latency (to mimic a
+model round-trip) and answers with canned text. With `output_tokens` set it
+answers with roughly that many tokens of filler and reports token usage, so
+downstream prompts grow the way they do with a real model. When the agent
+has tools and none has been called yet, it calls the first tool with the
+ticker found in the prompt, so tool-backed agents exercise their tools too.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import AsyncGenerator, Optional
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+_TICKER_RE = re.compile(r"""['"]?ticker['"]?\s*[:=]\s*['"]?([A-Za-z0-9.\-^]+)""", re.IGNORECASE)
+_FILLER = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor".split()
+
+
+def _request_text(llm_request: LlmRequest) -> str:
+    chunks = []
+    for content in llm_request.contents or []:
+        for part in content.parts or []:
+            if part.text:
+                chunks.append(part.text)
+    return "\n".join(chunks)
+
+
+def _has_function_response(llm_request: LlmRequest) -> bool:
+    return any(
+        part.function_response is not None
+        for content in llm_request.contents or []
+        for part in content.parts or []
+    )
+
+
+class StubLlm(BaseLlm):
+    """Offline model with a configurable per-call latency and output size."""
+
+    model: str = "stub/deterministic"
+    latency_seconds: float = 1.0
+    # 0 -> short canned answer; otherwise ~this many tokens of filler text
+    output_tokens: int = 0
+    call_tools: bool = True
+
+    def _tool_call(self, llm_request: LlmRequest, prompt: str) -> Optional[types.Part]:
+        if not self.call_tools or not llm_request.tools_dict or _has_function_response(llm_request):
+            return None
+        match = _TICKER_RE.search(prompt)
+        ticker = match.group(1).upper() if match else "MSFT"
+        name = next(iter(llm_request.tools_dict))
+        return types.Part(function_call=types.FunctionCall(name=name, args={"ticker": ticker}))
+
+    def _text(self) -> str:
+        if self.output_tokens <= 0:
+            return f"[stub response from {self.model}]"
+        # ~0.75 words per token, like English prose
+        words = max(1, int(self.output_tokens * 0.75))
+        return " ".join(_FILLER[i % len(_FILLER)] for i in range(words))
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self.latency_seconds)
+        prompt = _request_text(llm_request)
+        part = self._tool_call(llm_request, prompt) or types.Part(text=self._text())
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=len(prompt) // 4,
+                candidates_token_count=self.output_tokens if part.text else 16,
+            ),
+        )
@@ -0,0 +1,51 @@
+"""
+All three copilot services in a single process.
+
+Mounts the market data, news and memo apps under one FastAPI app so a small
+deployment needs one uvicorn process (and one copy of the Python / ADK /
+LiteLLM runtime) instead of three:
+
+    uvicorn agents.composite_app:app --port 8100
+
+    POST /market_data/invoke      POST /market_data/invoke_batch
+    POST /news/invoke             POST /news/invoke_batch
+    POST /memo/invoke             POST /memo/invoke_batch
+    POST /memo/invoke/stream      GET  /health, /metrics
+
+Point the client at it with MARKET_DATA_SERVICE_URL, NEWS_SERVICE_URL and
+MEMO_SERVICE_URL (see .env.example). The split deployment (one process per
+service, scripts/start_services.py) still works unchanged.
+"""
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+from agents.common.metrics import CONTENT_TYPE, REGISTRY
+from agents.market_data_service import service_app as market_data_app
+from agents.memo_service import service_app as memo_app
+from agents.news_service import service_app as news_app
+
+MOUNTS = {
+    "market_data": market_data_app,
+    "news": news_app,
+    "memo": memo_app,
+}
+
+app = FastAPI(title="Investment Research Copilot")
+
+
+@app.get("/health")
+def health() -> dict:
+    services = {name: module.health() for name, module in MOUNTS.items()}
+    status = "ok" if all(s.get("status") == "ok" for s in services.values()) else "degraded"
+    return {"status": status, "service": "composite", "services": services}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    # one registry per process: the same series the mounted apps expose
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+for name, module in MOUNTS.items():
+    app.mount(f"/{name}", module.app)
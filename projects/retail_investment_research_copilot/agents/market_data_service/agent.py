@@ -1,13 +1,14 @@
 from dotenv import load_dotenv
 from google.adk.agents import LlmAgent, SequentialAgent
-from google.adk.models.lite_llm import LiteLlm
 from logger import get_logger
 
+from agents.common.llm import build_model
+
 from .tools import render_market_snapshot
 
-load_dotenv(override=True)
+load_dotenv(override=False)
 
-MODEL = LiteLlm(model="anthropic/claude-sonnet-4-6")
+MODEL = build_model("anthropic/claude-sonnet-4-6")
 
 logger = get_logger("retail_investment_copilot:market_data_service")
 
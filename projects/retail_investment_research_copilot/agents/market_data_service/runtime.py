@@ -8,6 +8,8 @@ from google.adk.sessions import InMemorySessionService
 from google.genai import types
 from logger import get_logger
 
+from agents.common.metrics import LlmMetricsPlugin
+
 logger = get_logger("retail_investment_copilot:market_data_service:runtime")
 
 
@@ -43,6 +45,7 @@ async def run_agent_async(
         agent=agent,
         app_name=app_name,
         session_service=session_service,
+        plugins=[LlmMetricsPlugin(service="market_data_service")],
     )
 
     session = await runner.session_service.create_session(
@@ -1,16 +1,39 @@
 from __future__ import annotations
 
 import json
+import os
 from typing import Any, Dict
 
 import yfinance as yf
+from dotenv import load_dotenv
 from logger import get_logger
 
+from agents.common.cache import SWRCache
+from agents.common.fixtures import load_fixture
+from agents.common.metrics import track_fetch
+
+load_dotenv(override=False)
+
 logger = get_logger("retail_investment_copilot:market_data_service:tools")
 
+# Snapshots are served from cache for MARKET_SNAPSHOT_TTL_SECONDS. After that
+# they are still served (and refreshed in the background) for up to
+# MARKET_SNAPSHOT_MAX_STALE_SECONDS more, after which a caller waits for a
+# fresh download.
+MARKET_SNAPSHOT_TTL_SECONDS = float(os.getenv("MARKET_SNAPSHOT_TTL_SECONDS", "60"))
+MARKET_SNAPSHOT_MAX_STALE_SECONDS = float(
+    os.getenv("MARKET_SNAPSHOT_MAX_STALE_SECONDS", "900")
+)
+
+
+@track_fetch("yfinance", is_error=lambda snapshot: "error" in snapshot)
+def _fetch_market_snapshot(ticker: str) -> Dict[str, Any]:
+    """Download info + 1y history from yfinance and derive the snapshot."""
+    logger.info(f"In market_data_service::_fetch_market_snapshot() -> {ticker}")
+    fixture = load_fixture("market_snapshot", ticker)
+    if fixture is not None:
+        return fixture
 
-def get_market_snapshot(ticker: str) -> Dict[str, Any]:
-    logger.info(f"In market_data_service::get_market_snapshot() -> {ticker}")
     tk = yf.Ticker(ticker)
     info = tk.info or {}
     hist = tk.history(period="1y", interval="1d")
@@ -18,7 +41,7 @@ def get_market_snapshot(ticker: str) -> Dict[str, Any]:
 
     if hist.empty:
         ret_val = {"ticker": ticker, "error": "No market data returned by yfinance."}
-        logger.info(f"Exiting market_data_service::get_market_snapshot() -> {ret_val}")
+        logger.info(f"Exiting market_data_service::_fetch_market_snapshot() -> {ret_val}")
         return ret_val
 
     close = hist["Close"].dropna()
@@ -58,10 +81,25 @@ def get_market_snapshot(ticker: str) -> Dict[str, Any]:
             (float(close.iloc[-1]) / float(close.tail(200).mean()) - 1) * 100, 2
         ),
     }
-    logger.info(f"market_data_service::get_market_snapshot(): snapshot -> {snapshot}")
+    logger.info(f"market_data_service::_fetch_market_snapshot(): snapshot -> {snapshot}")
     return snapshot
 
 
+snapshot_cache = SWRCache(
+    name="market_snapshot",
+    fetch=_fetch_market_snapshot,
+    ttl_seconds=MARKET_SNAPSHOT_TTL_SECONDS,
+    max_stale_seconds=MARKET_SNAPSHOT_MAX_STALE_SECONDS,
+    # don't pin "no data" answers - a retry a few seconds later may succeed
+    should_cache=lambda snapshot: "error" not in snapshot,
+)
+
+
+def get_market_snapshot(ticker: str) -> Dict[str, Any]:
+    logger.info(f"In market_data_service::get_market_snapshot() -> {ticker}")
+    return snapshot_cache.get(ticker.strip().upper())
+
+
 def render_market_snapshot(ticker: str) -> str:
     snapshot = get_market_snapshot(ticker)
     return json.dumps(snapshot, indent=2, default=str)
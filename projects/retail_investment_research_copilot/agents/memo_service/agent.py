@@ -9,40 +9,57 @@ Performance notes
 * The redundant `finalizer` LlmAgent has been removed; the rewriter's
   output is the final memo.  The runtime returns the last event text, so
   draft_memo is returned directly.
+* The intake stage is a deterministic PayloadIntakeAgent (see intake.py)
+  rather than an LlmAgent, so the specialists start without waiting on a
+  serial LLM round-trip. Pass llm_intake=True to build the old pipeline
+  (used by scripts/benchmark_memo_intake.py).
 """
 
+from typing import Optional, Union
+
 from dotenv import load_dotenv
 from google.adk.agents import LlmAgent, LoopAgent, ParallelAgent, SequentialAgent
-from google.adk.models.lite_llm import LiteLlm
+from google.adk.models.base_llm import BaseLlm
 from logger import get_logger
 
-load_dotenv(override=True)
+from agents.common.llm import build_model
+
+from .intake import PayloadIntakeAgent
+
+load_dotenv(override=False)
 
 logger = get_logger("retail_investment_copilot:memo_service:agent")
 
-MODEL = LiteLlm(model="anthropic/claude-sonnet-4-6")
+MODEL = build_model("anthropic/claude-sonnet-4-6")
 
 
-def build_root_agent():
+def build_root_agent(
+    model: Optional[Union[str, BaseLlm]] = None,
+    llm_intake: bool = False,
+):
     logger.info("In memo_service::build_root_agent() ->")
+    model = model or MODEL
 
     # ------------------------------------------------------------------
     # Stage 1 — Intake
-    # Parses the raw JSON payload and produces a clean prose brief that
-    # all downstream agents can read without having to re-parse JSON.
+    # Renders the raw JSON payload into a labelled prose brief that all
+    # downstream agents can read without having to re-parse JSON.
     # ------------------------------------------------------------------
-    intake_agent = LlmAgent(
-        name="memo_intake",
-        model=MODEL,
-        instruction=(
-            "You will receive a JSON payload containing the following fields: "
-            "ticker, horizon, risk_appetite, market_data_analysis (or market_data), and news_analysis. "
-            "Extract all fields and write a concise internal research brief in plain prose. "
-            "Label each section clearly: Ticker, Horizon, Risk Appetite, Market Data Summary, News Summary. "
-            "Do not add opinions — just organise the facts."
-        ),
-        output_key="research_brief",
-    )
+    if llm_intake:
+        intake_agent = LlmAgent(
+            name="memo_intake",
+            model=model,
+            instruction=(
+                "You will receive a JSON payload containing the following fields: "
+                "ticker, horizon, risk_appetite, market_data_analysis (or market_data), and news_analysis. "
+                "Extract all fields and write a concise internal research brief in plain prose. "
+                "Label each section clearly: Ticker, Horizon, Risk Appetite, Market Data Summary, News Summary. "
+                "Do not add opinions — just organise the facts."
+            ),
+            output_key="research_brief",
+        )
+    else:
+        intake_agent = PayloadIntakeAgent(name="memo_intake")
 
     # ------------------------------------------------------------------
     # Stage 2 — Parallel specialist analysis
@@ -51,7 +68,7 @@ def build_root_agent():
     # ------------------------------------------------------------------
     valuation_agent = LlmAgent(
         name="valuation_specialist",
-        model=MODEL,
+        model=model,
         instruction=(
             "You are a valuation analyst. Use the research brief below.\n\n"
             "{research_brief}\n\n"
@@ -63,7 +80,7 @@ def build_root_agent():
 
     momentum_agent = LlmAgent(
         name="momentum_specialist",
-        model=MODEL,
+        model=model,
         instruction=(
             "You are a technical/momentum analyst. Use the research brief below.\n\n"
             "{research_brief}\n\n"
@@ -75,7 +92,7 @@ def build_root_agent():
 
     risk_agent = LlmAgent(
         name="risk_specialist",
-        model=MODEL,
+        model=model,
         instruction=(
             "You are a risk analyst. Use the research brief below.\n\n"
             "{research_brief}\n\n"
@@ -97,7 +114,7 @@ def build_root_agent():
     # ------------------------------------------------------------------
     writer_agent = LlmAgent(
         name="memo_writer",
-        model=MODEL,
+        model=model,
         instruction=(
             "You are a senior investment analyst writing an educational memo. "
             "Use the inputs below — do not invent data not present in them.\n\n"
@@ -127,7 +144,7 @@ def build_root_agent():
     # ------------------------------------------------------------------
     critic_agent = LlmAgent(
         name="memo_critic",
-        model=MODEL,
+        model=model,
         instruction=(
             "Review the draft memo below.\n\n"
             "{draft_memo}\n\n"
@@ -141,7 +158,7 @@ def build_root_agent():
 
     rewriter_agent = LlmAgent(
         name="memo_rewriter",
-        model=MODEL,
+        model=model,
         instruction=(
             "Rewrite the memo below using the critique as a guide.\n\n"
             "## Draft Memo\n{draft_memo}\n\n"
@@ -162,11 +179,11 @@ def build_root_agent():
     return SequentialAgent(
         name="memo_pipeline",
         sub_agents=[
-            intake_agent,       # 1 LLM call
+            intake_agent,       # no LLM call (1 with llm_intake=True)
             parallel_stage,     # 3 LLM calls (concurrent)
             writer_agent,       # 1 LLM call
             refinement_loop,    # 2 LLM calls (critic + rewriter)
-            # Total: 7 LLM calls, 3 of which run in parallel
-            # (was 9 calls with max_iterations=2 + finalizer)
+            # Total: 6 LLM calls, 3 of which run in parallel
+            # (was 9 calls with an LLM intake, max_iterations=2 + finalizer)
         ],
     )
@@ -0,0 +1,197 @@
+"""
+Persistent cache of finished memos.
+
+A memo costs six or seven Claude calls, and users often regenerate the memo
+for the same ticker / horizon / risk appetite while the upstream market and
+news analysis text has not changed. Finished memos are therefore stored in
+SQLite, keyed by a hash of the *normalized* request:
+
+* ticker upper-cased, horizon / risk appetite lower-cased, whitespace in
+  every text field collapsed - so "msft " and "MSFT" share an entry
+* keys sorted before hashing, so field order does not matter
+* the model name and MEMO_CACHE_VERSION are part of the key, so switching
+  models or bumping the version after a prompt change never serves old memos
+
+Entries expire after MEMO_CACHE_TTL_SECONDS (default: 8 hours, roughly a
+trading day). Once MEMO_CACHE_MAX_ENTRIES is exceeded the least recently
+used entries are evicted. Requests with force_refresh=True skip the lookup
+but still store the new memo.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+from logger import get_logger
+
+load_dotenv(override=False)
+
+logger = get_logger("retail_investment_copilot:memo_service:cache")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _resolve_cache_path(path: str) -> str:
+    """Relative paths are taken from the project root, so every service started
+    from any directory shares one cache file; absolute paths and ":memory:"
+    are used as given."""
+    if path == ":memory:" or Path(path).is_absolute():
+        return path
+    return str(PROJECT_ROOT / path)
+
+
+MEMO_CACHE_ENABLED = os.getenv("MEMO_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+MEMO_CACHE_PATH = _resolve_cache_path(os.getenv("MEMO_CACHE_PATH", "data/memo_cache.sqlite3"))
+MEMO_CACHE_TTL_SECONDS = float(os.getenv("MEMO_CACHE_TTL_SECONDS", str(8 * 60 * 60)))
+MEMO_CACHE_MAX_ENTRIES = int(os.getenv("MEMO_CACHE_MAX_ENTRIES", "500"))
+MEMO_CACHE_VERSION = os.getenv("MEMO_CACHE_VERSION", "1")
+
+_UPPER_FIELDS = {"ticker"}
+_LOWER_FIELDS = {"horizon", "risk_appetite"}
+
+
+def _normalize(key: str, value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _normalize(k, v) for k, v in value.items() if v not in (None, "")}
+    if isinstance(value, list):
+        return [_normalize(key, v) for v in value]
+    if isinstance(value, str):
+        value = re.sub(r"\s+", " ", value).strip()
+        if key in _UPPER_FIELDS:
+            return value.upper()
+        if key in _LOWER_FIELDS:
+            return value.lower()
+    return value
+
+
+def memo_cache_key(payload: Dict[str, Any], prompt: Optional[str], model: str) -> str:
+    """Canonical sha256 of a memo request."""
+    canonical = json.dumps(
+        {
+            "version": MEMO_CACHE_VERSION,
+            "model": model,
+            "payload": _normalize("", payload),
+            "prompt": _normalize("prompt", prompt) if prompt else None,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MemoCache:
+    """SQLite-backed memo store with TTL expiry and LRU size eviction."""
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "bypassed": 0}
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS memo_cache (
+                key          TEXT PRIMARY KEY,
+                ticker       TEXT,
+                result       TEXT NOT NULL,
+                created_at   REAL NOT NULL,
+                last_used_at REAL NOT NULL,
+                hits         INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS memo_cache_last_used ON memo_cache (last_used_at)"
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return {"result", "age_seconds", "expires_in_seconds"} or None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM memo_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM memo_cache WHERE key = ?", (key,))
+                self._stats["misses"] += 1
+                return None
+            self._conn.execute(
+                "UPDATE memo_cache SET last_used_at = ?, hits = hits + 1 WHERE key = ?",
+                (now, key),
+            )
+            self._stats["hits"] += 1
+        age = now - row[1]
+        return {
+            "result": row[0],
+            "age_seconds": round(age, 1),
+            "expires_in_seconds": round(self.ttl_seconds - age, 1),
+        }
+
+    def put(self, key: str, result: str, ticker: Optional[str] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO memo_cache (key, ticker, result, created_at, last_used_at, hits) "
+                "VALUES (?, ?, ?, ?, ?, 0)",
+                (key, ticker, result, now, now),
+            )
+            self._stats["stores"] += 1
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        expired = self._conn.execute(
+            "DELETE FROM memo_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        overflow = self._conn.execute(
+            """
+            DELETE FROM memo_cache WHERE key IN (
+                SELECT key FROM memo_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        ).rowcount
+        if expired or overflow:
+            self._stats["evictions"] += expired + overflow
+            logger.info(f"MemoCache._evict() -> expired={expired}, lru={overflow}")
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM memo_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM memo_cache").fetchone()[0]
+            return {
+                **self._stats,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+memo_cache: Optional[MemoCache] = (
+    MemoCache(MEMO_CACHE_PATH, MEMO_CACHE_TTL_SECONDS, MEMO_CACHE_MAX_ENTRIES)
+    if MEMO_CACHE_ENABLED
+    else None
+)
@@ -0,0 +1,75 @@
+"""
+Deterministic intake stage for the memo pipeline.
+
+The memo service receives a JSON payload from the client (ticker, horizon,
+risk_appetite, market_data_analysis / market_data, news_analysis). Turning
+that into the labelled research brief the specialists read is pure string
+formatting, so it is done here in Python instead of with an LLM round-trip.
+The brief is written to session state under `research_brief`, exactly where
+the old LlmAgent intake left it.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncGenerator, Dict
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from logger import get_logger
+
+logger = get_logger("retail_investment_copilot:memo_service:intake")
+
+NOT_PROVIDED = "Not provided."
+
+
+def _as_text(value: Any) -> str:
+    if value is None:
+        return NOT_PROVIDED
+    if isinstance(value, str):
+        return value.strip() or NOT_PROVIDED
+    return json.dumps(value, indent=2, default=str)
+
+
+def render_research_brief(payload: Dict[str, Any], prompt: str = "") -> str:
+    """Render the memo payload as the labelled research brief."""
+    market = payload.get("market_data_analysis") or payload.get("market_data")
+    sections = [
+        ("Ticker", payload.get("ticker")),
+        ("Horizon", payload.get("horizon")),
+        ("Risk Appetite", payload.get("risk_appetite")),
+        ("Market Data Summary", market),
+        ("News Summary", payload.get("news_analysis")),
+    ]
+    brief = "\n\n".join(f"{label}: {_as_text(value)}" for label, value in sections)
+    # a caller-supplied prompt (instead of a payload) is passed through so the
+    # specialists still see it
+    if not payload and prompt:
+        brief += f"\n\nAdditional Context: {prompt.strip()}"
+    return brief
+
+
+class PayloadIntakeAgent(BaseAgent):
+    """Writes `research_brief` to session state from `input_payload`."""
+
+    output_key: str = "research_brief"
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        logger.info("In memo_service::PayloadIntakeAgent._run_async_impl() ->")
+        payload = ctx.session.state.get("input_payload") or {}
+        prompt = ""
+        if ctx.user_content and ctx.user_content.parts:
+            prompt = "\n".join(p.text for p in ctx.user_content.parts if p.text)
+
+        brief = render_research_brief(payload, prompt)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=brief)]),
+            actions=EventActions(state_delta={self.output_key: brief}),
+        )
@@ -1 +1,7 @@
-from agents.common.models import AgentRequest, AgentResponse  # noqa: F401
+from agents.common.models import (  # noqa: F401
+    AgentBatchItem,
+    AgentBatchRequest,
+    AgentBatchResponse,
+    AgentRequest,
+    AgentResponse,
+)
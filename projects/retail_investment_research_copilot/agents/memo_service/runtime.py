@@ -1,13 +1,15 @@
 import asyncio
 import os
 import uuid
-from typing import Any, Dict, Optional
+from typing import Any, AsyncGenerator, Dict, Optional
 
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 from logger import get_logger
 
+from agents.common.metrics import LlmMetricsPlugin
+
 logger = get_logger("retail_investment_copilot:memo_service:runtime")
 
 
@@ -28,18 +30,23 @@ def flatten_text_from_event(event: Any) -> str:
     return ret_val
 
 
-async def run_agent_async(
+async def iter_agent_events(
     agent: Any,
     prompt: str,
     initial_state: Optional[Dict[str, Any]] = None,
-) -> str:
-    """Run an ADK agent in-process and return the final text response."""
-    logger.info("In memo_service::run_agent_async() ->")
+) -> AsyncGenerator[Any, None]:
+    """Run an ADK agent in-process and yield every event as it is produced."""
+    logger.info("In memo_service::iter_agent_events() ->")
 
     app_name = os.getenv("APP_NAME", "local_adk_app")
     user_id = os.getenv("ADK_USER_ID", "demo_user")
     session_service = InMemorySessionService()
-    runner = Runner(agent=agent, app_name=app_name, session_service=session_service)
+    runner = Runner(
+        agent=agent,
+        app_name=app_name,
+        session_service=session_service,
+        plugins=[LlmMetricsPlugin(service="memo_service")],
+    )
 
     session = await runner.session_service.create_session(
         app_name=app_name,
@@ -53,19 +60,31 @@ async def run_agent_async(
         parts=[types.Part(text=prompt)],
     )
 
-    final_text = ""
     try:
         async for event in runner.run_async(
             user_id=user_id,
             session_id=session.id,
             new_message=user_message,
         ):
-            text = flatten_text_from_event(event)
-            if text:
-                final_text = text
+            yield event
     finally:
         await runner.close()
 
+
+async def run_agent_async(
+    agent: Any,
+    prompt: str,
+    initial_state: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Run an ADK agent in-process and return the final text response."""
+    logger.info("In memo_service::run_agent_async() ->")
+
+    final_text = ""
+    async for event in iter_agent_events(agent, prompt, initial_state):
+        text = flatten_text_from_event(event)
+        if text:
+            final_text = text
+
     logger.info(f"Exiting memo_service::run_agent_async() -> {final_text}")
     return final_text
 
@@ -1,20 +1,105 @@
+from typing import Any, Dict, Optional, Tuple
+
 from fastapi import FastAPI
-from .agent import build_root_agent
-from .models import AgentRequest, AgentResponse
+from fastapi.responses import StreamingResponse
+from agents.common.batch import new_batch_limiter, run_batch
+from agents.common.metrics import instrument_app
+
+from .agent import MODEL, build_root_agent
+from .cache import memo_cache, memo_cache_key
+from .models import AgentBatchRequest, AgentBatchResponse, AgentRequest, AgentResponse
 from .runtime import run_agent
+from .streaming import format_sse, stream_memo_events
 
 app = FastAPI(title="Memo Service")
+batch_limiter = new_batch_limiter()
+instrument_app(app, service="memo_service")
+
+
+def _build_prompt(req: AgentRequest) -> str:
+    if req.prompt:
+        return req.prompt
+    return "Analyze this JSON payload and produce the required result:\n\n" + str(req.payload)
+
+
+def _lookup(req: AgentRequest) -> Tuple[Optional[str], Optional[Dict[str, Any]], Dict[str, Any]]:
+    """Check the memo cache; returns (key, cached entry or None, cache meta)."""
+    if memo_cache is None:
+        return None, None, {"enabled": False}
+    key = memo_cache_key(req.payload, req.prompt, getattr(MODEL, "model", str(MODEL)))
+    if req.force_refresh:
+        memo_cache.record_bypass()
+        return key, None, {"enabled": True, "hit": False, "forced_refresh": True, "key": key[:16]}
+    entry = memo_cache.get(key)
+    if entry is None:
+        return key, None, {"enabled": True, "hit": False, "key": key[:16]}
+    return key, entry, {
+        "enabled": True,
+        "hit": True,
+        "key": key[:16],
+        "age_seconds": entry["age_seconds"],
+        "expires_in_seconds": entry["expires_in_seconds"],
+    }
+
+
+def _store(key: Optional[str], req: AgentRequest, result: str) -> bool:
+    if memo_cache is None or key is None or not result:
+        return False
+    memo_cache.put(key, result, ticker=str(req.payload.get("ticker") or "") or None)
+    return True
+
 
 @app.get("/health")
 def health() -> dict:
-    return {"status": "ok", "service": "memo_service"}
+    return {
+        "status": "ok",
+        "service": "memo_service",
+        "memo_cache": memo_cache.stats() if memo_cache is not None else {"enabled": False},
+    }
 
 @app.post("/invoke", response_model=AgentResponse)
 def invoke(req: AgentRequest) -> AgentResponse:
+    key, entry, cache_meta = _lookup(req)
+    if entry is not None:
+        return AgentResponse(
+            result=entry["result"], meta={"service": "memo_service", "cache": cache_meta}
+        )
+
     agent = build_root_agent()
-    if req.prompt:
-        prompt = req.prompt
-    else:
-        prompt = "Analyze this JSON payload and produce the required result:\n\n" + str(req.payload)
+    prompt = _build_prompt(req)
     result = run_agent(agent=agent, prompt=prompt, initial_state={"input_payload": req.payload})
-    return AgentResponse(result=result, meta={"service": "memo_service"})
+    cache_meta["stored"] = _store(key, req, result)
+    return AgentResponse(result=result, meta={"service": "memo_service", "cache": cache_meta})
+
+@app.post("/invoke/stream")
+async def invoke_stream(req: AgentRequest) -> StreamingResponse:
+    """Same pipeline as /invoke, streamed as server-sent events per stage.
+
+    A cached memo is sent as a single `done` frame straight away.
+    """
+    key, entry, cache_meta = _lookup(req)
+    meta = {"service": "memo_service", "cache": cache_meta}
+    if entry is not None:
+        events = iter([format_sse("done", {"result": entry["result"], "total_ms": 0, "meta": meta})])
+    else:
+
+        def on_complete(result: str) -> None:
+            cache_meta["stored"] = _store(key, req, result)
+
+        events = stream_memo_events(
+            agent=build_root_agent(),
+            prompt=_build_prompt(req),
+            initial_state={"input_payload": req.payload},
+            meta=meta,
+            on_complete=on_complete,
+        )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/invoke_batch", response_model=AgentBatchResponse)
+async def invoke_batch(req: AgentBatchRequest) -> AgentBatchResponse:
+    """Run many /invoke payloads concurrently under the service-level limiter."""
+    return await run_batch(req, invoke, batch_limiter, service="memo_service")
@@ -0,0 +1,104 @@
+"""
+Server-sent event stream for the memo pipeline.
+
+Maps the ADK events emitted by the memo pipeline to the user-visible stages
+and formats them as SSE frames:
+
+    event: stage   -> research_brief, valuation_view, momentum_view,
+                      risk_view, draft_memo, final_memo (one frame each)
+    event: done    -> final memo + total timing
+    event: error   -> pipeline failed; carries the error message
+
+Every frame carries `elapsed_ms` (since the request started) and
+`stage_ms` (since the previous pipeline phase finished, so the three
+parallel specialists are each timed from the moment the brief was ready).
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, Optional
+
+from logger import get_logger
+
+from .runtime import flatten_text_from_event, iter_agent_events
+
+logger = get_logger("retail_investment_copilot:memo_service:streaming")
+
+# agent name -> (stage name, pipeline phase)
+STAGES = {
+    "memo_intake": ("research_brief", 0),
+    "valuation_specialist": ("valuation_view", 1),
+    "momentum_specialist": ("momentum_view", 1),
+    "risk_specialist": ("risk_view", 1),
+    "memo_writer": ("draft_memo", 2),
+    "memo_rewriter": ("final_memo", 3),
+}
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_memo_events(
+    agent: Any,
+    prompt: str,
+    initial_state: Optional[Dict[str, Any]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+    on_complete: Optional[Callable[[str], None]] = None,
+) -> AsyncGenerator[str, None]:
+    """Run the memo pipeline and yield SSE frames as each stage finishes.
+
+    `on_complete` is called with the final memo before the `done` frame is
+    sent (the service uses it to fill the memo cache).
+    """
+    logger.info("In memo_service::stream_memo_events() ->")
+    started = time.perf_counter()
+    phase = 0
+    phase_started = started
+    last_stage_at = started
+    final_text = ""
+
+    try:
+        async for event in iter_agent_events(agent, prompt, initial_state):
+            text = flatten_text_from_event(event)
+            if text:
+                final_text = text
+            stage = STAGES.get(getattr(event, "author", ""))
+            if not text or stage is None or not event.is_final_response():
+                continue
+
+            name, stage_phase = stage
+            now = time.perf_counter()
+            if stage_phase > phase:
+                # the previous phase ended with the last stage we emitted
+                phase, phase_started = stage_phase, last_stage_at
+            last_stage_at = now
+
+            yield format_sse(
+                "stage",
+                {
+                    "stage": name,
+                    "agent": event.author,
+                    "text": text,
+                    "elapsed_ms": round((now - started) * 1000),
+                    "stage_ms": round((now - phase_started) * 1000),
+                },
+            )
+    except Exception as ex:
+        logger.exception("memo_service::stream_memo_events() failed")
+        yield format_sse(
+            "error",
+            {"error": str(ex), "elapsed_ms": round((time.perf_counter() - started) * 1000)},
+        )
+        return
+
+    total_ms = round((time.perf_counter() - started) * 1000)
+    logger.info(f"Exiting memo_service::stream_memo_events() -> total_ms={total_ms}")
+    if on_complete is not None:
+        on_complete(final_text)
+    yield format_sse(
+        "done",
+        {"result": final_text, "total_ms": total_ms, "meta": meta or {}},
+    )
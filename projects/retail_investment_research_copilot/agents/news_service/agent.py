@@ -1,15 +1,16 @@
 from dotenv import load_dotenv
 from google.adk.agents import LlmAgent, ParallelAgent, SequentialAgent
-from google.adk.models.lite_llm import LiteLlm
 from logger import get_logger
 
+from agents.common.llm import build_model
+
 from .tools import fetch_rss_news
 
 logger = get_logger("retail_investment_copilot:news_service:agent")
 
-load_dotenv(override=True)
+load_dotenv(override=False)
 
-MODEL = LiteLlm(model="anthropic/claude-sonnet-4-6")
+MODEL = build_model("anthropic/claude-sonnet-4-6")
 
 
 def build_root_agent():
@@ -8,6 +8,8 @@ from google.adk.sessions import InMemorySessionService
 from google.genai import types
 from logger import get_logger
 
+from agents.common.metrics import LlmMetricsPlugin
+
 logger = get_logger("retail_investment_copilot:news_service:runtime")
 
 
@@ -39,7 +41,12 @@ async def run_agent_async(
     app_name = os.getenv("APP_NAME", "local_adk_app")
     user_id = os.getenv("ADK_USER_ID", "demo_user")
     session_service = InMemorySessionService()
-    runner = Runner(agent=agent, app_name=app_name, session_service=session_service)
+    runner = Runner(
+        agent=agent,
+        app_name=app_name,
+        session_service=session_service,
+        plugins=[LlmMetricsPlugin(service="news_service")],
+    )
 
     session = await runner.session_service.create_session(
         app_name=app_name,
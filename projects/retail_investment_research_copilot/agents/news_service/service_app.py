@@ -1,13 +1,23 @@
 from fastapi import FastAPI
+from agents.common.batch import new_batch_limiter, run_batch
+from agents.common.metrics import instrument_app
+
 from .agent import build_root_agent
-from .models import AgentRequest, AgentResponse
+from .models import AgentBatchRequest, AgentBatchResponse, AgentRequest, AgentResponse
 from .runtime import run_agent
+from .tools import news_cache
 
 app = FastAPI(title="News Service")
+batch_limiter = new_batch_limiter()
+instrument_app(app, service="news_service")
 
 @app.get("/health")
 def health() -> dict:
-    return {"status": "ok", "service": "news_service"}
+    return {
+        "status": "ok",
+        "service": "news_service",
+        "news_cache": news_cache.stats(),
+    }
 
 @app.post("/invoke", response_model=AgentResponse)
 def invoke(req: AgentRequest) -> AgentResponse:
@@ -18,3 +28,8 @@ def invoke(req: AgentRequest) -> AgentResponse:
         prompt = "Analyze this JSON payload and produce the required result:\n\n" + str(req.payload)
     result = run_agent(agent=agent, prompt=prompt, initial_state={"input_payload": req.payload})
     return AgentResponse(result=result, meta={"service": "news_service"})
+
+@app.post("/invoke_batch", response_model=AgentBatchResponse)
+async def invoke_batch(req: AgentBatchRequest) -> AgentBatchResponse:
+    """Run many /invoke payloads concurrently under the service-level limiter."""
+    return await run_batch(req, invoke, batch_limiter, service="news_service")
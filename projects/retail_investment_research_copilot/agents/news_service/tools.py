@@ -2,21 +2,37 @@ from __future__ import annotations
 
 import json
 import os
+from typing import Any, Dict, List
 from urllib.parse import quote
 
 import feedparser
 from dotenv import load_dotenv
 from logger import get_logger
 
-load_dotenv(override=True)
+from agents.common.cache import SWRCache
+from agents.common.fixtures import load_fixture
+from agents.common.metrics import track_fetch
+
+load_dotenv(override=False)
 
 GOOGLE_NEWS_RSS_URL = os.getenv("GOOGLE_NEWS_RSS_URL", "https://news.google.com/rss/search?q={query}")
 
+# News moves slower than prices, so headlines are cached a little longer than
+# market snapshots. Stale entries are served while a background refresh runs.
+NEWS_CACHE_TTL_SECONDS = float(os.getenv("NEWS_CACHE_TTL_SECONDS", "300"))
+NEWS_CACHE_MAX_STALE_SECONDS = float(os.getenv("NEWS_CACHE_MAX_STALE_SECONDS", "1800"))
+
 logger = get_logger("retail_investment_copilot:news_service:tools")
 
 
-def fetch_rss_news(ticker: str) -> str:
-    logger.info(f"In news_service::fetch_rss_news() -> {ticker}")
+@track_fetch("rss")
+def _fetch_rss_items(ticker: str) -> List[Dict[str, Any]]:
+    """Download and parse the Google News RSS feed for `ticker`."""
+    logger.info(f"In news_service::_fetch_rss_items() -> {ticker}")
+    fixture = load_fixture("rss_news", ticker)
+    if fixture is not None:
+        return fixture
+
     query = quote(f"{ticker} stock")
     url = GOOGLE_NEWS_RSS_URL.format(query=query)
     parsed = feedparser.parse(url)
@@ -30,6 +46,22 @@ def fetch_rss_news(ticker: str) -> str:
                 "summary": getattr(entry, "summary", ""),
             }
         )
+    return items
+
+
+news_cache = SWRCache(
+    name="rss_news",
+    fetch=_fetch_rss_items,
+    ttl_seconds=NEWS_CACHE_TTL_SECONDS,
+    max_stale_seconds=NEWS_CACHE_MAX_STALE_SECONDS,
+    # an empty feed is usually a transient Google News hiccup - don't pin it
+    should_cache=bool,
+)
+
+
+def fetch_rss_news(ticker: str) -> str:
+    logger.info(f"In news_service::fetch_rss_news() -> {ticker}")
+    items = news_cache.get(ticker.strip().upper())
     ret_val = json.dumps(items, indent=2)
     logger.info(f"Exiting news_service::fetch_rss_news() -> {ret_val}")
     return ret_val
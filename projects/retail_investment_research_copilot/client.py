@@ -0,0 +1,297 @@
+"""
+Client helpers shared by the front-ends.
+
+The front-ends talk to the three services through a *transport*, selected
+with COPILOT_TRANSPORT:
+
+* ``http`` (default) - POST to the service URLs, for split deployments
+  (three uvicorn processes, or the composite app on one port).
+* ``inprocess`` - import the service apps and call their handlers
+  directly, skipping HTTP and JSON re-serialization when the front-end and
+  the services live in the same Python process.
+
+`run_portfolio` drives the market -> news -> memo flow for a list of
+tickers. Tickers are processed in chunks through each service's
+/invoke_batch endpoint, and the stages are pipelined: while the memo
+service writes memos for one chunk, the market data and news services are
+already working on the next.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv(override=False)
+
+MARKET_DATA_URL = os.getenv("MARKET_DATA_SERVICE_URL", "http://127.0.0.1:8101/invoke")
+NEWS_URL = os.getenv("NEWS_SERVICE_URL", "http://127.0.0.1:8102/invoke")
+MEMO_URL = os.getenv("MEMO_SERVICE_URL", "http://127.0.0.1:8103/invoke")
+MEMO_STREAM_URL = os.getenv("MEMO_SERVICE_STREAM_URL", MEMO_URL.rstrip("/") + "/stream")
+
+COPILOT_TRANSPORT = os.getenv("COPILOT_TRANSPORT", "http").lower()
+
+# tickers per /invoke_batch call; smaller chunks start memos sooner
+PORTFOLIO_CHUNK_SIZE = int(os.getenv("PORTFOLIO_CHUNK_SIZE", "5"))
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "900"))
+
+SERVICE_URLS = {
+    "market_data": MARKET_DATA_URL,
+    "news": NEWS_URL,
+    "memo": MEMO_URL,
+}
+
+SERVICE_MODULES = {
+    "market_data": "agents.market_data_service.service_app",
+    "news": "agents.news_service.service_app",
+    "memo": "agents.memo_service.service_app",
+}
+
+
+def batch_url(invoke_url: str) -> str:
+    """Map a service's /invoke URL to its /invoke_batch URL."""
+    return invoke_url.rstrip("/") + "_batch"
+
+
+def iter_sse(lines: Iterable[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (event, data) pairs from the lines of a server-sent event stream."""
+    event, data = "message", []
+    for line in lines:
+        if line is None:
+            continue
+        if line == "":
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data.append(line[len("data:"):].strip())
+
+
+class HttpTransport:
+    """Calls the services over HTTP (split or composite deployments)."""
+
+    name = "http"
+
+    def __init__(
+        self,
+        urls: Optional[Dict[str, str]] = None,
+        memo_stream_url: str = MEMO_STREAM_URL,
+    ) -> None:
+        self.urls = urls or dict(SERVICE_URLS)
+        self.memo_stream_url = memo_stream_url
+        self.session = requests.Session()
+
+    def invoke(self, service: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        resp = self.session.post(
+            self.urls[service], json={"payload": payload}, timeout=REQUEST_TIMEOUT_SECONDS
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def invoke_batch(
+        self, service: str, payloads: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        resp = self.session.post(
+            batch_url(self.urls[service]),
+            json={"items": [{"payload": p} for p in payloads]},
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        )
+        resp.raise_for_status()
+        return sorted(resp.json()["results"], key=lambda item: item["index"])
+
+    def stream_memo(
+        self, payload: Dict[str, Any], force_refresh: bool = False
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        with self.session.post(
+            self.memo_stream_url,
+            json={"payload": payload, "force_refresh": force_refresh},
+            stream=True,
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        ) as resp:
+            resp.raise_for_status()
+            yield from iter_sse(resp.iter_lines(decode_unicode=True))
+
+
+class InProcessTransport:
+    """Calls the service handlers directly when co-located with the client.
+
+    The sync /invoke handlers are called on the caller's thread, exactly as
+    uvicorn would run them on its worker threads. The async handlers
+    (/invoke_batch, /invoke/stream) run on one long-lived background event
+    loop, so the services' asyncio primitives (e.g. the batch limiter) are
+    always used from the same loop.
+    """
+
+    name = "inprocess"
+
+    def __init__(self) -> None:
+        self._apps: Dict[str, Any] = {}
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(
+            target=self._loop.run_forever, name="copilot-inprocess", daemon=True
+        ).start()
+
+    def _app(self, service: str) -> Any:
+        if service not in self._apps:
+            self._apps[service] = importlib.import_module(SERVICE_MODULES[service])
+        return self._apps[service]
+
+    def _run(self, coro: Any) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def invoke(self, service: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        module = self._app(service)
+        return module.invoke(module.AgentRequest(payload=payload)).model_dump()
+
+    def invoke_batch(
+        self, service: str, payloads: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        module = self._app(service)
+        req = module.AgentBatchRequest(
+            items=[module.AgentRequest(payload=p) for p in payloads]
+        )
+        resp = self._run(module.invoke_batch(req))
+        return [item.model_dump() for item in sorted(resp.results, key=lambda i: i.index)]
+
+    def stream_memo(
+        self, payload: Dict[str, Any], force_refresh: bool = False
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        module = self._app("memo")
+        frames: "queue.Queue[Optional[str]]" = queue.Queue()
+
+        async def pump() -> None:
+            try:
+                response = await module.invoke_stream(
+                    module.AgentRequest(payload=payload, force_refresh=force_refresh)
+                )
+                async for frame in response.body_iterator:
+                    frames.put(frame)
+            finally:
+                frames.put(None)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self._loop)
+
+        def lines() -> Iterator[str]:
+            while (frame := frames.get()) is not None:
+                yield from frame.split("\n")
+            future.result()  # surface any exception raised by the pump
+
+        yield from iter_sse(lines())
+
+
+_transport = None
+
+
+def get_transport() -> Any:
+    """Return the process-wide transport selected by COPILOT_TRANSPORT."""
+    global _transport
+    if _transport is None:
+        if COPILOT_TRANSPORT == "inprocess":
+            _transport = InProcessTransport()
+        elif COPILOT_TRANSPORT == "http":
+            _transport = HttpTransport()
+        else:
+            raise ValueError(
+                f"Unknown COPILOT_TRANSPORT={COPILOT_TRANSPORT!r} (expected 'http' or 'inprocess')"
+            )
+    return _transport
+
+
+def build_memo_payload(
+    ticker: str, horizon: str, risk: str, market_note: str, news_note: str
+) -> Dict[str, Any]:
+    return {
+        "ticker": ticker,
+        "horizon": horizon,
+        "risk_appetite": risk,
+        "market_data_analysis": market_note,
+        "news_analysis": news_note,
+    }
+
+
+def run_portfolio(
+    tickers: List[str],
+    horizon: str,
+    risk: str,
+    chunk_size: int = PORTFOLIO_CHUNK_SIZE,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    transport: Any = None,
+) -> List[Dict[str, Any]]:
+    """Produce a memo per ticker; returns one result dict per ticker, in order.
+
+    Each result has `ticker`, `status` ("ok" / "error"), `memo` and `error`.
+    `on_result` is called as soon as each ticker's memo (or failure) is known.
+    """
+    transport = transport or get_transport()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(tickers)
+    chunks = [
+        list(range(i, min(i + chunk_size, len(tickers))))
+        for i in range(0, len(tickers), chunk_size)
+    ]
+
+    def finish(index: int, status: str, memo: str = "", error: str = "") -> None:
+        result = {"ticker": tickers[index], "status": status, "memo": memo, "error": error}
+        results[index] = result
+        if on_result:
+            on_result(result)
+
+    def research(chunk: List[int]) -> List[int]:
+        """Stage 1+2: market data and news for a chunk, then queue its memos."""
+        payloads = [{"ticker": tickers[i]} for i in chunk]
+        market_future = pool.submit(transport.invoke_batch, "market_data", payloads)
+        news_future = pool.submit(transport.invoke_batch, "news", payloads)
+        market, news = market_future.result(), news_future.result()
+
+        ready: List[int] = []
+        memo_payloads: List[Dict[str, Any]] = []
+        for i, m, n in zip(chunk, market, news):
+            if m["status"] != "ok" or n["status"] != "ok":
+                finish(i, "error", error=m.get("error") or n.get("error") or "upstream failure")
+                continue
+            ready.append(i)
+            memo_payloads.append(
+                build_memo_payload(tickers[i], horizon, risk, m["result"], n["result"])
+            )
+        if memo_payloads:
+            memo_futures.append(pool.submit(write_memos, ready, memo_payloads))
+        return ready
+
+    def write_memos(ready: List[int], memo_payloads: List[Dict[str, Any]]) -> None:
+        """Stage 3: memos for a chunk, overlapping with the next chunk's research."""
+        try:
+            items = transport.invoke_batch("memo", memo_payloads)
+        except Exception as ex:
+            for i in ready:
+                finish(i, "error", error=str(ex))
+            return
+        for i, item in zip(ready, items):
+            if item["status"] == "ok":
+                finish(i, "ok", memo=item["result"])
+            else:
+                finish(i, "error", error=item.get("error") or "memo failure")
+
+    memo_futures: List[Future] = []
+    # research runs one chunk at a time (its two calls in parallel) while
+    # earlier chunks' memo batches run in the background
+    with ThreadPoolExecutor(max_workers=2 + len(chunks)) as pool:
+        for chunk in chunks:
+            try:
+                research(chunk)
+            except Exception as ex:
+                for i in chunk:
+                    finish(i, "error", error=str(ex))
+        for future in memo_futures:
+            future.result()
+
+    return [r for r in results if r is not None]
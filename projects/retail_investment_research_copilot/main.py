@@ -1,40 +1,57 @@
-import os
-import requests
-from dotenv import load_dotenv
 from rich.console import Console
+from rich.markdown import Markdown
+from rich.table import Table
 
-load_dotenv(override=True)
+from client import build_memo_payload, get_transport, run_portfolio
+
+
+def run_single(console: Console, ticker: str, horizon: str, risk: str) -> None:
+    transport = get_transport()
+    market_resp = transport.invoke("market_data", {"ticker": ticker})
+    news_resp = transport.invoke("news", {"ticker": ticker})
+
+    combined_payload = build_memo_payload(
+        ticker, horizon, risk, market_resp["result"], news_resp["result"]
+    )
+    console.print(f"Combined Payload to Memo Service -> {combined_payload}")
+
+    memo_resp = transport.invoke("memo", combined_payload)
+    console.print("\n" + memo_resp["result"])
+
+
+def run_many(console: Console, tickers: list[str], horizon: str, risk: str) -> None:
+    console.print(f"Generating memos for {len(tickers)} tickers: {', '.join(tickers)}")
+
+    def on_result(result: dict) -> None:
+        if result["status"] == "ok":
+            console.rule(f"[bold green]{result['ticker']}")
+            console.print(Markdown(result["memo"]))
+        else:
+            console.print(f"[red]{result['ticker']}: failed -> {result['error']}[/red]")
+
+    results = run_portfolio(tickers, horizon, risk, on_result=on_result)
+
+    table = Table(title="Portfolio memo run")
+    table.add_column("Ticker")
+    table.add_column("Status")
+    table.add_column("Error")
+    for result in results:
+        table.add_row(result["ticker"], result["status"], result["error"] or "")
+    console.print(table)
 
-MARKET_DATA_URL = os.getenv("MARKET_DATA_SERVICE_URL", "http://127.0.0.1:8101/invoke")
-NEWS_URL = os.getenv("NEWS_SERVICE_URL", "http://127.0.0.1:8102/invoke")
-MEMO_URL = os.getenv("MEMO_SERVICE_URL", "http://127.0.0.1:8103/invoke")
 
 def main() -> None:
     print("Retail Investment Research Copilot")
-    ticker = input("Enter ticker (example: MSFT or TCS.NS): ").strip()
+    raw = input("Enter ticker(s), comma separated (example: MSFT or MSFT, TCS.NS): ").strip()
     horizon = input("Investment horizon in (example: 3 years): ").strip() or "3 years"
     risk = input("Risk appetite (low/medium/high): ").strip() or "medium"
 
-    market_resp = requests.post(MARKET_DATA_URL, json={"payload": {"ticker": ticker}})
-    market_resp.raise_for_status()
-
-    news_resp = requests.post(NEWS_URL, json={"payload": {"ticker": ticker}})
-    news_resp.raise_for_status()
-
-    combined_payload = {
-        "ticker": ticker,
-        "horizon": horizon,
-        "risk_appetite": risk,
-        "market_data_analysis": market_resp.json()["result"],
-        "news_analysis": news_resp.json()["result"],
-    }
-
+    tickers = [t.strip().upper() for t in raw.split(",") if t.strip()]
     console = Console()
-    console.print(f"Combined Payload to Memo Service -> {combined_payload}")
-
-    memo_resp = requests.post(MEMO_URL, json={"payload": combined_payload})
-    memo_resp.raise_for_status()
-    console.print("\n" + memo_resp.json()["result"])
+    if len(tickers) == 1:
+        run_single(console, tickers[0], horizon, risk)
+    else:
+        run_many(console, tickers, horizon, risk)
 
 
 if __name__ == "__main__":
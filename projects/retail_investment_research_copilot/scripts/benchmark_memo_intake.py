@@ -0,0 +1,74 @@
+"""
+Latency benchmark: LLM intake vs deterministic intake in the memo pipeline.
+
+Both pipelines run against StubLlm, so every model call costs exactly
+--latency seconds and no API credit is used. The difference between the two
+timings is the serial LLM round-trip removed by PayloadIntakeAgent.
+
+    python scripts/benchmark_memo_intake.py --latency 2.0 --runs 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from agents.common.runtime import run_agent_async  # noqa: E402
+from agents.common.stub_llm import StubLlm  # noqa: E402
+from agents.memo_service.agent import build_root_agent  # noqa: E402
+
+PAYLOAD = {
+    "ticker": "MSFT",
+    "horizon": "3 years",
+    "risk_appetite": "medium",
+    "market_data_analysis": "PE 34.1, PB 11.2, price 4.2% above SMA200.",
+    "news_analysis": "Positive: cloud growth. Negative: regulatory scrutiny.",
+}
+
+
+async def time_pipeline(llm_intake: bool, latency: float, runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        agent = build_root_agent(
+            model=StubLlm(latency_seconds=latency), llm_intake=llm_intake
+        )
+        started = time.perf_counter()
+        await run_agent_async(
+            agent=agent,
+            prompt="Analyze this JSON payload and produce the required result:\n\n"
+            + str(PAYLOAD),
+            initial_state={"input_payload": PAYLOAD},
+            service="memo_service",
+        )
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds per LLM call")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {
+        "llm intake": await time_pipeline(True, args.latency, args.runs),
+        "deterministic intake": await time_pipeline(False, args.latency, args.runs),
+    }
+
+    print(f"\nStub LLM latency: {args.latency:.2f}s per call, {args.runs} run(s) each")
+    print(f"{'pipeline':<22} {'mean (s)':>10} {'min (s)':>10}")
+    for name, timings in results.items():
+        print(f"{name:<22} {statistics.mean(timings):>10.2f} {min(timings):>10.2f}")
+    saved = statistics.mean(results["llm intake"]) - statistics.mean(
+        results["deterministic intake"]
+    )
+    print(f"\nSaved per memo: {saved:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
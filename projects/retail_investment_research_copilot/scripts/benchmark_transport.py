@@ -0,0 +1,158 @@
+"""
+Latency / memory benchmark: split services vs composite app vs in-process.
+
+Runs the full single-ticker flow (market data -> news -> streamed memo)
+against StubLlm (COPILOT_LLM_BACKEND=stub), so the numbers isolate the
+transport and process overhead from model latency:
+
+    split      three uvicorn processes, HTTP between client and services
+    composite  one uvicorn process (agents/composite_app.py), HTTP
+    inprocess  no server; the client calls the service handlers directly
+
+    python scripts/benchmark_transport.py --runs 10 --latency 0.05
+
+Memory is the resident set size (VmRSS, Linux only) of the service
+processes, or of this process for the in-process mode.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+SPLIT = [
+    ("agents.market_data_service.service_app", 8201),
+    ("agents.news_service.service_app", 8202),
+    ("agents.memo_service.service_app", 8203),
+]
+COMPOSITE = [("agents.composite_app", 8200)]
+
+
+def rss_mb(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def start_servers(
+    specs: List[tuple], env: Dict[str, str], quiet: bool = False
+) -> List[subprocess.Popen]:
+    """Start one uvicorn process per (module, port) and wait until /health answers."""
+    output = subprocess.DEVNULL if quiet else None
+    procs = []
+    for module, port in specs:
+        cmd = [sys.executable, "-m", "uvicorn", f"{module}:app", "--port", str(port), "--log-level", "warning"]
+        procs.append(subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=output, stderr=output))
+    for _, port in specs:
+        deadline = time.time() + 60
+        while time.time() < deadline:
+            try:
+                if requests.get(f"http://127.0.0.1:{port}/health", timeout=1).ok:
+                    break
+            except requests.RequestException:
+                time.sleep(0.25)
+        else:
+            raise RuntimeError(f"server on port {port} did not start")
+    return procs
+
+
+def configure_env(latency: float) -> None:
+    """Benchmark settings, set before any project module loads .env (which
+    never overrides the environment) or builds its model."""
+    os.environ["COPILOT_LLM_BACKEND"] = "stub"
+    os.environ["COPILOT_STUB_LATENCY_SECONDS"] = str(latency)
+    # every timed flow should generate its memo, not hit the memo cache
+    os.environ["MEMO_CACHE_ENABLED"] = "false"
+
+
+def run_flow(transport, ticker: str = "MSFT") -> float:
+    from client import build_memo_payload
+
+    started = time.perf_counter()
+    market = transport.invoke("market_data", {"ticker": ticker})
+    news = transport.invoke("news", {"ticker": ticker})
+    payload = build_memo_payload(ticker, "3 years", "medium", market["result"], news["result"])
+    for event, data in transport.stream_memo(payload):
+        if event == "error":
+            raise RuntimeError(data["error"])
+        if event == "done":
+            break
+    return time.perf_counter() - started
+
+
+def bench(name: str, transport, runs: int) -> Dict[str, float]:
+    run_flow(transport)  # warm-up: imports, first session, connection setup
+    timings = sorted(run_flow(transport) for _ in range(runs))
+    return {
+        "mode": name,
+        "mean": statistics.mean(timings),
+        "p50": timings[len(timings) // 2],
+        "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per stub LLM call")
+    args = parser.parse_args()
+
+    configure_env(args.latency)
+    # project imports only now, so they see the settings above
+    from client import HttpTransport, InProcessTransport
+
+    env = dict(os.environ)
+    rows = []
+
+    for name, specs in (("split", SPLIT), ("composite", COMPOSITE)):
+        procs = start_servers(specs, env)
+        try:
+            if name == "split":
+                urls = {
+                    svc: f"http://127.0.0.1:{port}/invoke"
+                    for svc, (_, port) in zip(("market_data", "news", "memo"), specs)
+                }
+            else:
+                port = specs[0][1]
+                urls = {svc: f"http://127.0.0.1:{port}/{svc}/invoke" for svc in ("market_data", "news", "memo")}
+            row = bench(name, HttpTransport(urls=urls, memo_stream_url=urls["memo"] + "/stream"), args.runs)
+            row["rss_mb"] = sum(rss_mb(p.pid) for p in procs)
+            row["processes"] = len(procs)
+            rows.append(row)
+        finally:
+            for proc in procs:
+                proc.terminate()
+                proc.wait()
+
+    baseline = rss_mb(os.getpid())
+    row = bench("inprocess", InProcessTransport(), args.runs)
+    row["rss_mb"] = rss_mb(os.getpid()) - baseline
+    row["processes"] = 0
+    rows.append(row)
+
+    print(f"\nStub LLM latency: {args.latency:.2f}s per call, {args.runs} flow(s) per mode")
+    print(f"{'mode':<10} {'procs':>5} {'mean (s)':>9} {'p50 (s)':>8} {'p95 (s)':>8} {'RSS (MB)':>9}")
+    for r in rows:
+        print(
+            f"{r['mode']:<10} {r['processes']:>5} {r['mean']:>9.3f} {r['p50']:>8.3f} "
+            f"{r['p95']:>8.3f} {r['rss_mb']:>9.1f}"
+        )
+    print("(in-process RSS is the growth of this process after loading the services)")
+
+
+if __name__ == "__main__":
+    main()
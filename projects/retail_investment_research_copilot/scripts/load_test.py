@@ -0,0 +1,199 @@
+"""
+Offline load test for the copilot services.
+
+Starts the three services (or the composite app) with the LLM swapped for
+StubLlm and yfinance / Google News swapped for recorded fixtures, then drives
+--users concurrent users through the full market -> news -> memo flow. No
+API key or network access is needed, so it can run as often as you like:
+
+    python scripts/load_test.py --users 8 --flows 5 --latency 1.0 --output-tokens 400
+
+Reports throughput, p50/p95/p99 latency per stage and per flow, and the
+resident memory (VmRSS, Linux only) of each service process. Raise
+--latency to model a slow provider; the stub answers with roughly
+--output-tokens tokens so downstream prompts grow realistically.
+
+Refresh the fixtures from the live sources (needs network):
+
+    python scripts/load_test.py --record-fixtures MSFT,AAPL,TCS.NS
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark_transport import rss_mb, start_servers  # noqa: E402
+from client import HttpTransport, build_memo_payload  # noqa: E402
+
+SERVICES = ("market_data", "news", "memo")
+SPLIT = [
+    ("agents.market_data_service.service_app", 8301),
+    ("agents.news_service.service_app", 8302),
+    ("agents.memo_service.service_app", 8303),
+]
+COMPOSITE = [("agents.composite_app", 8300)]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class MemorySampler(threading.Thread):
+    """Samples VmRSS of each service process to track the peak."""
+
+    def __init__(self, procs: Dict[str, int], interval: float = 0.5) -> None:
+        super().__init__(daemon=True)
+        self.procs = procs
+        self.interval = interval
+        self.start_mb = {name: rss_mb(pid) for name, pid in procs.items()}
+        self.peak_mb = dict(self.start_mb)
+        self._stop = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop.wait(self.interval):
+            for name, pid in self.procs.items():
+                self.peak_mb[name] = max(self.peak_mb[name], rss_mb(pid))
+
+    def stop(self) -> Dict[str, float]:
+        self._stop.set()
+        self.join()
+        return {name: rss_mb(pid) for name, pid in self.procs.items()}
+
+
+def user_session(user: int, flows: int, tickers: List[str], urls: Dict[str, str]) -> List[Dict]:
+    """One simulated user: `flows` memo requests back to back."""
+    transport = HttpTransport(urls=urls)
+    records = []
+    for i in range(flows):
+        ticker = tickers[(user + i) % len(tickers)]
+        record = {"ticker": ticker, "ok": False}
+        started = time.perf_counter()
+        try:
+            t = time.perf_counter()
+            market = transport.invoke("market_data", {"ticker": ticker})
+            record["market_data"] = time.perf_counter() - t
+
+            t = time.perf_counter()
+            news = transport.invoke("news", {"ticker": ticker})
+            record["news"] = time.perf_counter() - t
+
+            t = time.perf_counter()
+            transport.invoke(
+                "memo",
+                build_memo_payload(ticker, "3 years", "medium", market["result"], news["result"]),
+            )
+            record["memo"] = time.perf_counter() - t
+            record["ok"] = True
+        except Exception as ex:
+            record["error"] = str(ex)
+        record["flow"] = time.perf_counter() - started
+        records.append(record)
+    return records
+
+
+def record_fixtures(tickers: List[str]) -> None:
+    from agents.common.fixtures import record_fixture
+    from agents.market_data_service.tools import _fetch_market_snapshot
+    from agents.news_service.tools import _fetch_rss_items
+
+    for name, fetch in (("market_snapshot", _fetch_market_snapshot), ("rss_news", _fetch_rss_items)):
+        print(f"Recorded {record_fixture(name, tickers, fetch, FIXTURES_DIR)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=4, help="concurrent users")
+    parser.add_argument("--flows", type=int, default=3, help="flows per user")
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds per stub LLM call")
+    parser.add_argument("--output-tokens", type=int, default=300, help="tokens per stub answer")
+    parser.add_argument("--tickers", default="MSFT,AAPL,NVDA,TCS.NS,INFY.NS")
+    parser.add_argument("--composite", action="store_true", help="one process instead of three")
+    parser.add_argument("--record-fixtures", metavar="TICKERS", help="record live fixtures and exit")
+    args = parser.parse_args()
+
+    if args.record_fixtures:
+        record_fixtures([t.strip().upper() for t in args.record_fixtures.split(",") if t.strip()])
+        return
+
+    env = dict(os.environ)
+    env.update(
+        {
+            "COPILOT_LLM_BACKEND": "stub",
+            "COPILOT_STUB_LATENCY_SECONDS": str(args.latency),
+            "COPILOT_STUB_OUTPUT_TOKENS": str(args.output_tokens),
+            "COPILOT_FIXTURES_DIR": str(FIXTURES_DIR),
+            # every flow should do the full work, not hit the memo cache
+            "MEMO_CACHE_ENABLED": "false",
+        }
+    )
+    specs = COMPOSITE if args.composite else SPLIT
+    if args.composite:
+        port = specs[0][1]
+        urls = {svc: f"http://127.0.0.1:{port}/{svc}/invoke" for svc in SERVICES}
+        names = ["composite"]
+    else:
+        urls = {svc: f"http://127.0.0.1:{port}/invoke" for svc, (_, port) in zip(SERVICES, specs)}
+        names = list(SERVICES)
+    tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+
+    print(f"Starting {len(specs)} service process(es) with the stub LLM and fixtures...")
+    procs = start_servers(specs, env, quiet=True)
+    try:
+        sampler = MemorySampler({name: p.pid for name, p in zip(names, procs)})
+        sampler.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            futures = [
+                pool.submit(user_session, u, args.flows, tickers, urls) for u in range(args.users)
+            ]
+            records = [r for f in futures for r in f.result()]
+        wall = time.perf_counter() - started
+        end_mb = sampler.stop()
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
+
+    ok = [r for r in records if r["ok"]]
+    print(
+        f"\n{args.users} users x {args.flows} flows, stub latency {args.latency:.2f}s, "
+        f"{args.output_tokens} tokens/answer"
+    )
+    print(f"completed {len(ok)}/{len(records)} flows in {wall:.1f}s -> {len(ok) / wall:.2f} flows/s")
+    for r in records:
+        if not r["ok"]:
+            print(f"  failed {r['ticker']}: {r.get('error')}")
+
+    print(f"\n{'stage':<12} {'mean (s)':>9} {'p50 (s)':>8} {'p95 (s)':>8} {'p99 (s)':>8}")
+    for stage in (*SERVICES, "flow"):
+        values = [r[stage] for r in ok if stage in r]
+        if values:
+            print(
+                f"{stage:<12} {statistics.mean(values):>9.2f} {percentile(values, 50):>8.2f} "
+                f"{percentile(values, 95):>8.2f} {percentile(values, 99):>8.2f}"
+            )
+
+    print(f"\n{'process':<12} {'start MB':>9} {'peak MB':>8} {'end MB':>8}")
+    for name in names:
+        print(
+            f"{name:<12} {sampler.start_mb[name]:>9.1f} {sampler.peak_mb[name]:>8.1f} "
+            f"{end_mb[name]:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import argparse
 import subprocess
 import sys
 from pathlib import Path
@@ -10,10 +11,23 @@ SERVICES = [
     ("memo-service", "agents.memo_service.service_app", 8103),
 ]
 
+# all three services mounted in one process (see agents/composite_app.py)
+COMPOSITE = ("composite-service", "agents.composite_app", 8100)
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Start the copilot services.")
+    parser.add_argument(
+        "--composite",
+        action="store_true",
+        help="run all services in one process on port 8100 instead of three processes",
+    )
+    parser.add_argument("--no-reload", action="store_true", help="disable uvicorn --reload")
+    args = parser.parse_args()
+
+    services = [COMPOSITE] if args.composite else SERVICES
     processes = []
     try:
-        for name, module, port in SERVICES:
+        for name, module, port in services:
             cmd = [
                 sys.executable,
                 "-m",
@@ -23,8 +37,9 @@ def main() -> None:
                 "127.0.0.1",
                 "--port",
                 str(port),
-                "--reload",
             ]
+            if not args.no_reload:
+                cmd.append("--reload")
             print(f"Starting {name} on port {port}...")
             processes.append(subprocess.Popen(cmd, cwd=ROOT))
         for proc in processes:
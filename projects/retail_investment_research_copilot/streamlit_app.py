@@ -1,14 +1,12 @@
-import os
-
-import requests
 import streamlit as st
-from dotenv import load_dotenv
 
-load_dotenv(override=True)
+from client import build_memo_payload, get_transport
 
-MARKET_DATA_URL = os.getenv("MARKET_DATA_SERVICE_URL", "http://127.0.0.1:8101/invoke")
-NEWS_URL = os.getenv("NEWS_SERVICE_URL", "http://127.0.0.1:8102/invoke")
-MEMO_URL = os.getenv("MEMO_SERVICE_URL", "http://127.0.0.1:8103/invoke")
+SPECIALIST_VIEWS = {
+    "valuation_view": "💰 Valuation view",
+    "momentum_view": "📈 Momentum view",
+    "risk_view": "⚠️ Risk view",
+}
 
 st.set_page_config(page_title="Investment Research Copilot", layout="wide")
 st.title("📊 Retail Investment Research Copilot")
@@ -23,40 +21,79 @@ with col2:
 with col3:
     risk = st.selectbox("Risk appetite", ["low", "medium", "high"], index=1)
 
+force_refresh = st.checkbox(
+    "Regenerate memo (ignore cached memo)",
+    help="The memo service reuses a memo generated earlier for the same inputs.",
+)
+
 if st.button("Generate memo"):
     with st.status("Orchestrating AI agents...", expanded=True) as status:
         st.write("📊 Calling Market Data Service...")
-        market_resp = requests.post(
-            MARKET_DATA_URL, json={"payload": {"ticker": ticker}}
-        )
-        market_resp.raise_for_status()
+        transport = get_transport()
+        market_resp = transport.invoke("market_data", {"ticker": ticker})
 
         st.write("📰 Calling News Service...")
-        news_resp = requests.post(NEWS_URL, json={"payload": {"ticker": ticker}})
-        news_resp.raise_for_status()
+        news_resp = transport.invoke("news", {"ticker": ticker})
 
         st.write("🧠 Compiling analyses for Memo Service...")
-        memo_payload = {
-            "ticker": ticker,
-            "horizon": horizon,
-            "risk_appetite": risk,
-            "market_data_analysis": market_resp.json()["result"],
-            "news_analysis": news_resp.json()["result"],
-        }
-
-        st.write("✍️ Generating and refining final investment memo...")
-        memo_resp = requests.post(MEMO_URL, json={"payload": memo_payload})
-        memo_resp.raise_for_status()
+        memo_payload = build_memo_payload(
+            ticker, horizon, risk, market_resp["result"], news_resp["result"]
+        )
 
-        status.update(label="👍 Research complete!", state="complete", expanded=False)
+        status.update(
+            label="✍️ Market data and news ready — streaming the memo below...",
+            state="complete",
+            expanded=False,
+        )
 
+    # The memo service streams each pipeline stage as it finishes, so the
+    # research brief and specialist views show up long before the final memo.
     tab1, tab2, tab3 = st.tabs(["Final Memo", "Market Data", "News Analysis"])
 
-    with tab1:
-        st.markdown(memo_resp.json()["result"])
-
     with tab2:
-        st.markdown(market_resp.json()["result"])
+        st.markdown(market_resp["result"])
 
     with tab3:
-        st.markdown(news_resp.json()["result"])
+        st.markdown(news_resp["result"])
+
+    with tab1:
+        memo_status = st.empty()
+        memo_area = st.empty()
+        brief_area = st.expander("🗂️ Research brief", expanded=False)
+        view_areas = {
+            stage: st.expander(label, expanded=False)
+            for stage, label in SPECIALIST_VIEWS.items()
+        }
+        memo_status.info("Waiting for the research brief...")
+
+        for event, data in transport.stream_memo(memo_payload, force_refresh=force_refresh):
+            if event == "error":
+                memo_status.error(f"Memo generation failed: {data['error']}")
+                break
+            if event == "done":
+                memo_area.markdown(data["result"])
+                cache = data["meta"].get("cache", {})
+                if cache.get("hit"):
+                    memo_status.success(
+                        f"♻️ Cached memo from {cache['age_seconds'] / 60:.0f} min ago"
+                    )
+                else:
+                    memo_status.success(
+                        f"👍 Research complete in {data['total_ms'] / 1000:.1f}s"
+                    )
+                break
+
+            stage, took = data["stage"], data["stage_ms"] / 1000
+            if stage == "research_brief":
+                brief_area.markdown(data["text"])
+                memo_status.info("Specialists are analysing the brief...")
+            elif stage in view_areas:
+                view_areas[stage].markdown(data["text"])
+                view_areas[stage].caption(f"ready in {took:.1f}s")
+            elif stage == "draft_memo":
+                memo_area.markdown(data["text"])
+                memo_status.info(
+                    f"Draft ready in {took:.1f}s — refining (critic → rewriter)..."
+                )
+            elif stage == "final_memo":
+                memo_area.markdown(data["text"])
@@ -1,15 +1,21 @@
 """
 __main__.py (for activities agent)
-    launches a FastAPI server on port 8003, serving the agent at
-    the /run endpoint.
+    launches a FastAPI server on port 8003 (or $PORT), serving the agent at
+    the /run and /run_stream endpoints.
 """
 
+import os
+from pathlib import Path
+
 from common.a2a_server import create_app
-from .task_manager import run
+from .task_manager import run, stream
+
+CARD = Path(__file__).parent / ".well_known" / "agent,json"
 
-app = create_app(agent=type("Agent", (), {"execute": run}))
+app = create_app(agent=type("Agent", (), {"execute": run, "stream": stream}), card=CARD)
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, port=8003)
+    # PORT lets several replicas run side by side, e.g. PORT=8011
+    uvicorn.run(app, port=int(os.getenv("PORT", "8003")))
@@ -5,9 +5,8 @@ import json
 
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
+
+from common.adk_runner import AgentService
 
 from .prompts import ACTIVITY_AGENT_INSTRUCTIONS
 
@@ -23,22 +22,14 @@ activities_agent = Agent(
 
 
 USER_ID = "user_activities"
-SESSION_ID = "session_activities"
 APP_NAME = "activities_app"
 
 
-# and a function to execute the agent
-async def execute(request):
-    # configure a runner for the above agent
-    session_service = InMemorySessionService()
-    runner = Runner(
-        agent=activities_agent,
-        app_name=APP_NAME,
-        session_service=session_service,
-    )
-    await session_service.create_session(
-        app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
-    )
+# one Runner for the life of the process; each request gets its own session
+service = AgentService(activities_agent, APP_NAME, USER_ID)
+
+
+def build_prompt(request):
     prompt = (
         f"User is flying to {request['destination']} from {request['start_date']} to {request['end_date']}, "
         f"with a budget of {request['budget']}."
@@ -49,22 +40,28 @@ async def execute(request):
     print("------------------------------------------------")
 
     # build user-query
-    prompt = textwrap.dedent(prompt).strip()
-    message = types.Content(role="user", parts=[types.Part(text=prompt)])
-    # and run the user-query
-    async for event in runner.run_async(
-        user_id=USER_ID, session_id=SESSION_ID, new_message=message
-    ):
-        if event.is_final_response():
-            response_text = event.content.parts[0].text
-            try:
-                parsed = json.loads(response_text)
-                if "activities" in parsed and isinstance(parsed["activities"], list):
-                    return {"activities": parsed["activities"]}
-                else:
-                    print("'activities' key missing or not a list in response JSON")
-                    return {"activities": response_text}  # fallback to raw text
-            except json.JSONDecodeError as e:
-                print("JSON parsing failed:", e)
-                print("Response content:", response_text)
-                return {"activities": response_text}  # fallback to raw text
+    return textwrap.dedent(prompt).strip()
+
+
+def format_result(response_text):
+    try:
+        parsed = json.loads(response_text)
+        if "activities" in parsed and isinstance(parsed["activities"], list):
+            return {"activities": parsed["activities"]}
+        else:
+            print("'activities' key missing or not a list in response JSON")
+            return {"activities": response_text}  # fallback to raw text
+    except (json.JSONDecodeError, TypeError) as e:
+        print("JSON parsing failed:", e)
+        print("Response content:", response_text)
+        return {"activities": response_text}  # fallback to raw text
+
+
+# and a function to execute the agent (in a fresh session)
+async def execute(request):
+    return format_result(await service.run(build_prompt(request)))
+
+
+def stream(request):
+    """Same as execute(), as /run_stream messages (token deltas, then the result)."""
+    return service.stream(build_prompt(request), format_result)
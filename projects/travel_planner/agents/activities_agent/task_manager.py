@@ -4,8 +4,12 @@ task_manager.py
     it up into the ADK-compatible server setup using this file.
 """
 
-from .agent import execute
+from .agent import execute, stream as stream_agent
 
 
 async def run(payload):
     return await execute(payload)
+
+
+def stream(payload):
+    return stream_agent(payload)
@@ -4,9 +4,8 @@ import textwrap
 
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
+
+from common.adk_runner import AgentService
 
 from .prompts import FLIGHT_AGENT_INSTRUCTIONS
 
@@ -14,7 +13,6 @@ load_dotenv(override=True)
 assert os.getenv("OPENAI_API_KEY"), "FATAL: flight_agent -> OPENAI_API_KEY not set!"
 
 USER_ID = "user_flights"
-SESSION_ID = "session_flights"
 APP_NAME = "flight_app"
 
 
@@ -26,20 +24,11 @@ flight_agent = Agent(
 )
 
 
-async def execute(request):
-
-    session_service = InMemorySessionService()
-    runner = Runner(
-        agent=flight_agent,
-        app_name=APP_NAME,
-        session_service=session_service,
-    )
+# one Runner for the life of the process; each request gets its own session
+service = AgentService(flight_agent, APP_NAME, USER_ID)
 
-    # 🔧 Ensure session is created before running the agent
-    await session_service.create_session(
-        app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
-    )
 
+def build_prompt(request):
     prompt = (
         f"User is flying from {request['origin']} to {request['destination']} "
         f"from {request['start_date']} to {request['end_date']}, with a budget "
@@ -52,11 +41,17 @@ async def execute(request):
     print(f"Prompt: {prompt}")
     print("------------------------------------------------")
 
-    prompt = textwrap.dedent(prompt).strip()
-    message = types.Content(role="user", parts=[types.Part(text=prompt)])
+    return textwrap.dedent(prompt).strip()
+
+
+def format_result(text):
+    return {"flights": text}
+
+
+async def execute(request):
+    return format_result(await service.run(build_prompt(request)))
+
 
-    async for event in runner.run_async(
-        user_id=USER_ID, session_id=SESSION_ID, new_message=message
-    ):
-        if event.is_final_response():
-            return {"flights": event.content.parts[0].text}
+def stream(request):
+    """Same as execute(), as /run_stream messages (token deltas, then the result)."""
+    return service.stream(build_prompt(request), format_result)
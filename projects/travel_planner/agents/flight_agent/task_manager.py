@@ -1,5 +1,9 @@
-from .agent import execute
+from .agent import execute, stream as stream_agent
 
 
 async def run(payload):
     return await execute(payload)
+
+
+def stream(payload):
+    return stream_agent(payload)
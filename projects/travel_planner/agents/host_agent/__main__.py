@@ -1,5 +1,9 @@
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from common.a2a_client import lifespan as client_lifespan
 from common.a2a_server import create_app
-from .task_manager import run
+from .task_manager import registry, run, stats, stream
 
 # -----------------------------------------------------------------------------
 # this line is the star of our show!! Let's unpack it from the inside out:
@@ -28,7 +32,22 @@ from .task_manager import run
 # a quick anonymous class is created on the fly using type()
 # -----------------------------------------------------------------------------
 
-app = create_app(agent=type("Agent", (), {"execute": run}))
+CARD = Path(__file__).parent / ".well_known" / "agent,json"
+
+
+# the host is the only agent that calls other agents, so it owns the pooled
+# A2A client and the agent registry: opened at startup, closed at shutdown
+@asynccontextmanager
+async def lifespan(app):
+    async with client_lifespan(app), registry.running():
+        yield
+
+
+app = create_app(
+    agent=type("Agent", (), {"execute": run, "stream": stream, "stats": stats}),
+    lifespan=lifespan,
+    card=CARD,
+)
 
 if __name__ == "__main__":
     import uvicorn
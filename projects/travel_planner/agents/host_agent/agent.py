@@ -4,9 +4,8 @@ import textwrap
 
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
+
+from common.adk_runner import AgentService
 
 from .prompts import HOST_AGENT_INSTRUCTIONS
 
@@ -22,23 +21,14 @@ host_agent = Agent(
 
 
 USER_ID = "user_host"
-SESSION_ID = "session_host"
 APP_NAME = "host_app"
 
 
-async def execute(request):
-    session_service = InMemorySessionService()
+# one Runner for the life of the process; each request gets its own session
+service = AgentService(host_agent, APP_NAME, USER_ID)
 
-    runner = Runner(
-        agent=host_agent,
-        app_name=APP_NAME,
-        session_service=session_service,
-    )
 
-    # Ensure session exists
-    await session_service.create_session(
-        app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
-    )
+async def execute(request):
     prompt = (
         f"Plan a trip to {request['destination']} from {request['start_date']} to {request['end_date']} "
         f"within a total budget of {request['budget']}."
@@ -50,9 +40,4 @@ async def execute(request):
     print("------------------------------------------------")
 
     prompt = textwrap.dedent(prompt).strip()
-    message = types.Content(role="user", parts=[types.Part(text=prompt)])
-    async for event in runner.run_async(
-        user_id=USER_ID, session_id=SESSION_ID, new_message=message
-    ):
-        if event.is_final_response():
-            return {"summary": event.content.parts[0].text}
+    return {"summary": await service.run(prompt)}
@@ -0,0 +1,145 @@
+"""
+cache.py (for host agent)
+
+per-agent TTL cache of sub-agent replies.
+
+Users often re-submit the same trip after touching an unrelated UI field,
+and every submit used to cost three GPT-4o calls. Incoming payloads are
+canonicalized against shared.schemas.TravelRequest (trimmed, case-folded
+destination, ISO dates, float budget) and each sub-agent's reply is cached
+under only the fields its prompt uses (AGENT_FIELDS): changing the origin
+re-runs the flight agent but still serves stays and activities from cache.
+
+Only successful replies are cached; timeouts and failures are retried on
+the next request.
+
+Settings (environment):
+    HOST_CACHE_ENABLED      "0" to turn the cache off (default on)
+    HOST_CACHE_TTL_SECONDS  how long a reply stays fresh (default 600)
+    HOST_CACHE_MAX_ENTRIES  replies kept per agent, oldest dropped first (default 1000)
+"""
+
+import datetime
+import json
+import os
+import time
+from collections import OrderedDict
+
+from pydantic import ValidationError
+
+from shared.schemas import TravelRequest
+
+HOST_CACHE_ENABLED = os.getenv("HOST_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+HOST_CACHE_TTL_SECONDS = float(os.getenv("HOST_CACHE_TTL_SECONDS", "600"))
+HOST_CACHE_MAX_ENTRIES = int(os.getenv("HOST_CACHE_MAX_ENTRIES", "1000"))
+
+# the request fields each agent's prompt is built from (see the agents'
+# build_prompt) - only these are part of that agent's cache key
+AGENT_FIELDS = {
+    "flights": ("origin", "destination", "start_date", "end_date", "budget"),
+    "stay": ("destination", "start_date", "end_date", "budget"),
+    "activities": ("destination", "start_date", "end_date", "budget"),
+}
+
+
+def _canonical_text(value):
+    return " ".join(value.split()).title()
+
+
+def _canonical_date(value):
+    try:
+        return datetime.date.fromisoformat(value.strip()).isoformat()
+    except ValueError:
+        return value.strip()
+
+
+def canonicalize(payload):
+    """Return the canonical request dict, or None if `payload` isn't a TravelRequest.
+
+    The canonical dict is also what the host forwards to the agents, so two
+    payloads with the same key always produce the same prompt.
+    """
+    try:
+        request = TravelRequest(**payload)
+    except (TypeError, ValidationError) as ex:
+        print(f"host cache: not caching invalid request ({ex})")
+        return None
+    canonical = {
+        "destination": _canonical_text(request.destination),
+        "start_date": _canonical_date(request.start_date),
+        "end_date": _canonical_date(request.end_date),
+        "budget": round(request.budget, 2),
+    }
+    if request.origin is not None:
+        canonical["origin"] = _canonical_text(request.origin)
+    return canonical
+
+
+class ReplyCache:
+    """TTL + size-bounded cache of one agent's replies, with hit counters."""
+
+    def __init__(self, fields, ttl, max_entries):
+        self.fields = fields
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, request):
+        return json.dumps({field: request.get(field) for field in self.fields}, sort_keys=True)
+
+    def get(self, request):
+        key = self.key(request)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, request, reply):
+        key = self.key(request)
+        self.entries[key] = (time.monotonic() + self.ttl, reply)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self.entries),
+        }
+
+
+caches = {
+    name: ReplyCache(fields, HOST_CACHE_TTL_SECONDS, HOST_CACHE_MAX_ENTRIES)
+    for name, fields in AGENT_FIELDS.items()
+}
+
+
+def lookup(name, request):
+    """Cached reply of agent `name` for a canonical request, or None."""
+    if not HOST_CACHE_ENABLED or request is None:
+        return None
+    return caches[name].get(request)
+
+
+def store(name, request, reply):
+    if HOST_CACHE_ENABLED and request is not None:
+        caches[name].put(request, reply)
+
+
+def stats():
+    """Per-agent hit / miss counts and hit rate (served on the host's /stats)."""
+    return {
+        "enabled": HOST_CACHE_ENABLED,
+        "ttl_seconds": HOST_CACHE_TTL_SECONDS,
+        "agents": {name: cache.stats() for name, cache in caches.items()},
+    }
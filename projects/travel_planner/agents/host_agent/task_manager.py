@@ -3,39 +3,206 @@ task_manager.py (for host agent)
 
 executes the orchestration logic by calling remote agents and handling
 the full trip-planning workflow.
+
+The flight, stay and activities agents are independent of each other, so
+they are called concurrently: total latency is the slowest agent rather than
+the sum of all three. Each agent gets AGENT_DEADLINE_SECONDS to answer; the
+host returns whatever finished in time and marks the rest as timed out.
+
+stream() is the /run_stream variant: it opens the three sub-agents'
+/run_stream endpoints at once and merges them into one stream, so the UI
+can render each section (and its tokens) the moment it arrives.
+
+Agents are looked up by their card name in common.registry, which spreads
+calls over every healthy replica of an agent (AGENT_ENDPOINTS).
+
+Successful replies are cached per agent (see cache.py), so re-submitting
+the same trip - or changing a field only some agents use - skips the
+agents whose answer is already known. Cached sections are listed under
+`cached` in the response.
 """
 
+import asyncio
+import os
+import time
+
 from rich.console import Console
 
-from common.a2a_client import call_agent
+from common.a2a_client import breaker_states, call_agent, stream_agent
+from common.registry import AgentRegistry
 
-import os
+from . import cache
 
-# BAD PRACTICE: don't hard-code this into Python file
-# better to externalize it into the .env file
-FLIGHT_URL = os.getenv("FLIGHT_URL", "http://localhost:8001/run")
-STAY_URL = os.getenv("STAY_URL", "http://localhost:8002/run")
-ACTIVITIES_URL = os.getenv("ACTIVITIES_URL", "http://localhost:8003/run")
+# per-agent deadline (seconds) - agents still running after this are dropped
+AGENT_DEADLINE_SECONDS = float(os.getenv("AGENT_DEADLINE_SECONDS", "45"))
+
+# response key -> (agent card name, key in the agent's reply, fallback text)
+SUB_AGENTS = {
+    "flights": ("flight_agent", "flights", "No flights returned."),
+    "stay": ("stay_agent", "stays", "No stay options returned."),
+    "activities": ("activity_agent", "activities", "No activities found."),
+}
 
 console = Console()
+registry = AgentRegistry()
+
+
+async def _call_agent(agent_name, payload):
+    async with registry.acquire(agent_name) as replica:
+        return await call_agent(replica.run_url, payload)
+
+
+async def _call_with_deadline(name, agent_name, payload, deadline, request=None):
+    """Call one agent (or its cache); returns (name, status, reply, elapsed seconds)."""
+    started = time.perf_counter()
+    reply = cache.lookup(name, request)
+    if reply is not None:
+        return name, "cached", reply, time.perf_counter() - started
+    try:
+        reply = await asyncio.wait_for(_call_agent(agent_name, payload), timeout=deadline)
+        status = "ok"
+        cache.store(name, request, reply)
+    except asyncio.TimeoutError:
+        reply, status = None, "timed_out"
+    except Exception as ex:
+        console.print(f"[red]{name} agent failed: {ex!r}[/red]")
+        reply, status = None, "failed"
+    return name, status, reply, time.perf_counter() - started
+
+
+def _section(name, status, reply):
+    """Text (or list) shown for one section of the plan."""
+    _, reply_key, fallback = SUB_AGENTS[name]
+    if status == "timed_out":
+        return (
+            f"⏱️ The {name} agent did not respond within "
+            f"{AGENT_DEADLINE_SECONDS:.0f}s - please try again."
+        )
+    if status == "failed":
+        return f"⚠️ The {name} agent is unavailable right now."
+    # Ensure reply is a dict before access
+    reply = reply if isinstance(reply, dict) else {}
+    return reply.get(reply_key, fallback)
 
 
 async def run(payload):
     # Print what the host agent is sending
     print(f"Incoming payload: {payload}")
-    flights = await call_agent(FLIGHT_URL, payload)
-    stay = await call_agent(STAY_URL, payload)
-    activities = await call_agent(ACTIVITIES_URL, payload)
-    # Log outputs
-    print(f"Flights: {flights}")
-    print(f"Stay: {stay}")
-    print(f"Activities: {activities}")
-    # Ensure all are dicts before access
-    flights = flights if isinstance(flights, dict) else {}
-    stay = stay if isinstance(stay, dict) else {}
-    activities = activities if isinstance(activities, dict) else {}
+    started = time.perf_counter()
+    request = cache.canonicalize(payload)
+    # agents get the canonical request so cached and fresh answers match
+    forwarded = request if request is not None else payload
+    outcomes = await asyncio.gather(
+        *(
+            _call_with_deadline(name, agent_name, forwarded, AGENT_DEADLINE_SECONDS, request)
+            for name, (agent_name, _, _) in SUB_AGENTS.items()
+        )
+    )
+
+    response = {"timed_out": [], "failed": [], "cached": [], "timings": {}}
+    for name, status, reply, elapsed in outcomes:
+        # Log outputs
+        print(f"{name} ({status}, {elapsed:.1f}s): {reply}")
+        response["timings"][name] = round(elapsed * 1000)
+        if status != "ok":
+            response[status].append(name)
+        response[name] = _section(name, status, reply)
+
+    response["timings"]["total"] = round((time.perf_counter() - started) * 1000)
+    return response
+
+
+async def _pump(name, agent_name, payload, queue, request=None):
+    """Forward one sub-agent's stream into `queue`, ending with its section."""
+    started = time.perf_counter()
+    reply = None
+
+    async def consume():
+        nonlocal reply
+        async with registry.acquire(agent_name) as replica:
+            async for message in stream_agent(replica.run_url, payload):
+                if message["type"] == "delta":
+                    await queue.put({"type": "delta", "section": name, "text": message["text"]})
+                elif message["type"] == "result":
+                    reply = message["result"]
+                elif message["type"] == "error":
+                    raise RuntimeError(message["error"])
+
+    try:
+        await asyncio.wait_for(consume(), timeout=AGENT_DEADLINE_SECONDS)
+        if reply is None:
+            # the stream ended cleanly but never sent its result
+            raise RuntimeError("stream ended without a result")
+        status = "ok"
+        cache.store(name, request, reply)
+    except asyncio.TimeoutError:
+        status = "timed_out"
+    except Exception as ex:
+        console.print(f"[red]{name} agent stream failed: {ex!r}[/red]")
+        status = "failed"
+    await queue.put(
+        {
+            "type": "section",
+            "section": name,
+            "status": status,
+            "content": _section(name, status, reply),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000),
+        }
+    )
+
+
+async def stream(payload):
+    """Merged /run_stream of the three sub-agents.
+
+    Yields {"type": "delta", "section", "text"} while an agent is writing,
+    {"type": "section", "section", "status", "content", "elapsed_ms"} when it
+    is done, and finally {"type": "done", "timed_out", "failed", "cached",
+    "timings"}. Cached sections are sent first, without any deltas.
+    """
+    print(f"Incoming payload (stream): {payload}")
+    started = time.perf_counter()
+    request = cache.canonicalize(payload)
+    forwarded = request if request is not None else payload
+    queue = asyncio.Queue()
+    tasks = []
+    for name, (agent_name, _, _) in SUB_AGENTS.items():
+        reply = cache.lookup(name, request)
+        if reply is None:
+            tasks.append(asyncio.create_task(_pump(name, agent_name, forwarded, queue, request)))
+        else:
+            queue.put_nowait(
+                {
+                    "type": "section",
+                    "section": name,
+                    "status": "cached",
+                    "content": _section(name, "cached", reply),
+                    "elapsed_ms": 0,
+                }
+            )
+    summary = {"timed_out": [], "failed": [], "cached": [], "timings": {}}
+    remaining = len(SUB_AGENTS)
+    try:
+        while remaining:
+            message = await queue.get()
+            if message["type"] == "section":
+                remaining -= 1
+                summary["timings"][message["section"]] = message["elapsed_ms"]
+                if message["status"] != "ok":
+                    summary[message["status"]].append(message["section"])
+            yield message
+    finally:
+        # the client may disconnect mid-stream - don't leave agents running
+        for task in tasks:
+            task.cancel()
+
+    summary["timings"]["total"] = round((time.perf_counter() - started) * 1000)
+    yield {"type": "done", **summary}
+
+
+def stats():
+    """Served on the host's /stats: cache hit rates, replicas and breakers."""
     return {
-        "flights": flights.get("flights", "No flights returned."),
-        "stay": stay.get("stays", "No stay options returned."),
-        "activities": activities.get("activities", "No activities found."),
+        "cache": cache.stats(),
+        "agents": registry.snapshot(),
+        "breakers": breaker_states(),
     }
@@ -4,9 +4,8 @@ import textwrap
 
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
+
+from common.adk_runner import AgentService
 
 from .prompts import STAY_AGENT_INSTRUCTIONS
 
@@ -21,22 +20,14 @@ stay_agent = Agent(
 )
 
 USER_ID = "user_stay"
-SESSION_ID = "session_stay"
 APP_NAME = "stay_app"
 
 
-async def execute(request):
-    session_service = InMemorySessionService()
-    runner = Runner(
-        agent=stay_agent,
-        app_name=APP_NAME,
-        session_service=session_service,
-    )
+# one Runner for the life of the process; each request gets its own session
+service = AgentService(stay_agent, APP_NAME, USER_ID)
 
-    await session_service.create_session(
-        app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
-    )
 
+def build_prompt(request):
     prompt = (
         f"User is staying in {request['destination']} from {request['start_date']} to {request['end_date']} "
         f"with a budget of {request['budget']}. Suggest stay options."
@@ -45,11 +36,17 @@ async def execute(request):
     print(f"Prompt: {prompt}")
     print("------------------------------------------------")
 
-    prompt = textwrap.dedent(prompt).strip()
-    message = types.Content(role="user", parts=[types.Part(text=prompt)])
+    return textwrap.dedent(prompt).strip()
+
+
+def format_result(text):
+    return {"stays": text}
+
+
+async def execute(request):
+    return format_result(await service.run(build_prompt(request)))
+
 
-    async for event in runner.run_async(
-        user_id=USER_ID, session_id=SESSION_ID, new_message=message
-    ):
-        if event.is_final_response():
-            return {"stays": event.content.parts[0].text}
+def stream(request):
+    """Same as execute(), as /run_stream messages (token deltas, then the result)."""
+    return service.stream(build_prompt(request), format_result)
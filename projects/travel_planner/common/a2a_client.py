@@ -1,12 +1,238 @@
 """
 a2a_client.py: This lightweight async utility allows any agent (especially the host) to invoke another agent using the A2A protocol by calling the /run endpoint.
+
+All calls share one module-level httpx.AsyncClient, so connections to the
+downstream agents are kept alive and reused instead of paying a TCP (and
+TLS) handshake per call. The host app opens and closes it through its
+lifespan (see `lifespan` below); scripts that never start an app get a
+client created lazily on first use.
+
+Each call is retried with exponential backoff on connection errors and 5xx
+responses, and every downstream URL has its own circuit breaker: after
+A2A_BREAKER_FAILURES consecutive failures the URL is skipped for
+A2A_BREAKER_RESET_SECONDS (calls raise CircuitOpenError immediately), after
+which one trial call decides whether it closes again.
+
+Settings (environment):
+    A2A_TIMEOUT_SECONDS       read timeout per attempt (default 60)
+    A2A_CONNECT_TIMEOUT       connect timeout per attempt (default 5)
+    A2A_MAX_RETRIES           retries after the first attempt (default 2)
+    A2A_BACKOFF_SECONDS       first backoff delay, doubled per retry (default 0.5)
+    A2A_BREAKER_FAILURES      consecutive failures that open the breaker (default 5)
+    A2A_BREAKER_RESET_SECONDS how long the breaker stays open (default 30)
+    A2A_HTTP2                 "1" to negotiate HTTP/2 (needs the `h2` package)
 """
 
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+
 import httpx
 
+A2A_TIMEOUT_SECONDS = float(os.getenv("A2A_TIMEOUT_SECONDS", "60"))
+A2A_CONNECT_TIMEOUT = float(os.getenv("A2A_CONNECT_TIMEOUT", "5"))
+A2A_MAX_RETRIES = int(os.getenv("A2A_MAX_RETRIES", "2"))
+A2A_BACKOFF_SECONDS = float(os.getenv("A2A_BACKOFF_SECONDS", "0.5"))
+A2A_BREAKER_FAILURES = int(os.getenv("A2A_BREAKER_FAILURES", "5"))
+A2A_BREAKER_RESET_SECONDS = float(os.getenv("A2A_BREAKER_RESET_SECONDS", "30"))
+A2A_HTTP2 = os.getenv("A2A_HTTP2", "0").lower() in ("1", "true", "yes")
+
+# errors worth retrying: the request never reached the agent, or the
+# connection dropped before an answer came back
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an agent whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one downstream URL."""
+
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def before_call(self, url):
+        state = self.state
+        if state == "open" or (state == "half_open" and self.trial_in_flight):
+            raise CircuitOpenError(
+                f"{url} failed {self.failures} times in a row; not calling it for "
+                f"{self.reset_seconds:.0f}s"
+            )
+        if state == "half_open":
+            self.trial_in_flight = True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.failures >= self.failure_threshold:
+            # (re)open - a failed half-open trial restarts the wait
+            self.opened_at = time.monotonic()
+
+
+_client = None
+_breakers = {}
+
+
+def _new_client():
+    http2 = A2A_HTTP2 and importlib.util.find_spec("h2") is not None
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(A2A_TIMEOUT_SECONDS, connect=A2A_CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+
+
+def get_client():
+    """Return the shared client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _new_client()
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """FastAPI lifespan: open the pooled client at startup, close it at shutdown."""
+    get_client()
+    try:
+        yield
+    finally:
+        await close_client()
+
+
+def get_breaker(url):
+    if url not in _breakers:
+        _breakers[url] = CircuitBreaker(A2A_BREAKER_FAILURES, A2A_BREAKER_RESET_SECONDS)
+    return _breakers[url]
+
+
+def breaker_states():
+    """Current breaker state per downstream URL (for health endpoints / logs)."""
+    return {url: b.state for url, b in _breakers.items()}
+
 
 async def call_agent(url, payload):
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload, timeout=60.0)
-        response.raise_for_status()
-        return response.json()
+    breaker = get_breaker(url)
+    breaker.before_call(url)
+    try:
+        response = await _post_with_retries(url, payload, breaker)
+    except asyncio.CancelledError:
+        # the caller's deadline expired - not the agent's fault
+        breaker.trial_in_flight = False
+        raise
+    breaker.record_success()
+    return response.json()
+
+
+async def _post_with_retries(url, payload, breaker):
+    attempt = 0
+    while True:
+        try:
+            response = await get_client().post(url, json=payload)
+            response.raise_for_status()
+            return response
+        except (httpx.HTTPStatusError, *RETRYABLE_ERRORS) as ex:
+            server_error = isinstance(ex, httpx.HTTPStatusError) and ex.response.status_code >= 500
+            retryable = server_error or isinstance(ex, RETRYABLE_ERRORS)
+            if not retryable:
+                # a 4xx means the agent is up; don't count it against the breaker
+                breaker.record_success()
+                raise
+            if attempt >= A2A_MAX_RETRIES:
+                breaker.record_failure()
+                raise
+            error = ex
+        except Exception:
+            # read timeouts and the like - the agent is unresponsive
+            breaker.record_failure()
+            raise
+
+        delay = A2A_BACKOFF_SECONDS * (2**attempt) * random.uniform(0.8, 1.2)
+        print(f"call_agent: {url} attempt {attempt + 1} failed ({error!r}); retrying in {delay:.2f}s")
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+def stream_url(run_url):
+    """Map an agent's /run URL to its /run_stream URL."""
+    return run_url.rstrip("/") + "_stream"
+
+
+async def stream_agent(url, payload):
+    """Call an agent's /run_stream and yield each NDJSON message.
+
+    Shares the pooled client and the circuit breaker of `url` with
+    call_agent. Only opening the stream is retried: once messages have been
+    yielded a retry would duplicate them.
+    """
+    breaker = get_breaker(url)
+    breaker.before_call(url)
+    attempt = 0
+    yielded = False
+    try:
+        while True:
+            try:
+                async with get_client().stream("POST", stream_url(url), json=payload) as response:
+                    response.raise_for_status()
+                    breaker.record_success()
+                    async for line in response.aiter_lines():
+                        if line.strip():
+                            yielded = True
+                            yield json.loads(line)
+                return
+            except RETRYABLE_ERRORS as ex:
+                if yielded or attempt >= A2A_MAX_RETRIES:
+                    breaker.record_failure()
+                    raise
+                error = ex
+            except httpx.HTTPStatusError as ex:
+                if ex.response.status_code < 500:
+                    # a 4xx means the agent is up; don't count it against the breaker
+                    breaker.record_success()
+                    raise
+                if attempt >= A2A_MAX_RETRIES:
+                    breaker.record_failure()
+                    raise
+                error = ex
+            except Exception:
+                # read timeouts, a malformed NDJSON line and the like
+                breaker.record_failure()
+                raise
+            delay = A2A_BACKOFF_SECONDS * (2**attempt) * random.uniform(0.8, 1.2)
+            print(f"stream_agent: {url} attempt {attempt + 1} failed ({error!r}); retrying in {delay:.2f}s")
+            attempt += 1
+            await asyncio.sleep(delay)
+    finally:
+        # cancelled, or closed early by the consumer (GeneratorExit): neither
+        # says anything about the agent, but a half-open probe must not stay
+        # in flight forever
+        breaker.trial_in_flight = False
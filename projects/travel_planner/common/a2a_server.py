@@ -4,17 +4,65 @@ generalize it using the create_app(agent) function, which handles:
     * Serving the agent on /run
     * Receiving a travel request
     * Returning a structured response
+Pass `lifespan` to run startup / shutdown code, e.g. the host agent opens
+and closes its pooled A2A client (common.a2a_client.lifespan).
+
+Agents that also have a `stream(payload)` async generator get /run_stream,
+which sends each message it yields as one line of NDJSON as soon as it is
+produced. The last line is {"type": "result", ...} (or {"type": "error"}).
+
+Pass `card` (the path of the agent's .well_known/agent,json) to publish it
+on GET /.well-known/agent.json, where common.registry discovers agents.
+Every app also answers GET /health for the registry's health checks.
+
+Agents with a `stats()` function get GET /stats, which returns whatever it
+reports (the host uses it for its per-agent cache hit rates).
 """
 
+import json
+from pathlib import Path
+
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 import uvicorn
 
 
-def create_app(agent):
-    app = FastAPI()
+def create_app(agent, lifespan=None, card=None):
+    app = FastAPI(lifespan=lifespan)
+    agent_card = json.loads(Path(card).read_text()) if card else None
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    if agent_card is not None:
+
+        @app.get("/.well-known/agent.json")
+        async def well_known_card():
+            return agent_card
 
     @app.post("/run")
     async def run(payload: dict):
         return await agent.execute(payload)
 
+    if hasattr(agent, "stream"):
+
+        @app.post("/run_stream")
+        async def run_stream(payload: dict):
+            async def lines():
+                try:
+                    async for message in agent.stream(payload):
+                        yield json.dumps(message, default=str) + "\n"
+                except Exception as ex:
+                    print(f"run_stream failed: {ex!r}")
+                    yield json.dumps({"type": "error", "error": str(ex)}) + "\n"
+
+            return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    if hasattr(agent, "stats"):
+
+        @app.get("/stats")
+        async def stats():
+            return agent.stats()
+
     return app
@@ -0,0 +1,84 @@
+"""
+adk_runner.py: one long-lived ADK Runner per agent service.
+
+Every agent used to build a new InMemorySessionService and Runner per
+request and then reuse a constant session id, so concurrent requests either
+failed on the duplicate session or mixed their histories. AgentService keeps
+a single Runner and session service for the life of the process and gives
+each request its own session, which is deleted as soon as the request is
+done. Any number of requests can run concurrently on one worker.
+
+`run()` returns the final text; `events()` yields the ADK events as they
+are produced (with token streaming turned on, for /run_stream).
+"""
+
+import uuid
+
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+
+class AgentService:
+    def __init__(self, agent, app_name, user_id):
+        self.agent = agent
+        self.app_name = app_name
+        self.user_id = user_id
+        self.session_service = InMemorySessionService()
+        self.runner = Runner(
+            agent=agent,
+            app_name=app_name,
+            session_service=self.session_service,
+        )
+        self.active_sessions = 0
+
+    async def events(self, prompt, stream_tokens=False):
+        """Run the agent on `prompt` in a fresh session, yielding every ADK event."""
+        session_id = f"{self.app_name}-{uuid.uuid4().hex}"
+        await self.session_service.create_session(
+            app_name=self.app_name, user_id=self.user_id, session_id=session_id
+        )
+        self.active_sessions += 1
+        message = types.Content(role="user", parts=[types.Part(text=prompt)])
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE) if stream_tokens else None
+        try:
+            async for event in self.runner.run_async(
+                user_id=self.user_id,
+                session_id=session_id,
+                new_message=message,
+                run_config=run_config,
+            ):
+                yield event
+        finally:
+            self.active_sessions -= 1
+            # sessions are per request - drop it so memory doesn't grow with traffic
+            await self.session_service.delete_session(
+                app_name=self.app_name, user_id=self.user_id, session_id=session_id
+            )
+
+    async def run(self, prompt):
+        """Run the agent on `prompt` in a fresh session; returns the final text."""
+        final_text = None
+        async for event in self.events(prompt):
+            if event.is_final_response() and event.content and event.content.parts:
+                final_text = event.content.parts[0].text
+        return final_text
+
+    async def stream(self, prompt, format_result):
+        """Yield /run_stream messages: token deltas, then the formatted result.
+
+            {"type": "delta", "author": ..., "text": ...}   partial model output
+            {"type": "result", "result": {...}}             same body as /run
+        """
+        final_text = None
+        async for event in self.events(prompt, stream_tokens=True):
+            if not (event.content and event.content.parts):
+                continue
+            text = "".join(part.text for part in event.content.parts if part.text)
+            if event.partial:
+                if text:
+                    yield {"type": "delta", "author": event.author, "text": text}
+            elif event.is_final_response():
+                final_text = event.content.parts[0].text
+        yield {"type": "result", "result": format_result(final_text)}
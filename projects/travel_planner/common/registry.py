@@ -0,0 +1,171 @@
+"""
+registry.py: finds the downstream agents from their agent cards and spreads
+calls across replicas.
+
+The host is given a list of base URLs (AGENT_ENDPOINTS) rather than one URL
+per agent. At startup, and again on every health-check round for instances
+that haven't answered yet, the registry reads each instance's
+/.well-known/agent.json and files it under the card's `name`, so running a
+second flight agent is just one more URL in the list:
+
+    AGENT_ENDPOINTS=http://localhost:8001,http://localhost:8011,http://localhost:8002,http://localhost:8003
+
+Every REGISTRY_HEALTH_INTERVAL seconds each instance's /health is checked;
+an instance is ejected after REGISTRY_EJECT_AFTER consecutive failed checks
+(or failed calls) and readmitted on its next good check. `acquire(name)`
+picks the healthy replica with the fewest requests in flight
+(least-outstanding-requests), breaking ties at random.
+
+Settings (environment):
+    AGENT_ENDPOINTS              comma-separated agent base URLs (defaults to
+                                 FLIGHT_URL, STAY_URL and ACTIVITIES_URL
+                                 without their /run suffix)
+    REGISTRY_HEALTH_INTERVAL     seconds between health-check rounds (default 10)
+    REGISTRY_HEALTH_TIMEOUT      timeout of one health check (default 2)
+    REGISTRY_EJECT_AFTER         consecutive failures before ejection (default 2)
+"""
+
+import asyncio
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+
+from common.a2a_client import get_client
+
+REGISTRY_HEALTH_INTERVAL = float(os.getenv("REGISTRY_HEALTH_INTERVAL", "10"))
+REGISTRY_HEALTH_TIMEOUT = float(os.getenv("REGISTRY_HEALTH_TIMEOUT", "2"))
+REGISTRY_EJECT_AFTER = int(os.getenv("REGISTRY_EJECT_AFTER", "2"))
+
+CARD_PATH = "/.well-known/agent.json"
+
+
+class NoHealthyReplicaError(RuntimeError):
+    """Raised when every known instance of an agent is ejected (or none was found)."""
+
+
+class Replica:
+    """One running instance of an agent."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+        self.card = None
+        self.healthy = False
+        self.outstanding = 0
+        self.failures = 0
+        self.last_checked = None
+
+    @property
+    def name(self):
+        return self.card.get("name") if self.card else None
+
+    @property
+    def run_url(self):
+        return f"{self.base_url}/run"
+
+    def snapshot(self):
+        return {
+            "url": self.base_url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "failures": self.failures,
+        }
+
+
+def default_endpoints():
+    endpoints = os.getenv("AGENT_ENDPOINTS")
+    if endpoints:
+        return [url.strip() for url in endpoints.split(",") if url.strip()]
+    urls = (
+        os.getenv("FLIGHT_URL", "http://localhost:8001/run"),
+        os.getenv("STAY_URL", "http://localhost:8002/run"),
+        os.getenv("ACTIVITIES_URL", "http://localhost:8003/run"),
+    )
+    return [url.rstrip("/").removesuffix("/run") for url in urls]
+
+
+class AgentRegistry:
+    def __init__(self, endpoints=None, interval=REGISTRY_HEALTH_INTERVAL, eject_after=REGISTRY_EJECT_AFTER):
+        self.replicas = [Replica(url) for url in (endpoints or default_endpoints())]
+        self.interval = interval
+        self.eject_after = eject_after
+        self._task = None
+
+    async def _check(self, replica):
+        """Fetch the card (until we have one) and the health of one instance."""
+        client = get_client()
+        try:
+            if replica.card is None:
+                response = await client.get(replica.base_url + CARD_PATH, timeout=REGISTRY_HEALTH_TIMEOUT)
+                response.raise_for_status()
+                replica.card = response.json()
+                print(f"registry: found {replica.name} at {replica.base_url}")
+            response = await client.get(replica.base_url + "/health", timeout=REGISTRY_HEALTH_TIMEOUT)
+            response.raise_for_status()
+        except (httpx.HTTPError, ValueError) as ex:
+            self.record_failure(replica, ex)
+        else:
+            if not replica.healthy and replica.last_checked is not None:
+                print(f"registry: {replica.name} at {replica.base_url} is back")
+            replica.healthy = True
+            replica.failures = 0
+        replica.last_checked = time.monotonic()
+
+    async def check_all(self):
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check_all()
+
+    @asynccontextmanager
+    async def running(self):
+        """Discover the agents, then keep health-checking them until exit."""
+        await self.check_all()
+        self._task = asyncio.create_task(self._health_loop())
+        try:
+            yield self
+        finally:
+            self._task.cancel()
+            self._task = None
+
+    def record_failure(self, replica, error=None):
+        replica.failures += 1
+        if replica.healthy and replica.failures >= self.eject_after:
+            print(f"registry: ejecting {replica.name or '?'} at {replica.base_url} ({error!r})")
+            replica.healthy = False
+
+    def pick(self, name):
+        """Healthy replica of agent `name` with the fewest requests in flight."""
+        candidates = [r for r in self.replicas if r.name == name and r.healthy]
+        if not candidates:
+            raise NoHealthyReplicaError(f"no healthy instance of {name}")
+        fewest = min(r.outstanding for r in candidates)
+        return random.choice([r for r in candidates if r.outstanding == fewest])
+
+    @asynccontextmanager
+    async def acquire(self, name):
+        """Reserve a replica of `name` for one call; connection failures count against it."""
+        if self._task is None and all(r.last_checked is None for r in self.replicas):
+            # used outside an app lifespan (scripts) - discover on first use
+            await self.check_all()
+        replica = self.pick(name)
+        replica.outstanding += 1
+        try:
+            yield replica
+        except (httpx.TransportError, httpx.HTTPStatusError) as ex:
+            if not isinstance(ex, httpx.HTTPStatusError) or ex.response.status_code >= 500:
+                self.record_failure(replica, ex)
+            raise
+        finally:
+            replica.outstanding -= 1
+
+    def snapshot(self):
+        """Replicas per agent name (for the host's /stats)."""
+        agents = {}
+        for replica in self.replicas:
+            agents.setdefault(replica.name or "undiscovered", []).append(replica.snapshot())
+        return agents
@@ -0,0 +1,110 @@
+"""
+check_concurrency.py: proves the agents are safe to call concurrently.
+
+Swaps the flight, stay and activities agents' GPT-4o model for an offline
+echo model, fires many overlapping execute() calls at each agent on one
+event loop, and checks that:
+    * every request gets back the answer for its own prompt
+    * every session saw exactly one user message (no shared history)
+    * no sessions are left behind once the requests finish
+
+No API key or running servers are needed:
+
+    python scripts/check_concurrency.py --requests 50
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+# the agent modules insist on a key at import time; the echo model never uses it
+os.environ.setdefault("OPENAI_API_KEY", "not-used-by-check-concurrency")
+
+from google.adk.models.base_llm import BaseLlm  # noqa: E402
+from google.adk.models.llm_response import LlmResponse  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from agents.activities_agent import agent as activities  # noqa: E402
+from agents.flight_agent import agent as flights  # noqa: E402
+from agents.stay_agent import agent as stays  # noqa: E402
+
+
+class EchoLlm(BaseLlm):
+    """Answers with the request id found in the prompt and the number of user turns seen."""
+
+    model: str = "echo"
+
+    async def generate_content_async(self, llm_request, stream=False):
+        user_texts = [
+            part.text
+            for content in llm_request.contents
+            if content.role == "user"
+            for part in content.parts or []
+            if part.text
+        ]
+        ids = re.findall(r"REQ-\d+", " ".join(user_texts))
+        # random latency so the requests interleave
+        await asyncio.sleep(random.uniform(0.01, 0.2))
+        yield LlmResponse(
+            content=types.Content(
+                role="model",
+                parts=[types.Part(text=f"{','.join(ids)}|turns={len(user_texts)}")],
+            )
+        )
+
+
+async def check(module, agent, reply_key, requests):
+    agent.model = EchoLlm()
+    payloads = [
+        {
+            "origin": "London",
+            "destination": f"REQ-{i}",
+            "start_date": "2026-11-01",
+            "end_date": "2026-11-05",
+            "budget": 1500,
+        }
+        for i in range(requests)
+    ]
+    replies = await asyncio.gather(*(module.execute(p) for p in payloads))
+
+    errors = []
+    for payload, reply in zip(payloads, replies):
+        expected = f"{payload['destination']}|turns=1"
+        if reply[reply_key] != expected:
+            errors.append(f"{payload['destination']}: got {reply[reply_key]!r}")
+    sessions = await module.service.session_service.list_sessions(
+        app_name=module.APP_NAME, user_id=module.USER_ID
+    )
+    if sessions.sessions:
+        errors.append(f"{len(sessions.sessions)} session(s) left behind")
+    return errors
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    failed = False
+    for name, module, agent, key in (
+        ("flight_agent", flights, flights.flight_agent, "flights"),
+        ("stay_agent", stays, stays.stay_agent, "stays"),
+        ("activities_agent", activities, activities.activities_agent, "activities"),
+    ):
+        errors = await check(module, agent, key, args.requests)
+        status = "OK" if not errors else f"FAILED ({len(errors)} problems)"
+        print(f"{name:<18} {args.requests} concurrent requests -> {status}")
+        for error in errors[:5]:
+            print(f"    {error}")
+        failed = failed or bool(errors)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+"""
+check_registry.py: exercises the agent registry against real uvicorn servers.
+
+Starts two flight agent replicas plus one stay and one activities agent,
+each its own uvicorn server on its own port, serving the real agent cards
+but answering with a short sleep instead of calling GPT-4o. It then drives
+the host's run() and checks that:
+    * the agents are discovered from their cards
+    * concurrent calls are spread over both flight replicas
+    * a stopped replica is ejected and every call goes to the survivor
+    * a restarted replica is readmitted
+
+No API key is needed:
+
+    python scripts/check_registry.py --requests 40
+"""
+
+import argparse
+import asyncio
+import collections
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import uvicorn
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+PORTS = {
+    8401: "flight_agent",
+    8411: "flight_agent",
+    8402: "stay_agent",
+    8403: "activities_agent",
+}
+REPLY_KEYS = {"flight_agent": "flights", "stay_agent": "stays", "activities_agent": "activities"}
+
+os.environ["AGENT_ENDPOINTS"] = ",".join(f"http://127.0.0.1:{port}" for port in PORTS)
+os.environ["REGISTRY_HEALTH_INTERVAL"] = "0.5"
+os.environ["REGISTRY_EJECT_AFTER"] = "1"
+os.environ["HOST_CACHE_ENABLED"] = "0"
+os.environ["A2A_MAX_RETRIES"] = "0"
+
+from common.a2a_server import create_app  # noqa: E402
+from agents.host_agent import task_manager as host  # noqa: E402
+
+served = collections.Counter()
+
+
+def fake_agent(port, agent_dir):
+    async def execute(payload):
+        served[port] += 1
+        await asyncio.sleep(0.2)
+        return {REPLY_KEYS[agent_dir]: f"answer from {port}"}
+
+    card = ROOT / "agents" / agent_dir / ".well_known" / "agent,json"
+    return create_app(agent=type("Agent", (), {"execute": execute}), card=card)
+
+
+def serve(port):
+    config = uvicorn.Config(fake_agent(port, PORTS[port]), port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def stop(server, thread):
+    server.should_exit = True
+    thread.join()
+
+
+async def plan_trips(count):
+    payload = {
+        "origin": "London",
+        "destination": "Paris",
+        "start_date": "2026-11-01",
+        "end_date": "2026-11-05",
+        "budget": 1500,
+    }
+    served.clear()
+    replies = await asyncio.gather(*(host.run(payload) for _ in range(count)))
+    return [r for r in replies if r["failed"] or r["timed_out"]]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=40)
+    args = parser.parse_args()
+
+    # the event loop must outlive a stopped server, so the servers run in threads
+    servers = {port: serve(port) for port in PORTS}
+    errors = []
+    async with host.registry.running() as registry:
+        found = {name: len(replicas) for name, replicas in registry.snapshot().items()}
+        print(f"discovered: {found}")
+        if found.get("flight_agent") != 2:
+            errors.append("expected two flight_agent replicas")
+
+        bad = await plan_trips(args.requests)
+        print(f"both replicas up:  {dict(served)}")
+        if bad or not (served[8401] and served[8411]):
+            errors.append("calls were not spread over both flight replicas")
+
+        stop(*servers.pop(8411))
+        await asyncio.sleep(1.5)
+        bad = await plan_trips(args.requests)
+        print(f"8411 stopped:      {dict(served)}")
+        if bad or served[8411]:
+            errors.append(f"{len(bad)} plan(s) failed or went to the stopped replica")
+
+        servers[8411] = serve(8411)
+        await asyncio.sleep(1.5)
+        bad = await plan_trips(args.requests)
+        print(f"8411 restarted:    {dict(served)}")
+        if bad or not served[8411]:
+            errors.append("restarted replica was not readmitted")
+
+    for server in servers.values():
+        stop(*server)
+    print("OK" if not errors else "FAILED")
+    for error in errors:
+        print(f"    {error}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -25,12 +25,23 @@ trap cleanup SIGINT SIGTERM
 
 echo "Starting FastAPI Agents..."
 
+# FLIGHT_REPLICAS=3 ./servers.sh runs flight agents on 8001, 8011, 8021;
+# the host finds all of them through AGENT_ENDPOINTS (common/registry.py)
+FLIGHT_REPLICAS=${FLIGHT_REPLICAS:-1}
+ENDPOINTS=""
+for ((i = 0; i < FLIGHT_REPLICAS; i++)); do
+    ENDPOINTS+="http://localhost:$((8001 + 10 * i)),"
+done
+export AGENT_ENDPOINTS="${ENDPOINTS}http://localhost:8002,http://localhost:8003"
+
 # Start each agent and store its PID ($!)
 uvicorn agents.host_agent.__main__:app --port 8000 &
 PIDS+=($!)
 
-uvicorn agents.flight_agent.__main__:app --port 8001 &
-PIDS+=($!)
+for ((i = 0; i < FLIGHT_REPLICAS; i++)); do
+    uvicorn agents.flight_agent.__main__:app --port $((8001 + 10 * i)) &
+    PIDS+=($!)
+done
 
 uvicorn agents.stay_agent.__main__:app --port 8002 &
 PIDS+=($!)
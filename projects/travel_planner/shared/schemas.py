@@ -1,5 +1,7 @@
 """schemas.py - common schema to share date between agents"""
 
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -8,3 +10,5 @@ class TravelRequest(BaseModel):
     start_date: str
     end_date: str
     budget: float
+    # only the flight agent uses it; the UI always sends it
+    origin: Optional[str] = None
@@ -2,6 +2,7 @@
 travel_ui.py - streamlit based front-end for the travel planner app
 """
 
+import json
 import os
 from dotenv import load_dotenv
 import streamlit as st
@@ -34,14 +35,51 @@ if st.button("Plan My Trip ✨"):
             "budget": budget,
         }
         host_agent_url = os.getenv("HOST_AGENT_URL", "http://localhost:8000/run")
-        response = requests.post(host_agent_url, json=payload)
-        if response.ok:
-            data = response.json()
-            st.subheader("✈️ Flights")
-            st.markdown(data["flights"])
-            st.subheader("🏨 Stays")
-            st.markdown(data["stay"])
-            st.subheader("🗺️ Activities")
-            st.markdown(data["activities"])
-        else:
+        # /run_stream renders each section as soon as its agent answers
+        # instead of waiting for the slowest one
+        host_stream_url = os.getenv("HOST_AGENT_STREAM_URL", host_agent_url + "_stream")
+        sections = {
+            "flights": "✈️ Flights",
+            "stay": "🏨 Stays",
+            "activities": "🗺️ Activities",
+        }
+        warning = st.empty()
+        placeholders = {}
+        for name, title in sections.items():
+            st.subheader(title)
+            placeholders[name] = st.empty()
+            placeholders[name].markdown("_Working on it..._")
+        drafts = {name: "" for name in sections}
+
+        try:
+            with requests.post(host_stream_url, json=payload, stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line:
+                        continue
+                    message = json.loads(line)
+                    if message["type"] == "delta":
+                        drafts[message["section"]] += message["text"]
+                        placeholders[message["section"]].markdown(drafts[message["section"]])
+                    elif message["type"] == "section":
+                        content = message["content"]
+                        if isinstance(content, str):
+                            placeholders[message["section"]].markdown(content)
+                        else:
+                            placeholders[message["section"]].write(content)
+                    elif message["type"] == "done":
+                        # the host returns partial plans if an agent misses its deadline
+                        missing = message.get("timed_out", []) + message.get("failed", [])
+                        if missing:
+                            warning.warning(f"Partial plan - no answer from: {', '.join(missing)}")
+                        timings = message.get("timings", {})
+                        if timings:
+                            st.caption(
+                                " · ".join(
+                                    f"{name}: {ms / 1000:.1f}s" for name, ms in timings.items()
+                                )
+                            )
+                    elif message["type"] == "error":
+                        st.error(f"Travel plan failed: {message['error']}")
+        except requests.RequestException:
             st.error("Failed to fetch travel plan. Please try again.")